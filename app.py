@@ -1,10 +1,26 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import numpy as np
 
+from export import EXPORT_FORMATS, export_frame
+from indexes import IdIndex, RankIndex, TitleIndex, YearPrefixSums, multi_hot
+from jobs import JOB_POLL_SECONDS, JobScheduler
+from relations import CAST, DIRECTOR, CollaborationGraph, PeopleTable, cooccurrence, spring_layout, top_pairs
+from chartprep import CHART_THREADS, ChartPrep
+from colstore import LazyColumns, ensure_store, open_store, read_partitions
+from dataset import DATA_PATH, DATA_VERSION, LAZY_COLUMNS, PARTITION_BY, freeze, is_intact, prepare_data, readonly
+from memtrace import finish_memtrace, memory_stage, start_memtrace, summary_table
+from profiling import PROFILE_TOGGLE, PROFILE_TOGGLE_KEY, PROFILING, finish_profile, start_profile
+from query import Filters, make_backend
+from resampling import BOOTSTRAP_LEVEL, BOOTSTRAP_RESAMPLES, bootstrap_ci
+from resultcache import persistent, stats as result_cache_stats
+from similarity import TEXT_COLUMNS, SimilarityIndex, TextIndex
+
+# Opt-in profiler around this whole rerun (CINEMETRICS_PROFILE); None when profiling is off
+rerun_profile = start_profile(st.session_state)
+# Opt-in per-stage memory accounting (CINEMETRICS_MEMTRACE); None when it's off
+rerun_memory = start_memtrace()
+
 # ============================================
 # PAGE CONFIG
 # ============================================
@@ -1248,20 +1264,134 @@ st.markdown("""
 # ============================================
 # LOAD DATA
 # ============================================
-@st.cache_data
+@st.cache_resource
+def get_store():
+    # Column store directory for DATA_PATH, built on first use by whichever process gets there first
+    return ensure_store(DATA_PATH, prepare_data, DATA_VERSION, PARTITION_BY)
+
+@st.cache_resource(validate=is_intact)
 def load_data():
-    df = pd.read_csv("tmdb_movies_data.csv")
-    df['profit'] = df['revenue'] - df['budget']
-    df['roi'] = np.where(df['budget'] > 0, (df['profit'] / df['budget']) * 100, 0)
-    df['release_date'] = pd.to_datetime(df['release_date'], errors='coerce')
-    df['year'] = df['release_date'].dt.year
-    df['month'] = df['release_date'].dt.month
-    df['decade'] = (df['year'] // 10 * 10).astype('Int64')
-    df['is_profitable'] = df['profit'] > 0
-    df['primary_genre'] = df['genres'].apply(lambda x: x.split('|')[0] if pd.notna(x) else 'Unknown')
-    return df
-
-df = load_data()
+    # One read-only frame shared by every session and rerun (no per-call copy); its columns are
+    # memory-mapped, so every server process on the machine shares the same page-cache copy
+    return freeze(open_store(get_store(), exclude=LAZY_COLUMNS))
+
+@st.cache_resource
+def get_movie_text():
+    # Memory-mapped text columns by row position, with an LRU of recently viewed rows
+    return LazyColumns(get_store(), LAZY_COLUMNS)
+
+with memory_stage("load_data"):
+    df = load_data()
+    movie_text = get_movie_text()
+
+@st.cache_resource
+def get_title_index(_df):
+    # Built once per process; positions line up with rows of the loaded frame
+    return readonly(TitleIndex(_df['original_title'], _df['revenue']))
+
+@st.cache_resource
+def get_id_index(_df):
+    # TMDB id / IMDb id -> row position; backs every "open this movie" lookup
+    return IdIndex(_df['id'], _df['imdb_id'])
+
+@st.cache_resource
+def get_rank_index(_df, metrics):
+    # Sort orders per comparison metric, for percentile ranks without re-sorting
+    return readonly(RankIndex(_df, list(metrics)))
+
+@st.cache_resource
+def get_similarity_index(_df):
+    # KD-tree over scaled numeric features + multi-hot genres ("Similar movies")
+    return readonly(SimilarityIndex(_df))
+
+@st.cache_resource
+def get_text_index(_df):
+    # TF-IDF over overview/tagline/keywords; loaded from the cache directory after the first build
+    return TextIndex.load_or_build(movie_text.frame(TEXT_COLUMNS).assign(id=_df['id']))
+
+@st.cache_resource
+def get_genre_matrix(_df):
+    # Sparse multi-hot (movies x genres) over the full `genres` field, not just primary_genre
+    return multi_hot(_df['genres'])
+
+@st.cache_resource
+def get_people_table(_df):
+    # Exploded director/cast -> movie table; the pipe-delimited strings are split only here
+    return readonly(PeopleTable(movie_text.frame(['cast']).assign(director=_df['director'])))
+
+@st.cache_resource
+def get_collaboration_graph(_df):
+    # Movie x person incidence over directors and the top-3 billed cast
+    return readonly(CollaborationGraph(get_people_table(_df), len(_df)))
+
+# Upper end of the sidebar budget slider, in dollars
+BUDGET_SLIDER_MAX = 300_000_000
+
+@st.cache_resource
+def get_year_sums(_df):
+    # Running per-year/per-genre totals over rows the default rating and budget filters keep
+    return readonly(YearPrefixSums(_df, budget_limit=BUDGET_SLIDER_MAX))
+
+@st.cache_resource
+def get_query_backend(_df):
+    # Filter/groupby engine chosen by CINEMETRICS_QUERY_BACKEND (pandas or duckdb), pruning by partition
+    return make_backend(_df, partitions=read_partitions(get_store()))
+
+@st.cache_resource
+def get_job_scheduler():
+    # Local process pool for analytics too slow for a rerun; shared so identical jobs run once
+    return JobScheduler()
+
+# Only what the filters and hero metrics need; the rest are fetched after the hero (see below)
+with memory_stage("indexes"):
+    id_index = get_id_index(df)
+    year_sums = get_year_sums(df)
+    query_backend = get_query_backend(df)
+
+def movie_row(movie_id):
+    """O(1) row lookup by TMDB id (None if the id is unknown)."""
+    pos = id_index.position(movie_id)
+    return None if pos is None else df.iloc[pos]
+
+def movie_label(movie_id) -> str:
+    """Picker label: title plus year, so remakes with the same title are distinguishable."""
+    row = movie_row(movie_id)
+    if row is None:
+        return str(movie_id)
+    year = f" ({int(row['year'])})" if pd.notna(row['year']) else ""
+    return f"{row['original_title']}{year}"
+
+def similar_movies(movie_id, k=10, within=None, by="profile") -> pd.DataFrame:
+    """The k nearest movies to `movie_id` (optionally restricted to a boolean row mask).
+
+    `by="profile"` uses the numeric/genre feature tree (column `distance`, lower is closer);
+    `by="plot"` uses TF-IDF text similarity (column `similarity`, higher is closer).
+    """
+    pos = id_index.position(movie_id)
+    cols = ['id', 'original_title', 'year', 'primary_genre', 'vote_average', 'revenue']
+    if pos is None:
+        return df.iloc[0:0][cols]
+    if by == "plot":
+        rows, score = text_index.similar(pos, k=k, mask=within)
+        score_col = 'similarity'
+    else:
+        rows, score = similarity_index.neighbours(pos, k=k, mask=within)
+        score_col = 'distance'
+    out = df.iloc[rows][cols].copy()
+    out[score_col] = score
+    return out
+
+SIMILAR_COLUMN_CONFIG = {
+    'distance': st.column_config.NumberColumn("Distance", format="%.2f"),
+    'similarity': st.column_config.ProgressColumn("Plot similarity", format="%.2f", min_value=0, max_value=1),
+}
+
+def text_index_caption() -> str:
+    """Size/build-time summary of the TF-IDF matrix, for capacity planning."""
+    stats = text_index.stats
+    source = "loaded from cache" if stats['from_cache'] else "built this session"
+    return (f"Plot index: {stats['rows']:,} films × {stats['terms']:,} terms, {stats['nnz']:,} non-zeros, "
+            f"{stats['bytes']/1e6:.1f} MB in memory, built in {stats['build_seconds']:.2f}s ({source}).")
 
 # Chart styling
 FONT_FAMILY = 'ui-sans-serif, system-ui, -apple-system, "Segoe UI", Roboto, Arial, "Noto Sans", "Liberation Sans", sans-serif'
@@ -1278,9 +1408,24 @@ PLOTLY_CONFIG = {
     'staticPlot': False,
 }
 
-def render_chart(fig):
-    """Render a Plotly chart with proper config for hover tooltips."""
-    st.plotly_chart(fig, use_container_width=True, config=PLOTLY_CONFIG)
+def render_chart(fig, key=None):
+    """Render a Plotly chart with proper config for hover tooltips.
+
+    With a `key`, movie points become clickable and open the movie detail dialog.
+    """
+    if key is None:
+        st.plotly_chart(fig, use_container_width=True, config=PLOTLY_CONFIG)
+        return
+    event = st.plotly_chart(fig, use_container_width=True, config=PLOTLY_CONFIG,
+                            key=key, on_select="rerun", selection_mode="points")
+    points = event.selection.points if event else []
+    clicked = points[0].get("customdata") if points else None
+    movie_id = clicked[MOVIE_ID_FIELD] if clicked and len(clicked) > MOVIE_ID_FIELD else None
+    # The selection persists across reruns; only open the dialog when it changes
+    if movie_id != st.session_state.get(f"{key}_opened"):
+        st.session_state[f"{key}_opened"] = movie_id
+        if movie_id is not None:
+            show_movie(movie_id)
 
 def style_chart(fig, height=400):
     fig.update_layout(
@@ -1314,39 +1459,95 @@ def explain_chart(title: str, points: list[str], expanded: bool = False) -> None
         st.markdown("\n".join([f"- {p}" for p in points]))
 
 def add_movie_hover(fig, data_df: pd.DataFrame) -> None:
-    """UI helper: standardize hover tooltips to show title + description (overview) for movie-level charts."""
+    """UI helper: standardize hover tooltips to show title + description (overview) for movie-level charts.
+
+    Traces built with `custom_data=['id']` are resolved per point through the id index, so
+    colour-split traces show the right movie; otherwise points follow `data_df` order.
+    """
     if data_df is None or len(data_df) == 0:
         return
-    idx = data_df.index
-    title = data_df['original_title'] if 'original_title' in data_df.columns else pd.Series(["Unknown"] * len(idx), index=idx)
-    overview = data_df['overview'] if 'overview' in data_df.columns else pd.Series([""] * len(idx), index=idx)
-    year = data_df['year'] if 'year' in data_df.columns else pd.Series([""] * len(idx), index=idx)
-    genre = data_df['primary_genre'] if 'primary_genre' in data_df.columns else pd.Series([""] * len(idx), index=idx)
-    director = data_df['director'] if 'director' in data_df.columns else pd.Series([""] * len(idx), index=idx)
-
-    custom = pd.DataFrame(
-        {
-            "title": title.fillna("Unknown"),
-            "overview": overview.fillna("No description available."),
-            "year": year.fillna(""),
-            "primary_genre": genre.fillna(""),
-            "director": director.fillna(""),
-        },
-        index=idx,
-    )
+    for trace in fig.data:
+        custom = np.asarray(trace.customdata, dtype=object) if trace.customdata is not None else None
+        ids = custom[:, 0] if custom is not None and custom.ndim == 2 else data_df['id'].to_numpy()
+        positions = id_index.positions(ids)
+        rows = df.iloc[positions]
+        overview = movie_text.take('overview', positions)
+        trace.update(
+            hovertext=rows['original_title'].fillna("Unknown").tolist(),
+            customdata=np.column_stack([
+                np.where(pd.isna(overview), "No description available.", overview),
+                rows['year'].fillna("").to_numpy(dtype=object),
+                rows['primary_genre'].fillna("").to_numpy(dtype=object),
+                rows['director'].fillna("").to_numpy(dtype=object),
+                rows['id'].to_numpy(dtype=object),
+            ]),
+            hovertemplate=(
+                "<b>%{hovertext}</b>"
+                "<br>Year: %{customdata[1]}"
+                "<br>Genre: %{customdata[2]}"
+                "<br>Director: %{customdata[3]}"
+                "<br><br>%{customdata[0]}"
+                "<extra></extra>"
+            ),
+        )
 
-    fig.update_traces(
-        hovertext=custom["title"].tolist(),
-        customdata=custom[["overview", "year", "primary_genre", "director"]].to_numpy(),
-        hovertemplate=(
-            "<b>%{hovertext}</b>"
-            "<br>Year: %{customdata[1]}"
-            "<br>Genre: %{customdata[2]}"
-            "<br>Director: %{customdata[3]}"
-            "<br><br>%{customdata[0]}"
-            "<extra></extra>"
-        ),
-    )
+@st.dialog("🎬 Movie details", width="large")
+def show_movie(movie_id):
+    """Detail view for one movie, resolved through the id index."""
+    row = movie_row(movie_id)
+    if row is None:
+        st.warning("This movie is not in the dataset.")
+        return
+    text = movie_text.row(id_index.position(movie_id))
+    year = int(row['year']) if pd.notna(row['year']) else 'N/A'
+    st.markdown(f"### {row['original_title']} ({year})")
+    if text['tagline']:
+        st.markdown(f"*\"{text['tagline']}\"*")
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Revenue", f"${row['revenue']/1e6:.0f}M")
+    col2.metric("Budget", f"${row['budget']/1e6:.0f}M")
+    col3.metric("Rating", f"{row['vote_average']:.1f}")
+    st.write(f"**Director:** {row['director'] if pd.notna(row['director']) else 'Unknown'}")
+    st.write(f"**Genre:** {row['genres'] if pd.notna(row['genres']) else 'Unknown'}")
+    if text['cast']:
+        st.write(f"**Cast:** {', '.join(text['cast'].split('|'))}")
+    if text['overview']:
+        st.write(text['overview'])
+    st.caption(f"TMDB id {row['id']}" + (f" • IMDb {row['imdb_id']}" if pd.notna(row['imdb_id']) else ""))
+
+    sim_tab, plot_tab = st.tabs(["🧭 Similar movies", "📝 Similar plots"])
+    with sim_tab:
+        similar = similar_movies(movie_id, k=8, within=mask.to_numpy())
+        if len(similar) > 0:
+            st.dataframe(similar.drop(columns=['id']), use_container_width=True, hide_index=True,
+                         column_config=SIMILAR_COLUMN_CONFIG)
+            st.caption("Nearest films within your current filters (budget, revenue, runtime, rating, popularity, votes, year and genres).")
+        else:
+            st.caption("No similar movies within the current filters.")
+    with plot_tab:
+        similar = similar_movies(movie_id, k=8, within=mask.to_numpy(), by="plot")
+        if len(similar) > 0:
+            st.dataframe(similar.drop(columns=['id']), use_container_width=True, hide_index=True,
+                         column_config=SIMILAR_COLUMN_CONFIG)
+            st.caption("Films within your current filters whose overview, tagline and keywords share the most distinctive words.")
+        else:
+            st.caption("No films with a similar plot within the current filters.")
+
+# Position of the TMDB id inside movie-hover customdata (see add_movie_hover)
+MOVIE_ID_FIELD = 4
+
+# Max options offered by the comparison pickers for any query
+AUTOCOMPLETE_LIMIT = 25
+
+# Movie Comparison: max films and metrics (with precomputed rank arrays)
+MAX_COMPARE = 20
+COMPARE_METRICS = ['budget', 'revenue', 'profit', 'vote_average', 'popularity', 'vote_count', 'runtime']
+COMPARE_LABELS = {'budget': 'Budget', 'revenue': 'Revenue', 'profit': 'Profit', 'vote_average': 'Rating',
+                  'popularity': 'Popularity', 'vote_count': 'Votes', 'runtime': 'Runtime'}
+
+# People leaderboards: label -> column of the leaderboard frame
+LEADERBOARD_METRICS = {'Total profit': 'total_profit', 'Median profit': 'median_profit', 'Films': 'films',
+                       'Hit rate': 'hit_rate', 'Avg rating': 'avg_rating'}
 
 # Color Blind Friendly Palette (Blue/Orange instead of Red/Green)
 COLORS = ['#22d3ee', '#06b6d4', '#0891b2', '#f59e0b', '#d97706']
@@ -1401,35 +1602,203 @@ with st.sidebar:
     st.checkbox("⚡ Performance mode (reduce lag)", key="perf_mode", value=True)
     st.checkbox("🎯 Focus mode (hide explainers)", key="focus_mode", value=False)
     st.checkbox("ℹ️ Explain mode (show chart explanations)", key="explain_mode", value=True)
+    if PROFILE_TOGGLE:
+        st.toggle("🔬 Profile reruns", key=PROFILE_TOGGLE_KEY,
+                  help="Write a cProfile + flame-graph profile of every rerun while this is on.")
     if st.session_state.get("focus_mode"):
         st.session_state["explain_mode"] = False
 
 # Apply Filters
-mask = (
-    (df['year'] >= year_range[0]) & (df['year'] <= year_range[1]) &
-    (df['budget'] >= budget_range[0] * 1e6) & (df['budget'] <= budget_range[1] * 1e6) &
-    (df['vote_average'] >= min_rating)
-)
-
-if selected_genres:
-    mask &= df['primary_genre'].isin(selected_genres)
-if only_profitable:
-    mask &= df['profit'] > 0
-if only_blockbusters:
-    mask &= df['revenue'] > 500_000_000
-if hidden_gems:
-    mask &= (df['budget'] < 20_000_000) & (df['vote_average'] >= 7.0)
-
-filtered_df = df[mask]
+# Hashable summary of the sidebar state; keys per-filter caches and drives the query backend
+filter_key = Filters(tuple(year_range), tuple(selected_genres), min_rating, tuple(budget_range),
+                     only_profitable, only_blockbusters, hidden_gems)
+
+with memory_stage("filter"):
+    mask = pd.Series(query_backend.mask(filter_key), index=df.index)
+    filtered_df = df[mask]
+
+@persistent(depends=("query",))
+def stored_aggregate(filter_key, by, aggs, backend, _backend):
+    # On disk across restarts; touches no Streamlit state, so chart-prep threads call it directly.
+    # `backend` is the engine's name, so results of one engine aren't served for the other
+    return _backend.aggregate(filter_key, list(by), dict(aggs))
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def cached_aggregate(filter_key, by, aggs, backend, _backend, _compute=None):
+    # In memory per process on top of the disk cache; `by`/`aggs` are tuples so they hash.
+    # On a miss `_compute` (if given) collects the same aggregate from a chart-prep thread
+    return _compute() if _compute is not None else stored_aggregate(filter_key, by, aggs, backend, _backend)
+
+def grouped(by, **aggs):
+    """Grouped aggregation of the current selection (`name=(column, func)`), run by the query backend."""
+    return cached_aggregate(filter_key, tuple(by), tuple(aggs.items()), query_backend.name, query_backend)
+
+# Arguments of the aggregates started on chart-prep threads, by chart name
+prefetch_args = {}
+
+def prefetch(name, by, **aggs):
+    """Start `grouped(by, **aggs)` for chart `name` on a chart-prep thread; `prefetched(name)` collects it."""
+    prefetch_args[name] = (tuple(by), tuple(aggs.items()))
+    chart_data.submit(name, stored_aggregate, filter_key, *prefetch_args[name], query_backend.name, query_backend)
+
+def prefetched(name):
+    """The aggregate started by `prefetch(name, ...)`, through the in-memory cache on the script thread."""
+    by, aggs = prefetch_args[name]
+    return cached_aggregate(filter_key, by, aggs, query_backend.name, query_backend,
+                            _compute=lambda: chart_data.result(name))
+
+def headline_metrics():
+    """Movies, revenue, profit, average rating and success rate for the current selection.
+
+    With only the year and genre filters in play these come straight from the
+    year prefix sums; otherwise they are reduced from the mask once per rerun.
+    """
+    if (min_rating == 0 and budget_range[0] == 0 and budget_range[1] * 1e6 >= BUDGET_SLIDER_MAX
+            and not (only_profitable or only_blockbusters or hidden_gems)):
+        totals = year_sums.totals(year_range[0], year_range[1], selected_genres)
+    else:
+        totals = {
+            'movies': len(filtered_df),
+            'revenue': filtered_df['revenue'].sum(),
+            'profit': filtered_df['profit'].sum(),
+            'rating_sum': filtered_df['vote_average'].sum(),
+            'profitable': filtered_df['is_profitable'].sum(),
+        }
+    n = totals['movies']
+    return {
+        'movies': n,
+        'revenue': totals['revenue'],
+        'profit': totals['profit'],
+        'rating': totals['rating_sum'] / n if n else 0,
+        'success': totals['profitable'] / n * 100 if n else 0,
+    }
+
+headline = headline_metrics()
+
+# Variables of the correlation heatmap
+CORRELATION_COLUMNS = ['budget', 'revenue', 'profit', 'vote_average', 'popularity', 'vote_count', 'runtime']
+
+def month_revenue(month_data):
+    """Revenue per release month (rows) and year (columns) from the per year and month sums; None when empty."""
+    if len(month_data) == 0:
+        return None
+    return month_data.pivot(index='month', columns='year', values='revenue').fillna(0)
+
+def cumulative_revenue(yearly):
+    """Total revenue per year and its running total."""
+    yearly_cum = yearly.sort_values('year')
+    yearly_cum['cumulative'] = yearly_cum['revenue'].cumsum()
+    return yearly_cum
+
+# Chart data that depends only on the filters, computed side by side while the page renders
+# (CINEMETRICS_CHART_THREADS=0 computes each one in place instead); charts collect it in page order.
+# Profiled or memory-traced reruns compute in place too, so the work is seen by the script thread
+chart_data = ChartPrep(0 if rerun_profile or rerun_memory else CHART_THREADS)
+if len(filtered_df) > 0:
+    chart_data.submit('correlation', filtered_df[CORRELATION_COLUMNS].corr)
+    prefetch('month_revenue', ['year', 'month'], revenue=('revenue', 'sum'),
+             original_title=('original_title', 'count'))
+    prefetch('genre_matrix', ['primary_genre', 'decade'], revenue=('revenue', 'mean'),
+             vote_average=('vote_average', 'mean'))
+prefetch('yearly', ['year'], revenue=('revenue', 'sum'), original_title=('original_title', 'count'))
+prefetch('genre_decade', ['primary_genre', 'decade'], revenue=('revenue', 'sum'),
+         original_title=('original_title', 'count'))
+prefetch('genre_year', ['year', 'primary_genre'], revenue=('revenue', 'sum'))
+prefetch('decade_profit', ['decade'], profit=('profit', 'sum'), original_title=('original_title', 'count'))
+prefetch('yearly_revenue', ['year'], revenue=('revenue', 'sum'))
+prefetch('genre_stats', ['primary_genre'], total_rev=('revenue', 'sum'), avg_rev=('revenue', 'mean'),
+         avg_profit=('profit', 'mean'), avg_rating=('vote_average', 'mean'),
+         success=('is_profitable', 'mean'), count=('original_title', 'count'))
+
+@st.cache_data(max_entries=32, show_spinner=False)
+@persistent(depends=("query", "relations", "indexes"))
+def genre_cooccurrence(filter_key, _mask):
+    """Genre pair counts and revenue sums for one filter state (one sparse product)."""
+    return cooccurrence(genre_multi_hot, genre_labels, _mask.to_numpy(), df['revenue'].to_numpy(dtype=float))
+
+@st.cache_data(max_entries=32, show_spinner=False)
+@persistent(depends=("query", "relations"))
+def people_leaderboard(filter_key, _mask, role, max_billing, min_films):
+    """Director or cast leaderboard for one filter state (row-id join on the exploded table)."""
+    return people_table.leaderboard(role, _mask.to_numpy(), df, max_billing=max_billing, min_films=min_films)
+
+def collaboration_adjacency(mask_arr):
+    """Shared-film adjacency for this filter state, patched from the session's previous one."""
+    previous = st.session_state.get("collab_state")
+    if previous is None or len(previous[0]) != len(mask_arr):
+        adjacency = collaboration_graph.adjacency(mask_arr)
+    elif np.array_equal(previous[0], mask_arr):
+        return previous[1]
+    else:
+        adjacency = collaboration_graph.update(previous[1], previous[0], mask_arr)
+    st.session_state["collab_state"] = (mask_arr.copy(), adjacency)
+    return adjacency
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def collaboration_layout(nodes, edges):
+    """Spring layout for one graph; `nodes`/`edges` are tuples, so an unchanged graph reuses it."""
+    return spring_layout(len(nodes), np.asarray(edges, dtype=np.float64).reshape(-1, 3))
+
+def genre_intervals(job_key, values, genres, label):
+    """Bootstrapped median per genre with its interval, computed by a background job.
+
+    Until the job is done this shows a placeholder that checks back every
+    JOB_POLL_SECONDS; when it finishes, one full rerun swaps the chart in. A
+    job lost with its worker or evicted before the check is submitted again.
+    """
+    scheduler = get_job_scheduler()
+    try:
+        intervals = scheduler.peek('bootstrap_ci', job_key, bootstrap_ci, values, genres)
+    except Exception as exc:
+        st.warning(f"Couldn't compute the intervals: {exc}")
+        return
+    if intervals is None:
+        @st.fragment(run_every=JOB_POLL_SECONDS)
+        def wait_for_job():
+            status = scheduler.status('bootstrap_ci', job_key)
+            if status == 'unknown':
+                scheduler.submit('bootstrap_ci', job_key, bootstrap_ci, values, genres)
+            elif status == 'finished':
+                st.rerun()
+            st.info(f"⏳ Computing… resampling each genre {BOOTSTRAP_RESAMPLES:,} times in the background. "
+                    "The chart appears here when it's ready.")
+        wait_for_job()
+        return
+    intervals = intervals.sort_values('estimate')
+    with memory_stage("figures"):
+        fig = go.Figure(go.Scatter(
+            x=intervals['estimate'], y=intervals['group'], mode='markers',
+            marker=dict(color='#22d3ee', size=10),
+            error_x=dict(type='data', symmetric=False, array=intervals['high'] - intervals['estimate'],
+                         arrayminus=intervals['estimate'] - intervals['low'], color='#f59e0b', thickness=2),
+            customdata=intervals[['low', 'high', 'n']],
+            hovertemplate=("<b>%{y}</b><br>Median: %{x:,.2f}<br>"
+                           f"{BOOTSTRAP_LEVEL:.0%} interval: %{{customdata[0]:,.2f}} – %{{customdata[1]:,.2f}}"
+                           "<br>Movies: %{customdata[2]:,}<extra></extra>"),
+        ))
+        fig.update_layout(title=f"Median {label} by Genre ({BOOTSTRAP_LEVEL:.0%} bootstrap interval)",
+                          xaxis_title=f"Median {label.lower()}")
+        explain_chart("Bootstrapped Medians (Interval Plot)", [
+            "Each dot is a genre's median; the bar around it is the range the median plausibly falls in.",
+            f"Intervals come from resampling the genre's movies {BOOTSTRAP_RESAMPLES:,} times.",
+            "Overlapping bars mean the selection can't really tell those genres apart; few movies give wide bars.",
+        ])
+        style_chart(fig, 420)
+        render_chart(fig)
 
 # Sidebar Stats
 with st.sidebar:
     st.markdown("---")
     st.markdown("### 📊 Selection Summary")
-    st.metric("Movies", f"{len(filtered_df):,}")
-    if len(filtered_df) > 0:
-        st.metric("Total Revenue", f"${filtered_df['revenue'].sum()/1e9:.1f}B")
-        st.metric("Success Rate", f"{filtered_df['is_profitable'].mean()*100:.0f}%")
+    st.metric("Movies", f"{headline['movies']:,}")
+    if headline['movies'] > 0:
+        st.metric("Total Revenue", f"${headline['revenue']/1e9:.1f}B")
+        st.metric("Success Rate", f"{headline['success']:.0f}%")
+    result_cache = result_cache_stats()
+    if result_cache['functions']['all']['hit_rate'] is not None:
+        # Process-wide, and only requests that missed the in-memory caches reach the disk
+        size = f", {result_cache['disk_bytes'] / 2**20:.1f} MiB" if result_cache['disk_bytes'] is not None else ""
+        st.caption(f"Result cache: {result_cache['functions']['all']['hit_rate']:.0%} served from disk{size}")
 
 # ============================================
 # FLOATING SHAPES (Live Background)
@@ -1493,20 +1862,21 @@ st.markdown("""
 # ============================================
 # MAIN TABS (Fixed at top, in line with Deploy)
 # ============================================
-tab1, tab6, tab3, tab2, tab4, tab_concepts = st.tabs([
-    "📊 Dashboard", "🔍 Explorer", "💵 Financial", "🎮 Interactive", "🎭 Genres", "🎓 Concepts"
-])
+# While profiling, tabs track the active one (a tab switch reruns) so profiles can be tagged with it
+tab1, tab6, tab3, tab2, tab4, tab_people, tab_concepts = st.tabs([
+    "📊 Dashboard", "🔍 Explorer", "💵 Financial", "🎮 Interactive", "🎭 Genres", "👥 People", "🎓 Concepts"
+], key="main_tab", on_change="rerun" if PROFILING else "ignore")
 
 # ============================================
 # TAB 1: DASHBOARD
 # ============================================
-with tab1:
+with tab1, memory_stage("Dashboard"):
     st.markdown('<div id="overview" class="section-anchor"></div>', unsafe_allow_html=True)
 
-    hero_movies = len(filtered_df)
-    hero_revenue = filtered_df['revenue'].sum()/1e9 if len(filtered_df) > 0 else 0
-    hero_rating = filtered_df['vote_average'].mean() if len(filtered_df) > 0 else 0
-    hero_profit_rate = (filtered_df['is_profitable'].mean()*100) if len(filtered_df) > 0 else 0
+    hero_movies = headline['movies']
+    hero_revenue = headline['revenue']/1e9
+    hero_rating = headline['rating']
+    hero_profit_rate = headline['success']
 
     st.markdown(f"""
     <div class="hero-wrap">
@@ -1521,6 +1891,7 @@ with tab1:
                     <a href="#interactive">Interactive</a>
                     <a href="#financial">Financial</a>
                     <a href="#genres">Genres</a>
+                    <a href="#people">People</a>
                     <a href="#explorer">Explorer</a>
                 </div>
             </div>
@@ -1555,16 +1926,12 @@ with tab1:
     # Stats Row
     col1, col2, col3, col4, col5 = st.columns(5)
     
-    # Handle empty dataframe - use defaults for mean calculations
-    avg_rating = filtered_df['vote_average'].mean() if len(filtered_df) > 0 else 0
-    success_rate = filtered_df['is_profitable'].mean() * 100 if len(filtered_df) > 0 else 0
-    
     stats = [
-        ("🎬", f"{len(filtered_df):,}", "Movies"),
-        ("💰", f"${filtered_df['revenue'].sum()/1e9:.1f}B", "Revenue"),
-        ("📈", f"${filtered_df['profit'].sum()/1e9:.1f}B", "Profit"),
-        ("⭐", f"{avg_rating:.1f}", "Avg Rating"),
-        ("✅", f"{success_rate:.0f}%", "Success")
+        ("🎬", f"{headline['movies']:,}", "Movies"),
+        ("💰", f"${headline['revenue']/1e9:.1f}B", "Revenue"),
+        ("📈", f"${headline['profit']/1e9:.1f}B", "Profit"),
+        ("⭐", f"{headline['rating']:.1f}", "Avg Rating"),
+        ("✅", f"{headline['success']:.0f}%", "Success")
     ]
 
     for col, (icon, val, label) in zip([col1,col2,col3,col4,col5], stats):
@@ -1577,6 +1944,38 @@ with tab1:
             </div>
             """, unsafe_allow_html=True)
 
+# ============================================
+# DEFERRED IMPORTS AND INDEXES
+# ============================================
+# Everything above is all the hero metrics need, and it is already on its way to the
+# browser. Plotly and the indexes behind the charts and later tabs load only from here,
+# so a cold start paints the hero first (benchmarks.startup tracks both).
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+COMPARE_COLORS = px.colors.qualitative.Safe
+
+with memory_stage("indexes"):
+    title_index = get_title_index(df)
+    rank_index = get_rank_index(df, tuple(COMPARE_METRICS))
+    similarity_index = get_similarity_index(df)
+    text_index = get_text_index(df)
+    genre_multi_hot, genre_labels = get_genre_matrix(df)
+    people_table = get_people_table(df)
+    collaboration_graph = get_collaboration_graph(df)
+
+# Deep link: ?movie=<TMDB id or IMDb id> opens that movie (once per link per session)
+linked_movie = st.query_params.get("movie")
+if linked_movie and st.session_state.get("linked_movie") != linked_movie:
+    st.session_state["linked_movie"] = linked_movie
+    if linked_movie.startswith("tt"):
+        linked_pos = id_index.position_by_imdb(linked_movie)
+    else:
+        linked_pos = id_index.position(int(linked_movie)) if linked_movie.isdigit() else None
+    show_movie(df['id'].iat[linked_pos] if linked_pos is not None else linked_movie)
+
+with tab1, memory_stage("Dashboard"):
     # ============================================
     # GENRE PERFORMANCE OVERVIEW
     # ============================================
@@ -1592,9 +1991,8 @@ with tab1:
     """, unsafe_allow_html=True)
 
     # Get top genres data
-    genre_data = filtered_df.groupby('primary_genre').agg({
-        'revenue': 'sum', 'original_title': 'count', 'vote_average': 'mean'
-    }).reset_index()
+    genre_data = grouped(['primary_genre'], revenue=('revenue', 'sum'), original_title=('original_title', 'count'),
+                         vote_average=('vote_average', 'mean'))
     genre_data = genre_data.nlargest(5, 'revenue')
 
     # Display genre cards using Streamlit columns
@@ -1702,36 +2100,38 @@ with tab1:
             .rename_axis('primary_genre')
             .reset_index(name='count')
         )
-        fig = px.pie(
-            genre_counts,
-            values='count',
-            names='primary_genre',
-            hole=0.5,
-            title="Movies by Genre",
-            color_discrete_sequence=COLORS,
-        )
-        fig.update_traces(hovertemplate="<b>%{label}</b><br>Movies: %{value:,}<br>Share: %{percent}<extra></extra>")
-        explain_chart("Movies by Genre (Donut)", [
-            "Each slice is a genre; slice size = number of movies in that genre within your current filters.",
-            "Hover to see the count and share.",
-            "Use the legend to isolate a genre (click to toggle).",
-        ])
-        style_chart(fig, 380)
-        render_chart(fig)
+        with memory_stage("figures"):
+            fig = px.pie(
+                genre_counts,
+                values='count',
+                names='primary_genre',
+                hole=0.5,
+                title="Movies by Genre",
+                color_discrete_sequence=COLORS,
+            )
+            fig.update_traces(hovertemplate="<b>%{label}</b><br>Movies: %{value:,}<br>Share: %{percent}<extra></extra>")
+            explain_chart("Movies by Genre (Donut)", [
+                "Each slice is a genre; slice size = number of movies in that genre within your current filters.",
+                "Hover to see the count and share.",
+                "Use the legend to isolate a genre (click to toggle).",
+            ])
+            style_chart(fig, 380)
+            render_chart(fig)
     
     with chart_col2:
-        yearly = filtered_df.groupby('year').agg({'revenue': 'sum', 'original_title': 'count'}).reset_index()
-        fig = make_subplots(specs=[[{"secondary_y": True}]])
-        fig.add_trace(go.Bar(x=yearly['year'], y=yearly['original_title'], name='Movies', marker_color='#22d3ee'), secondary_y=False)
-        fig.add_trace(go.Scatter(x=yearly['year'], y=yearly['revenue'], name='Revenue', line=dict(color='#f59e0b', width=3)), secondary_y=True)
-        fig.update_layout(title="Movies & Revenue by Year")
-        explain_chart("Movies & Revenue by Year (Combo)", [
-            "Bars (left axis) = number of movies released per year.",
-            "Line (right axis) = total revenue per year.",
-            "Use this to spot growth/declines and how output relates to box office.",
-        ])
-        style_chart(fig, 380)
-        render_chart(fig)
+        yearly = prefetched('yearly')
+        with memory_stage("figures"):
+            fig = make_subplots(specs=[[{"secondary_y": True}]])
+            fig.add_trace(go.Bar(x=yearly['year'], y=yearly['original_title'], name='Movies', marker_color='#22d3ee'), secondary_y=False)
+            fig.add_trace(go.Scatter(x=yearly['year'], y=yearly['revenue'], name='Revenue', line=dict(color='#f59e0b', width=3)), secondary_y=True)
+            fig.update_layout(title="Movies & Revenue by Year")
+            explain_chart("Movies & Revenue by Year (Combo)", [
+                "Bars (left axis) = number of movies released per year.",
+                "Line (right axis) = total revenue per year.",
+                "Use this to spot growth/declines and how output relates to box office.",
+            ])
+            style_chart(fig, 380)
+            render_chart(fig)
     
     # Charts Row 2 - New Visualizations
     st.markdown('<div id="analytics" class="section-anchor"></div>', unsafe_allow_html=True)
@@ -1741,30 +2141,30 @@ with tab1:
     
     with chart_col3:
         # Correlation Heatmap
-        numeric_cols = ['budget', 'revenue', 'profit', 'vote_average', 'popularity', 'vote_count', 'runtime']
-        if len(filtered_df) > 0 and all(col in filtered_df.columns for col in numeric_cols):
-            corr_data = filtered_df[numeric_cols].corr()
-            fig = go.Figure(data=go.Heatmap(
-                z=corr_data.values,
-                x=corr_data.columns,
-                y=corr_data.columns,
-                colorscale='Teal',
-                text=corr_data.values.round(2),
-                texttemplate='%{text}',
-                textfont={"size": 10},
-                colorbar=dict(title="Correlation")
-            ))
-            fig.update_traces(
-                hovertemplate="%{y} vs %{x}<br>Correlation: %{z:.2f}<extra></extra>"
-            )
-            fig.update_layout(title="📊 Correlation Heatmap", height=400)
-            explain_chart("Correlation Heatmap", [
-                "Shows how strongly pairs of variables move together (range -1 to +1).",
-                "Values near +1 mean strong positive relationship; near 0 means weak/no linear relationship.",
-                "Use it to validate hypotheses (e.g., budget ↔ revenue) and avoid misleading comparisons.",
-            ])
-            style_chart(fig, 400)
-            render_chart(fig)
+        if len(filtered_df) > 0:
+            corr_data = chart_data.result('correlation')
+            with memory_stage("figures"):
+                fig = go.Figure(data=go.Heatmap(
+                    z=corr_data.values,
+                    x=corr_data.columns,
+                    y=corr_data.columns,
+                    colorscale='Teal',
+                    text=corr_data.values.round(2),
+                    texttemplate='%{text}',
+                    textfont={"size": 10},
+                    colorbar=dict(title="Correlation")
+                ))
+                fig.update_traces(
+                    hovertemplate="%{y} vs %{x}<br>Correlation: %{z:.2f}<extra></extra>"
+                )
+                fig.update_layout(title="📊 Correlation Heatmap", height=400)
+                explain_chart("Correlation Heatmap", [
+                    "Shows how strongly pairs of variables move together (range -1 to +1).",
+                    "Values near +1 mean strong positive relationship; near 0 means weak/no linear relationship.",
+                    "Use it to validate hypotheses (e.g., budget ↔ revenue) and avoid misleading comparisons.",
+                ])
+                style_chart(fig, 400)
+                render_chart(fig)
         else:
             st.info("Insufficient data for correlation heatmap.")
     
@@ -1772,17 +2172,18 @@ with tab1:
         # Box Plot - Revenue Distribution by Genre
         top_genres = filtered_df['primary_genre'].value_counts().head(8).index
         box_data = filtered_df[filtered_df['primary_genre'].isin(top_genres)]
-        fig = px.box(box_data, x='primary_genre', y='revenue', 
-                    title="Revenue Distribution by Genre",
-                    color='primary_genre', color_discrete_sequence=COLORS)
-        fig.update_yaxes(type="log")
-        explain_chart("Revenue Distribution by Genre (Box Plot)", [
-            "Each box summarizes the spread of revenues within a genre (median + quartiles).",
-            "Dots indicate outliers; the log scale helps compare blockbuster-heavy genres fairly.",
-            "Use this to compare typical performance vs. extreme hits.",
-        ])
-        style_chart(fig, 400)
-        render_chart(fig)
+        with memory_stage("figures"):
+            fig = px.box(box_data, x='primary_genre', y='revenue', 
+                        title="Revenue Distribution by Genre",
+                        color='primary_genre', color_discrete_sequence=COLORS)
+            fig.update_yaxes(type="log")
+            explain_chart("Revenue Distribution by Genre (Box Plot)", [
+                "Each box summarizes the spread of revenues within a genre (median + quartiles).",
+                "Dots indicate outliers; the log scale helps compare blockbuster-heavy genres fairly.",
+                "Use this to compare typical performance vs. extreme hits.",
+            ])
+            style_chart(fig, 400)
+            render_chart(fig)
     
     # Charts Row 3
     chart_col5, chart_col6 = st.columns(2)
@@ -1790,30 +2191,27 @@ with tab1:
     with chart_col5:
         # Month Release Heatmap
         if len(filtered_df) > 0:
-            month_data = filtered_df.groupby(['year', 'month']).agg({
-                'revenue': 'sum',
-                'original_title': 'count'
-            }).reset_index()
-            if len(month_data) > 0:
-                month_pivot = month_data.pivot(index='month', columns='year', values='revenue').fillna(0)
-                fig = go.Figure(data=go.Heatmap(
-                    z=month_pivot.values,
-                    x=month_pivot.columns,
-                    y=['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'],
-                    colorscale='Viridis',
-                    colorbar=dict(title="Revenue ($)")
-                ))
-                fig.update_traces(
-                    hovertemplate="Year: %{x}<br>Month: %{y}<br>Revenue: $%{z:,.0f}<extra></extra>"
-                )
-                fig.update_layout(title="📅 Release Month Heatmap (Revenue by Month & Year)", height=400)
-                explain_chart("Release Month Heatmap", [
-                    "Rows = months; columns = years; color intensity = total revenue.",
-                    "Use it to spot seasonal release patterns (summer/holiday spikes).",
-                    "Hover over a cell to see exact values for a month-year combination.",
-                ])
-                style_chart(fig, 400)
-                render_chart(fig)
+            month_pivot = month_revenue(prefetched('month_revenue'))
+            if month_pivot is not None:
+                with memory_stage("figures"):
+                    fig = go.Figure(data=go.Heatmap(
+                        z=month_pivot.values,
+                        x=month_pivot.columns,
+                        y=['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'],
+                        colorscale='Viridis',
+                        colorbar=dict(title="Revenue ($)")
+                    ))
+                    fig.update_traces(
+                        hovertemplate="Year: %{x}<br>Month: %{y}<br>Revenue: $%{z:,.0f}<extra></extra>"
+                    )
+                    fig.update_layout(title="📅 Release Month Heatmap (Revenue by Month & Year)", height=400)
+                    explain_chart("Release Month Heatmap", [
+                        "Rows = months; columns = years; color intensity = total revenue.",
+                        "Use it to spot seasonal release patterns (summer/holiday spikes).",
+                        "Hover over a cell to see exact values for a month-year combination.",
+                    ])
+                    style_chart(fig, 400)
+                    render_chart(fig)
             else:
                 st.info("No month data available.")
         else:
@@ -1822,34 +2220,38 @@ with tab1:
     with chart_col6:
         # De-dup: Budget vs Revenue already appears in Financial (main version).
         # Replace with a different, readable story: popularity vs rating.
-        bubble_data = filtered_df[(filtered_df['vote_count'] > 0) & (filtered_df['popularity'] > 0)].head(250)
-        fig = px.scatter(
-            bubble_data,
-            x='vote_average',
-            y='popularity',
-            size='vote_count',
-            color='primary_genre',
-            hover_name='original_title',
-            hover_data={
-                'year': True,
-                'primary_genre': True,
-                'director': True,
-                'vote_average': ':.1f',
-                'popularity': ':.1f',
-                'vote_count': ':,d',
-            },
-            title="Popularity vs Rating (Size = Votes)",
-            labels={'vote_average': 'Rating', 'popularity': 'Popularity'},
-            color_discrete_sequence=COLORS,
-        )
-        add_movie_hover(fig, bubble_data)
-        explain_chart("Popularity vs Rating (Bubble)", [
-            "Each dot is a movie: X = rating, Y = popularity.",
-            "Bubble size = number of votes (engagement).",
-            "Use this to find films that are well-liked (right side) vs widely-known (top) — and interesting outliers.",
-        ])
-        style_chart(fig, 400)
-        render_chart(fig)
+        bubble_data = filtered_df[(filtered_df['vote_count'] > 0) & (filtered_df['popularity'] > 0)]
+        bubble_data = bubble_data.sample(min(250, len(bubble_data)), random_state=0)
+        with memory_stage("figures"):
+            fig = px.scatter(
+                bubble_data,
+                x='vote_average',
+                y='popularity',
+                size='vote_count',
+                color='primary_genre',
+                hover_name='original_title',
+                hover_data={
+                    'year': True,
+                    'primary_genre': True,
+                    'director': True,
+                    'vote_average': ':.1f',
+                    'popularity': ':.1f',
+                    'vote_count': ':,d',
+                },
+                title="Popularity vs Rating (Size = Votes)",
+                labels={'vote_average': 'Rating', 'popularity': 'Popularity'},
+                color_discrete_sequence=COLORS,
+                custom_data=['id'],
+            )
+            add_movie_hover(fig, bubble_data)
+            explain_chart("Popularity vs Rating (Bubble)", [
+                "Each dot is a movie: X = rating, Y = popularity.",
+                "Bubble size = number of votes (engagement).",
+                "Use this to find films that are well-liked (right side) vs widely-known (top) — and interesting outliers.",
+                "Click a bubble to open the movie's details.",
+            ])
+            style_chart(fig, 400)
+            render_chart(fig, key="popularity_rating_chart")
     
     # Charts Row 4
     chart_col7, chart_col8 = st.columns(2)
@@ -1858,40 +2260,39 @@ with tab1:
         # Violin Plot - Rating Distribution by Genre
         top_genres_v = filtered_df['primary_genre'].value_counts().head(6).index
         violin_data = filtered_df[filtered_df['primary_genre'].isin(top_genres_v)]
-        fig = px.violin(violin_data, x='primary_genre', y='vote_average',
-                       color='primary_genre', color_discrete_sequence=COLORS,
-                       title="Rating Distribution by Genre (Violin Plot)")
-        explain_chart("Rating Distribution by Genre (Violin)", [
-            "Shows how ratings are distributed within each genre (width = density).",
-            "Wider sections mean many films sit around that rating range.",
-            "Use this to compare consistency: tight violins = consistent ratings, wide = varied quality.",
-        ])
-        style_chart(fig, 400)
-        render_chart(fig)
+        with memory_stage("figures"):
+            fig = px.violin(violin_data, x='primary_genre', y='vote_average',
+                           color='primary_genre', color_discrete_sequence=COLORS,
+                           title="Rating Distribution by Genre (Violin Plot)")
+            explain_chart("Rating Distribution by Genre (Violin)", [
+                "Shows how ratings are distributed within each genre (width = density).",
+                "Wider sections mean many films sit around that rating range.",
+                "Use this to compare consistency: tight violins = consistent ratings, wide = varied quality.",
+            ])
+            style_chart(fig, 400)
+            render_chart(fig)
     
     with chart_col8:
         # Sunburst Chart - Genre Hierarchy
-        genre_decade = filtered_df.groupby(['primary_genre', 'decade']).agg({
-            'revenue': 'sum',
-            'original_title': 'count'
-        }).reset_index()
+        genre_decade = prefetched('genre_decade')
         top_genres_s = genre_decade.groupby('primary_genre')['revenue'].sum().nlargest(6).index
         sunburst_data = genre_decade[genre_decade['primary_genre'].isin(top_genres_s)]
-        fig = px.sunburst(sunburst_data, path=['primary_genre', 'decade'], values='revenue',
-                         color='revenue', color_continuous_scale='Teal',
-                         title="Genre & Decade Hierarchy (Sunburst)")
-        explain_chart("Genre & Decade Hierarchy (Sunburst)", [
-            "Inner ring = genre; outer ring = decades within that genre.",
-            "Segment size = revenue contribution; color intensity = revenue magnitude.",
-            "Click segments to drill down; use it to see which decades drove each genre’s earnings.",
-        ])
-        style_chart(fig, 400)
-        render_chart(fig)
+        with memory_stage("figures"):
+            fig = px.sunburst(sunburst_data, path=['primary_genre', 'decade'], values='revenue',
+                             color='revenue', color_continuous_scale='Teal',
+                             title="Genre & Decade Hierarchy (Sunburst)")
+            explain_chart("Genre & Decade Hierarchy (Sunburst)", [
+                "Inner ring = genre; outer ring = decades within that genre.",
+                "Segment size = revenue contribution; color intensity = revenue magnitude.",
+                "Click segments to drill down; use it to see which decades drove each genre’s earnings.",
+            ])
+            style_chart(fig, 400)
+            render_chart(fig)
 
 # ============================================
 # TAB 2: INTERACTIVE TOOLS
 # ============================================
-with tab2:
+with tab2, memory_stage("Interactive"):
     st.markdown('<div id="interactive" class="section-anchor"></div>', unsafe_allow_html=True)
     st.markdown('<div class="section-title">🎮 Custom Chart Builder</div>', unsafe_allow_html=True)
     
@@ -1912,65 +2313,130 @@ with tab2:
     with col4:
         size_var = st.selectbox("Size By", ['popularity', 'vote_count', 'revenue', 'budget'])
     
-    plot_df = filtered_df[(filtered_df[x_var] > 0) & (filtered_df[y_var] != 0)].head(400)
-    fig = px.scatter(plot_df, x=x_var, y=y_var, color=color_var, size=size_var,
-                    hover_name='original_title', hover_data=['year', 'director'],
-                    title=f"{y_var.title()} vs {x_var.title()}", color_discrete_sequence=COLORS)
-    add_movie_hover(fig, plot_df)
-    explain_chart("Custom Scatter Builder", [
-        "Pick variables for X/Y to explore relationships in the dataset.",
-        "Color and size let you add extra dimensions (e.g., genre, decade, popularity).",
-        "Hover any point to see details; drag to zoom; double-click to reset.",
-    ])
-    style_chart(fig, 500)
-    render_chart(fig)
+    plot_df = filtered_df[(filtered_df[x_var] > 0) & (filtered_df[y_var] != 0)]
+    plot_df = plot_df.sample(min(400, len(plot_df)), random_state=0)
+    with memory_stage("figures"):
+        fig = px.scatter(plot_df, x=x_var, y=y_var, color=color_var, size=size_var,
+                        hover_name='original_title', hover_data=['year', 'director'],
+                        title=f"{y_var.title()} vs {x_var.title()}", color_discrete_sequence=COLORS,
+                        custom_data=['id'])
+        add_movie_hover(fig, plot_df)
+        explain_chart("Custom Scatter Builder", [
+            "Pick variables for X/Y to explore relationships in the dataset.",
+            "Color and size let you add extra dimensions (e.g., genre, decade, popularity).",
+            "Hover any point to see details; drag to zoom; double-click to reset; click a point to open the movie.",
+        ])
+        style_chart(fig, 500)
+        render_chart(fig, key="builder_chart")
     
     # Movie Comparison Tool
     st.markdown('<div class="section-title">🔄 Movie Comparison</div>', unsafe_allow_html=True)
     
     st.markdown("""
     <div class="concept-box">
-        <div class="concept-title">⚖️ Compare Two Movies Side-by-Side</div>
-        <div class="concept-text">Select any two movies to see how they stack up against each other.</div>
+        <div class="concept-title">⚖️ Compare Movies Side-by-Side</div>
+        <div class="concept-text">Search and add up to 20 movies to see how they stack up, including where each one ranks within your current selection.</div>
     </div>
     """, unsafe_allow_html=True)
 
-    col1, col2 = st.columns(2)
-    movie_list = filtered_df.nlargest(200, 'revenue')['original_title'].tolist() if len(filtered_df) > 0 else []
-    
-    if len(movie_list) > 0:
-        with col1:
-            movie1 = st.selectbox("🎬 First Movie", movie_list, key='m1')
-        with col2:
-            movie2 = st.selectbox("🎬 Second Movie", movie_list, index=min(1, len(movie_list)-1) if len(movie_list) > 1 else 0, key='m2')
-    else:
-        st.info("No movies available with current filters. Adjust filters to see movies.")
-        movie1, movie2 = None, None
-    
-    if movie1 and movie2 and len(filtered_df) > 0:
-        m1 = filtered_df[filtered_df['original_title'] == movie1].iloc[0]
-        m2 = filtered_df[filtered_df['original_title'] == movie2].iloc[0]
-        
-        metrics = ['budget', 'revenue', 'profit', 'vote_average', 'popularity']
-        
-        fig = go.Figure()
-        fig.add_trace(go.Bar(name=movie1[:20], x=metrics, y=[m1[m] for m in metrics], marker_color='#22d3ee'))
-        fig.add_trace(go.Bar(name=movie2[:20], x=metrics, y=[m2[m] for m in metrics], marker_color='#f59e0b'))
-        fig.update_layout(barmode='group', title="Side-by-Side Comparison")
-        explain_chart("Movie Comparison (Grouped Bars)", [
-            "Each group is a metric; bar height compares Movie 1 vs Movie 2.",
-            "Use this to contrast financial performance (budget/revenue/profit) and reception (rating/popularity).",
-            "Tip: If scales feel uneven, focus on relative differences rather than absolute heights.",
-        ])
-        style_chart(fig, 400)
-        render_chart(fig)
-        
-        col1, col2 = st.columns(2)
-        for col, name, data in [(col1, movie1, m1), (col2, movie2, m2)]:
-            with col:
+    mask_arr = mask.to_numpy()
+    if "cmp_ids" not in st.session_state:
+        # Default: the two highest-grossing films in the current selection
+        st.session_state["cmp_ids"] = df['id'].iloc[title_index.search("", limit=2, mask=mask_arr)].tolist()
+
+    pick_col1, pick_col2, pick_col3 = st.columns([2, 3, 1])
+    with pick_col1:
+        # Search box + short match list over the whole filtered catalogue (options stay small)
+        cmp_query = st.text_input("🔍 Find movies to add", key="cmp_q", placeholder="Type any part of a title...")
+    matches = title_index.search(cmp_query, limit=AUTOCOMPLETE_LIMIT, mask=mask_arr)
+    # Options carry the TMDB id, so duplicate titles (remakes) stay distinct
+    cmp_options = list(dict.fromkeys(st.session_state["cmp_ids"] + df['id'].iloc[matches].tolist()))
+    with pick_col2:
+        cmp_ids = st.multiselect("🎬 Movies to compare", cmp_options, key="cmp_ids",
+                                 format_func=movie_label, max_selections=MAX_COMPARE)
+    with pick_col3:
+        rank_scope = st.radio("Rank within", ["Selection", "Same genre"], key="cmp_scope",
+                              help="Percentiles against the filtered movies, or only those sharing each film's primary genre.")
+    if cmp_query and len(matches) == 0:
+        st.caption("No matching movies in the current selection.")
+
+    if len(cmp_ids) > 0:
+        # One vectorized take for all selected films
+        cmp_pos = id_index.positions(cmp_ids)
+        cmp_rows = df.iloc[cmp_pos]
+        names = [movie_label(i)[:28] for i in cmp_ids]
+        palette = [COMPARE_COLORS[i % len(COMPARE_COLORS)] for i in range(len(cmp_ids))]
+
+        # Percentile ranks from the precomputed rank arrays: one cumulative count per
+        # metric per ranking scope, however many films are compared
+        pct = np.full((len(cmp_ids), len(COMPARE_METRICS)), np.nan)
+        if rank_scope == "Selection":
+            pct = rank_index.percentiles(cmp_pos, mask_arr)
+        else:
+            genre_codes = df['primary_genre'].to_numpy()
+            for genre in cmp_rows['primary_genre'].unique():
+                in_genre = (cmp_rows['primary_genre'] == genre).to_numpy()
+                pct[in_genre] = rank_index.percentiles(cmp_pos[in_genre], mask_arr & (genre_codes == genre))
+
+        metric_values = cmp_rows[COMPARE_METRICS].to_numpy(dtype=float, na_value=np.nan)
+        with memory_stage("figures"):
+            fig = make_subplots(rows=1, cols=len(COMPARE_METRICS),
+                                subplot_titles=[COMPARE_LABELS[m] for m in COMPARE_METRICS])
+            for i, name in enumerate(names):
+                for j in range(len(COMPARE_METRICS)):
+                    fig.add_trace(go.Bar(
+                        name=name, x=[name], y=[metric_values[i, j]], marker_color=palette[i],
+                        legendgroup=name, showlegend=(j == 0),
+                        hovertemplate=f"<b>{name}</b><br>%{{y:,.1f}}<extra></extra>",
+                    ), row=1, col=j + 1)
+            fig.update_xaxes(showticklabels=False)
+            fig.update_layout(barmode='group', title="Side-by-Side Comparison")
+            explain_chart("Movie Comparison (Grouped Bars)", [
+                "Each panel is a metric with its own scale; one bar per movie, same colour across panels.",
+                "Use this to contrast financial performance (budget/revenue/profit) and reception (rating/popularity).",
+                "Hover a bar for the exact value.",
+            ])
+            style_chart(fig, 420)
+            render_chart(fig)
+
+        with memory_stage("figures"):
+            fig = go.Figure()
+            theta = [COMPARE_LABELS[m] for m in COMPARE_METRICS]
+            for i, name in enumerate(names):
+                r = np.nan_to_num(pct[i], nan=0.0)
+                fig.add_trace(go.Scatterpolar(
+                    r=np.append(r, r[0]), theta=theta + theta[:1], name=name, fill='toself', opacity=0.55,
+                    line=dict(color=palette[i], width=2),
+                    hovertemplate=f"<b>{name}</b><br>%{{theta}}: %{{r:.0f}}th percentile<extra></extra>",
+                ))
+            fig.update_layout(title=f"Percentile Ranks ({'same genre' if rank_scope == 'Same genre' else 'current selection'})",
+                              polar=dict(radialaxis=dict(range=[0, 100], gridcolor='#3f3f46'), bgcolor='#27272a'))
+            explain_chart("Percentile Radar", [
+                "Each spoke is a metric normalised to a 0–100 percentile rank, so different units are comparable.",
+                "100 = at or above every movie in the current selection (or in the film's own genre).",
+                "Larger shapes mean stronger all-round standing.",
+            ])
+            style_chart(fig, 450)
+            render_chart(fig)
+
+        pct_table = pd.DataFrame(pct, columns=[COMPARE_LABELS[m] for m in COMPARE_METRICS])
+        pct_table.insert(0, "Movie", [movie_label(i) for i in cmp_ids])
+        st.dataframe(
+            pct_table,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                COMPARE_LABELS[m]: st.column_config.ProgressColumn(COMPARE_LABELS[m], format="%.0f", min_value=0, max_value=100)
+                for m in COMPARE_METRICS
+            },
+        )
+
+        card_cols = st.columns(min(len(cmp_ids), 4))
+        for i, (_, data) in enumerate(cmp_rows.iterrows()):
+            with card_cols[i % len(card_cols)]:
                 st.markdown(f"""
                 <div class="info-card">
-                    <div class="info-value">{name[:30]}</div>
+                    <div class="info-value">{data['original_title'][:30]}</div>
                     <div class="info-desc">
                         📅 {int(data['year']) if pd.notna(data['year']) else 'N/A'} • 🎬 {data['director'] if pd.notna(data['director']) else 'Unknown'}<br>
                         💰 Budget: ${data['budget']/1e6:.0f}M • 📈 Revenue: ${data['revenue']/1e6:.0f}M<br>
@@ -1978,6 +2444,37 @@ with tab2:
                     </div>
                 </div>
                 """, unsafe_allow_html=True)
+
+        # Similar movies: k nearest neighbours of one compared film, within the current filters
+        st.markdown("#### 🧭 Find Similar Movies")
+        sim_col1, sim_col2, sim_col3 = st.columns([3, 1, 1])
+        with sim_col1:
+            sim_anchor = st.selectbox("Similar to", cmp_ids, format_func=movie_label, key="sim_anchor")
+        with sim_col2:
+            sim_by = st.radio("Match on", ["Profile", "Plot"], key="sim_by", horizontal=True,
+                              help="Profile: budget, revenue, rating, popularity, year and genres. Plot: overview, tagline and keywords.")
+        with sim_col3:
+            sim_k = st.slider("How many", 5, 20, 10, key="sim_k")
+        similar = similar_movies(sim_anchor, k=sim_k, within=mask_arr, by=sim_by.lower())
+        if sim_by == "Plot":
+            st.caption(text_index_caption())
+        if len(similar) > 0:
+            st.dataframe(similar.drop(columns=['id']), use_container_width=True, hide_index=True,
+                         column_config=SIMILAR_COLUMN_CONFIG)
+
+            def add_similar_to_comparison(ids):
+                current = st.session_state.get("cmp_ids", [])
+                st.session_state["cmp_ids"] = list(dict.fromkeys(current + ids))[:MAX_COMPARE]
+
+            st.button("➕ Add these to the comparison", key="sim_add",
+                      on_click=add_similar_to_comparison, args=(similar['id'].tolist(),),
+                      disabled=len(cmp_ids) >= MAX_COMPARE)
+        else:
+            st.caption("No similar movies within the current filters.")
+    elif len(filtered_df) == 0:
+        st.info("No movies available with current filters. Adjust filters to see movies.")
+    else:
+        st.info("Add at least one movie to compare.")
     
     # Genre Drill-Down
     st.markdown('<div class="section-title">🔍 Genre Deep Dive</div>', unsafe_allow_html=True)
@@ -2005,44 +2502,48 @@ with tab2:
     # Removed (per request): Density heatmap + Strip plot (these were confusing)
 
     # 3D Scatter Plot (full width)
-    scatter_3d_data = filtered_df[(filtered_df['budget'] > 1e6) & (filtered_df['revenue'] > 0)].head(200)
-    fig = px.scatter_3d(scatter_3d_data, x='budget', y='revenue', z='vote_average',
-                       color='is_profitable',
-                       color_discrete_map={True: '#f59e0b', False: '#7c3aed'},
-                       hover_name='original_title',
-                       hover_data={'year': True, 'primary_genre': True, 'director': True,
-                                  'budget': ':$,.0f', 'revenue': ':$,.0f', 'profit': ':$,.0f',
-                                  'roi': ':.0f', 'vote_average': ':.1f', 'vote_count': ':,d'},
-                       title="3D: Budget vs Revenue vs Rating",
-                       labels={'budget': 'Budget', 'revenue': 'Revenue', 'vote_average': 'Rating'})
-    add_movie_hover(fig, scatter_3d_data)
-    explain_chart("3D Budget vs Revenue vs Rating", [
-        "X = budget, Y = revenue, Z = rating (3D view).",
-        "Color indicates profitability (profitable vs loss).",
-        "Drag to rotate; scroll to zoom; hover points for movie details.",
-    ])
-    style_chart(fig, 450)
-    render_chart(fig)
+    scatter_3d_data = filtered_df[(filtered_df['budget'] > 1e6) & (filtered_df['revenue'] > 0)]
+    scatter_3d_data = scatter_3d_data.sample(min(200, len(scatter_3d_data)), random_state=0)
+    with memory_stage("figures"):
+        fig = px.scatter_3d(scatter_3d_data, x='budget', y='revenue', z='vote_average',
+                           color='is_profitable',
+                           color_discrete_map={True: '#f59e0b', False: '#7c3aed'},
+                           hover_name='original_title',
+                           hover_data={'year': True, 'primary_genre': True, 'director': True,
+                                      'budget': ':$,.0f', 'revenue': ':$,.0f', 'profit': ':$,.0f',
+                                      'roi': ':.0f', 'vote_average': ':.1f', 'vote_count': ':,d'},
+                           title="3D: Budget vs Revenue vs Rating",
+                           labels={'budget': 'Budget', 'revenue': 'Revenue', 'vote_average': 'Rating'},
+                           custom_data=['id'])
+        add_movie_hover(fig, scatter_3d_data)
+        explain_chart("3D Budget vs Revenue vs Rating", [
+            "X = budget, Y = revenue, Z = rating (3D view).",
+            "Color indicates profitability (profitable vs loss).",
+            "Drag to rotate; scroll to zoom; hover points for movie details.",
+        ])
+        style_chart(fig, 450)
+        render_chart(fig)
 
     # Area Chart - Revenue Trends by Genre (full width)
-    area_data = filtered_df.groupby(['year', 'primary_genre'])['revenue'].sum().reset_index()
+    area_data = prefetched('genre_year')
     top_genres_area = area_data.groupby('primary_genre')['revenue'].sum().nlargest(5).index
     area_filtered = area_data[area_data['primary_genre'].isin(top_genres_area)]
-    fig = px.area(area_filtered, x='year', y='revenue', color='primary_genre',
-                 title="Revenue Trends by Genre (Area Chart)",
-                 color_discrete_sequence=COLORS)
-    explain_chart("Revenue Trends by Genre (Area)", [
-        "Shows how total revenue changes over time for the top genres.",
-        "Stacked areas indicate relative contribution each year.",
-        "Use legend clicks to isolate a single genre’s trend.",
-    ])
-    style_chart(fig, 450)
-    render_chart(fig)
+    with memory_stage("figures"):
+        fig = px.area(area_filtered, x='year', y='revenue', color='primary_genre',
+                     title="Revenue Trends by Genre (Area Chart)",
+                     color_discrete_sequence=COLORS)
+        explain_chart("Revenue Trends by Genre (Area)", [
+            "Shows how total revenue changes over time for the top genres.",
+            "Stacked areas indicate relative contribution each year.",
+            "Use legend clicks to isolate a single genre’s trend.",
+        ])
+        style_chart(fig, 450)
+        render_chart(fig)
 
 # ============================================
 # TAB 3: FINANCIAL
 # ============================================
-with tab3:
+with tab3, memory_stage("Financial"):
     st.markdown('<div id="financial" class="section-anchor"></div>', unsafe_allow_html=True)
     st.markdown('<div class="section-title">💵 Financial Analysis</div>', unsafe_allow_html=True)
     
@@ -2050,65 +2551,70 @@ with tab3:
     
     with fin_col1:
         top_profit = filtered_df.nlargest(10, 'profit')
-        fig = go.Figure()
-        fig.add_trace(go.Bar(
-            y=top_profit['original_title'], x=top_profit['profit'], orientation='h',
-            marker=dict(color=top_profit['profit'], colorscale='Teal'),
-            text=[f"${x/1e9:.2f}B" if x >= 1e9 else f"${x/1e6:.0f}M" for x in top_profit['profit']],
-            textposition='inside'
-        ))
-        fig.update_layout(title="🏆 Most Profitable", yaxis={'categoryorder': 'total ascending'})
-        explain_chart("Most Profitable (Bar)", [
-            "Ranks movies by total profit (revenue − budget).",
-            "Longer bars = higher profit; use hover to see exact values.",
-            "Great for identifying standout financial wins under your filters.",
-        ])
-        style_chart(fig, 450)
-        render_chart(fig)
+        with memory_stage("figures"):
+            fig = go.Figure()
+            fig.add_trace(go.Bar(
+                y=top_profit['original_title'], x=top_profit['profit'], orientation='h',
+                marker=dict(color=top_profit['profit'], colorscale='Teal'),
+                text=[f"${x/1e9:.2f}B" if x >= 1e9 else f"${x/1e6:.0f}M" for x in top_profit['profit']],
+                textposition='inside'
+            ))
+            fig.update_layout(title="🏆 Most Profitable", yaxis={'categoryorder': 'total ascending'})
+            explain_chart("Most Profitable (Bar)", [
+                "Ranks movies by total profit (revenue − budget).",
+                "Longer bars = higher profit; use hover to see exact values.",
+                "Great for identifying standout financial wins under your filters.",
+            ])
+            style_chart(fig, 450)
+            render_chart(fig)
     
     with fin_col2:
         flops = filtered_df[filtered_df['budget'] > 1e7].nsmallest(10, 'profit')
-        fig = go.Figure()
-        fig.add_trace(go.Bar(
-            y=flops['original_title'], x=flops['profit'], orientation='h',
-            marker_color='#7c3aed',
-            text=[f"-${abs(x)/1e6:.0f}M" for x in flops['profit']],
-            textposition='inside', textfont=dict(color='white')
-        ))
-        fig.update_layout(title="📉 Biggest Flops", yaxis={'categoryorder': 'total descending'})
-        explain_chart("Biggest Flops (Bar)", [
-            "Shows the largest losses among higher-budget films (budget > $10M).",
-            "Bars extend into negative values (loss).",
-            "Use it to see which big investments underperformed financially.",
-        ])
-        style_chart(fig, 450)
-        render_chart(fig)
+        with memory_stage("figures"):
+            fig = go.Figure()
+            fig.add_trace(go.Bar(
+                y=flops['original_title'], x=flops['profit'], orientation='h',
+                marker_color='#7c3aed',
+                text=[f"-${abs(x)/1e6:.0f}M" for x in flops['profit']],
+                textposition='inside', textfont=dict(color='white')
+            ))
+            fig.update_layout(title="📉 Biggest Flops", yaxis={'categoryorder': 'total descending'})
+            explain_chart("Biggest Flops (Bar)", [
+                "Shows the largest losses among higher-budget films (budget > $10M).",
+                "Bars extend into negative values (loss).",
+                "Use it to see which big investments underperformed financially.",
+            ])
+            style_chart(fig, 450)
+            render_chart(fig)
     
     # Budget vs Revenue
     st.markdown('<div class="section-title">💰 Budget vs Revenue</div>', unsafe_allow_html=True)
     
     scatter_data = filtered_df[(filtered_df['budget'] > 1e6) & (filtered_df['revenue'] > 0)]
     scatter = scatter_data.sample(min(400, len(scatter_data))) if len(scatter_data) > 0 else scatter_data
-    fig = px.scatter(scatter, x='budget', y='revenue', color='is_profitable',
-                    color_discrete_map={True: '#f59e0b', False: '#7c3aed'},
-                    hover_name='original_title',
-                    hover_data={'year': True, 'primary_genre': True, 'director': True,
-                               'budget': ':$,.0f', 'revenue': ':$,.0f', 'profit': ':$,.0f',
-                               'roi': ':.0f', 'vote_average': ':.1f', 'vote_count': ':,d', 'popularity': ':.1f'},
-                    size='popularity',
-                    title="Each dot is a movie • Orange = Profit, Purple = Loss")
-    add_movie_hover(fig, scatter)
-    if len(scatter) > 0:
-        max_budget = scatter['budget'].max()
-        fig.add_trace(go.Scatter(x=[0, max_budget], y=[0, max_budget],
-                                mode='lines', name='Break-even', line=dict(dash='dash', color='#71717a')))
-    explain_chart("Budget vs Revenue (Scatter)", [
-        "Each dot is a movie: X = budget, Y = revenue.",
-        "Dashed line is the break-even reference (revenue ≈ budget). Above it generally means profit.",
-        "Color indicates profitability; dot size reflects popularity.",
-    ])
-    style_chart(fig, 500)
-    render_chart(fig)
+    with memory_stage("figures"):
+        fig = px.scatter(scatter, x='budget', y='revenue', color='is_profitable',
+                        color_discrete_map={True: '#f59e0b', False: '#7c3aed'},
+                        hover_name='original_title',
+                        hover_data={'year': True, 'primary_genre': True, 'director': True,
+                                   'budget': ':$,.0f', 'revenue': ':$,.0f', 'profit': ':$,.0f',
+                                   'roi': ':.0f', 'vote_average': ':.1f', 'vote_count': ':,d', 'popularity': ':.1f'},
+                        size='popularity',
+                        title="Each dot is a movie • Orange = Profit, Purple = Loss",
+                        custom_data=['id'])
+        add_movie_hover(fig, scatter)
+        if len(scatter) > 0:
+            max_budget = scatter['budget'].max()
+            fig.add_trace(go.Scatter(x=[0, max_budget], y=[0, max_budget],
+                                    mode='lines', name='Break-even', line=dict(dash='dash', color='#71717a')))
+        explain_chart("Budget vs Revenue (Scatter)", [
+            "Each dot is a movie: X = budget, Y = revenue.",
+            "Dashed line is the break-even reference (revenue ≈ budget). Above it generally means profit.",
+            "Color indicates profitability; dot size reflects popularity.",
+            "Click a dot to open the movie's details.",
+        ])
+        style_chart(fig, 500)
+        render_chart(fig, key="budget_revenue_chart")
     
     # Additional Financial Visualizations
     st.markdown('<div class="section-title">📊 Financial Deep Dive</div>', unsafe_allow_html=True)
@@ -2118,43 +2624,42 @@ with tab3:
     with fin_row1_col1:
         # ROI Distribution Histogram
         roi_data = filtered_df[(filtered_df['budget'] > 1e6) & (filtered_df['roi'].notna())]
-        fig = px.histogram(roi_data, x='roi', nbins=50, 
-                          title="ROI Distribution",
-                          labels={'roi': 'ROI (%)', 'count': 'Number of Movies'},
-                          color_discrete_sequence=['#22d3ee'])
-        fig.add_vline(x=0, line_dash="dash", line_color="#71717a", annotation_text="Break-even")
-        explain_chart("ROI Distribution (Histogram)", [
-            "Shows how return-on-investment (ROI %) is distributed across movies.",
-            "Bars = count of movies in each ROI range; the dashed line marks break-even (0%).",
-            "Use filters to see how ROI shifts by era, genre, or rating threshold.",
-        ])
-        style_chart(fig, 400)
-        render_chart(fig)
+        with memory_stage("figures"):
+            fig = px.histogram(roi_data, x='roi', nbins=50, 
+                              title="ROI Distribution",
+                              labels={'roi': 'ROI (%)', 'count': 'Number of Movies'},
+                              color_discrete_sequence=['#22d3ee'])
+            fig.add_vline(x=0, line_dash="dash", line_color="#71717a", annotation_text="Break-even")
+            explain_chart("ROI Distribution (Histogram)", [
+                "Shows how return-on-investment (ROI %) is distributed across movies.",
+                "Bars = count of movies in each ROI range; the dashed line marks break-even (0%).",
+                "Use filters to see how ROI shifts by era, genre, or rating threshold.",
+            ])
+            style_chart(fig, 400)
+            render_chart(fig)
     
     with fin_row1_col2:
         # Profit/Loss by Decade
-        decade_profit = filtered_df.groupby('decade').agg({
-            'profit': 'sum',
-            'original_title': 'count'
-        }).reset_index()
-        fig = go.Figure()
-        colors = ['#f59e0b' if x >= 0 else '#7c3aed' for x in decade_profit['profit']]
-        fig.add_trace(go.Bar(
-            x=decade_profit['decade'],
-            y=decade_profit['profit'],
-            marker_color=colors,
-            text=[f"${x/1e9:.1f}B" if abs(x) >= 1e9 else f"${x/1e6:.0f}M" for x in decade_profit['profit']],
-            textposition='outside'
-        ))
-        fig.update_layout(title="Total Profit by Decade", yaxis_title="Profit ($)")
-        fig.add_hline(y=0, line_dash="dash", line_color="#71717a")
-        explain_chart("Total Profit by Decade", [
-            "Aggregates profit for each decade (sum across all movies in that decade).",
-            "Bars above 0 = net profitable decade; below 0 = net loss.",
-            "Good for comparing eras while keeping your current filters applied.",
-        ])
-        style_chart(fig, 400)
-        render_chart(fig)
+        decade_profit = prefetched('decade_profit')
+        with memory_stage("figures"):
+            fig = go.Figure()
+            colors = ['#f59e0b' if x >= 0 else '#7c3aed' for x in decade_profit['profit']]
+            fig.add_trace(go.Bar(
+                x=decade_profit['decade'],
+                y=decade_profit['profit'],
+                marker_color=colors,
+                text=[f"${x/1e9:.1f}B" if abs(x) >= 1e9 else f"${x/1e6:.0f}M" for x in decade_profit['profit']],
+                textposition='outside'
+            ))
+            fig.update_layout(title="Total Profit by Decade", yaxis_title="Profit ($)")
+            fig.add_hline(y=0, line_dash="dash", line_color="#71717a")
+            explain_chart("Total Profit by Decade", [
+                "Aggregates profit for each decade (sum across all movies in that decade).",
+                "Bars above 0 = net profitable decade; below 0 = net loss.",
+                "Good for comparing eras while keeping your current filters applied.",
+            ])
+            style_chart(fig, 400)
+            render_chart(fig)
     
     fin_row2_col1, fin_row2_col2 = st.columns(2)
     
@@ -2164,92 +2669,91 @@ with tab3:
         if len(efficiency) > 0:
             efficiency['efficiency'] = efficiency['revenue'] / efficiency['budget']
             top_eff = efficiency.nlargest(15, 'efficiency')
+            with memory_stage("figures"):
+                fig = go.Figure()
+                fig.add_trace(go.Bar(
+                    y=top_eff['original_title'],
+                    x=top_eff['efficiency'],
+                    orientation='h',
+                    marker_color='#10b981',
+                    text=[f"{x:.1f}x" for x in top_eff['efficiency']],
+                    textposition='inside'
+                ))
+                fig.update_layout(title="💰 Most Budget-Efficient Movies (Revenue per $)", 
+                                yaxis={'categoryorder': 'total ascending'})
+                explain_chart("Most Budget‑Efficient (Bar)", [
+                    "Efficiency here is revenue divided by budget (how many dollars earned per $1 spent).",
+                    "Higher bars mean better budget efficiency.",
+                    "Use it to find lean productions that generated strong box office relative to spend.",
+                ])
+                style_chart(fig, 450)
+                render_chart(fig)
+    
+    with fin_row2_col2:
+        # Cumulative Revenue Over Time
+        yearly_cum = cumulative_revenue(prefetched('yearly_revenue'))
+        with memory_stage("figures"):
             fig = go.Figure()
-            fig.add_trace(go.Bar(
-                y=top_eff['original_title'],
-                x=top_eff['efficiency'],
-                orientation='h',
-                marker_color='#10b981',
-                text=[f"{x:.1f}x" for x in top_eff['efficiency']],
-                textposition='inside'
+            fig.add_trace(go.Scatter(
+                x=yearly_cum['year'],
+                y=yearly_cum['cumulative'],
+                mode='lines+markers',
+                fill='tozeroy',
+                fillcolor='rgba(34, 211, 238, 0.2)',
+                line=dict(color='#22d3ee', width=3),
+                name='Cumulative Revenue'
             ))
-            fig.update_layout(title="💰 Most Budget-Efficient Movies (Revenue per $)", 
-                            yaxis={'categoryorder': 'total ascending'})
-            explain_chart("Most Budget‑Efficient (Bar)", [
-                "Efficiency here is revenue divided by budget (how many dollars earned per $1 spent).",
-                "Higher bars mean better budget efficiency.",
-                "Use it to find lean productions that generated strong box office relative to spend.",
+            fig.update_layout(title="📈 Cumulative Revenue Over Time",
+                              yaxis_title="Cumulative Revenue ($)")
+            explain_chart("Cumulative Revenue Over Time", [
+                "Shows running total of revenue as years progress (cumulative sum).",
+                "Steeper slope = faster revenue accumulation in those periods.",
+                "Use it to see long-term growth under your current filters.",
             ])
-            style_chart(fig, 450)
+            style_chart(fig, 400)
             render_chart(fig)
-    
-    with fin_row2_col2:
-        # Cumulative Revenue Over Time
-        yearly_cum = filtered_df.groupby('year').agg({'revenue': 'sum'}).reset_index()
-        yearly_cum = yearly_cum.sort_values('year')
-        yearly_cum['cumulative'] = yearly_cum['revenue'].cumsum()
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=yearly_cum['year'],
-            y=yearly_cum['cumulative'],
-            mode='lines+markers',
-            fill='tozeroy',
-            fillcolor='rgba(34, 211, 238, 0.2)',
-            line=dict(color='#22d3ee', width=3),
-            name='Cumulative Revenue'
-        ))
-        fig.update_layout(title="📈 Cumulative Revenue Over Time",
-                          yaxis_title="Cumulative Revenue ($)")
-        explain_chart("Cumulative Revenue Over Time", [
-            "Shows running total of revenue as years progress (cumulative sum).",
-            "Steeper slope = faster revenue accumulation in those periods.",
-            "Use it to see long-term growth under your current filters.",
-        ])
-        style_chart(fig, 400)
-        render_chart(fig)
 
 # ============================================
 # TAB 4: GENRES
 # ============================================
-with tab4:
+with tab4, memory_stage("Genres"):
     st.markdown('<div id="genres" class="section-anchor"></div>', unsafe_allow_html=True)
     st.markdown('<div class="section-title">🎭 Genre Analysis</div>', unsafe_allow_html=True)
     
-    genre_stats = filtered_df.groupby('primary_genre').agg({
-        'revenue': ['sum', 'mean'], 'profit': 'mean', 'vote_average': 'mean',
-        'is_profitable': 'mean', 'original_title': 'count'
-    }).reset_index()
+    genre_stats = prefetched('genre_stats')
     genre_stats.columns = ['Genre', 'Total Rev', 'Avg Rev', 'Avg Profit', 'Avg Rating', 'Success', 'Count']
 
     col1, col2 = st.columns(2)
     
     with col1:
-        fig = px.treemap(genre_stats, path=['Genre'], values='Total Rev', color='Avg Rating',
-                        color_continuous_scale='Teal', title="Market Share (size = revenue, color = rating)")
-        explain_chart("Genre Market Share (Treemap)", [
-            "Each rectangle is a genre; area = total revenue (market share).",
-            "Color encodes average rating (lighter/darker indicates higher/lower depending on scale).",
-            "Use it to compare both popularity (size) and perceived quality (color).",
-        ])
-        style_chart(fig, 400)
-        render_chart(fig)
+        with memory_stage("figures"):
+            fig = px.treemap(genre_stats, path=['Genre'], values='Total Rev', color='Avg Rating',
+                            color_continuous_scale='Teal', title="Market Share (size = revenue, color = rating)")
+            explain_chart("Genre Market Share (Treemap)", [
+                "Each rectangle is a genre; area = total revenue (market share).",
+                "Color encodes average rating (lighter/darker indicates higher/lower depending on scale).",
+                "Use it to compare both popularity (size) and perceived quality (color).",
+            ])
+            style_chart(fig, 400)
+            render_chart(fig)
     
     with col2:
         top_g = genre_stats.nlargest(8, 'Count')
-        fig = go.Figure()
-        fig.add_trace(go.Scatterpolar(
-            r=top_g['Avg Rating'], theta=top_g['Genre'], fill='toself',
-            fillcolor='rgba(34, 211, 238, 0.3)', line=dict(color='#22d3ee', width=2)
-        ))
-        fig.update_layout(title="Genre Quality Radar",
-                         polar=dict(radialaxis=dict(range=[5, 8], gridcolor='#3f3f46'), bgcolor='#27272a'))
-        explain_chart("Genre Quality Radar", [
-            "Each spoke is a genre; distance from center = average rating.",
-            "Larger shape means higher average ratings across the selected genres.",
-            "Best for quick, high-level comparison (not distribution).",
-        ])
-        style_chart(fig, 400)
-        render_chart(fig)
+        with memory_stage("figures"):
+            fig = go.Figure()
+            fig.add_trace(go.Scatterpolar(
+                r=top_g['Avg Rating'], theta=top_g['Genre'], fill='toself',
+                fillcolor='rgba(34, 211, 238, 0.3)', line=dict(color='#22d3ee', width=2)
+            ))
+            fig.update_layout(title="Genre Quality Radar",
+                             polar=dict(radialaxis=dict(range=[5, 8], gridcolor='#3f3f46'), bgcolor='#27272a'))
+            explain_chart("Genre Quality Radar", [
+                "Each spoke is a genre; distance from center = average rating.",
+                "Larger shape means higher average ratings across the selected genres.",
+                "Best for quick, high-level comparison (not distribution).",
+            ])
+            style_chart(fig, 400)
+            render_chart(fig)
     
     # Additional Genre Visualizations
     st.markdown('<div class="section-title">🎨 Genre Analytics</div>', unsafe_allow_html=True)
@@ -2259,34 +2763,32 @@ with tab4:
     with genre_row1_col1:
         # Genre Performance Matrix (Heatmap)
         if len(filtered_df) > 0:
-            genre_matrix = filtered_df.groupby(['primary_genre', 'decade']).agg({
-                'revenue': 'mean',
-                'vote_average': 'mean'
-            }).reset_index()
+            genre_matrix = prefetched('genre_matrix')
             if len(genre_matrix) > 0:
                 top_genres_m = genre_matrix.groupby('primary_genre')['revenue'].sum().nlargest(8).index
                 matrix_data = genre_matrix[genre_matrix['primary_genre'].isin(top_genres_m)]
                 if len(matrix_data) > 0:
                     matrix_pivot = matrix_data.pivot(index='primary_genre', columns='decade', values='revenue').fillna(0)
-                    fig = go.Figure(data=go.Heatmap(
-                        z=matrix_pivot.values,
-                        x=matrix_pivot.columns,
-                        y=matrix_pivot.index,
-                        colorscale='Teal',
-                        colorbar=dict(title="Avg Revenue ($)")
-                    ))
-                    # Force clear hover tooltips (Genre / Decade / Avg Revenue)
-                    fig.update_traces(
-                        hovertemplate="Genre: %{y}<br>Decade: %{x}<br>Avg Revenue: $%{z:,.0f}<extra></extra>"
-                    )
-                    fig.update_layout(title="Genre Performance by Decade (Heatmap)", height=400)
-                    explain_chart("Genre Performance by Decade (Heatmap)", [
-                        "Rows = genres; columns = decades; color = average revenue for that genre/decade.",
-                        "Use it to spot which genres dominated which eras.",
-                        "Hover a cell for exact values.",
-                    ])
-                    style_chart(fig, 400)
-                    render_chart(fig)
+                    with memory_stage("figures"):
+                        fig = go.Figure(data=go.Heatmap(
+                            z=matrix_pivot.values,
+                            x=matrix_pivot.columns,
+                            y=matrix_pivot.index,
+                            colorscale='Teal',
+                            colorbar=dict(title="Avg Revenue ($)")
+                        ))
+                        # Force clear hover tooltips (Genre / Decade / Avg Revenue)
+                        fig.update_traces(
+                            hovertemplate="Genre: %{y}<br>Decade: %{x}<br>Avg Revenue: $%{z:,.0f}<extra></extra>"
+                        )
+                        fig.update_layout(title="Genre Performance by Decade (Heatmap)", height=400)
+                        explain_chart("Genre Performance by Decade (Heatmap)", [
+                            "Rows = genres; columns = decades; color = average revenue for that genre/decade.",
+                            "Use it to spot which genres dominated which eras.",
+                            "Hover a cell for exact values.",
+                        ])
+                        style_chart(fig, 400)
+                        render_chart(fig)
                 else:
                     st.info("No genre matrix data available.")
             else:
@@ -2296,20 +2798,62 @@ with tab4:
     
     with genre_row1_col2:
         # Stacked Bar - Genre Revenue Over Time
-        genre_year = filtered_df.groupby(['year', 'primary_genre'])['revenue'].sum().reset_index()
+        genre_year = prefetched('genre_year')
         top_genres_sb = genre_year.groupby('primary_genre')['revenue'].sum().nlargest(6).index
         stacked_data = genre_year[genre_year['primary_genre'].isin(top_genres_sb)]
-        fig = px.bar(stacked_data, x='year', y='revenue', color='primary_genre',
-                    title="Genre Revenue Over Time (Stacked)",
-                    color_discrete_sequence=COLORS)
-        explain_chart("Genre Revenue Over Time (Stacked Bars)", [
-            "Each bar is a year; colored segments show how each top genre contributed to revenue that year.",
-            "Taller bars mean higher total revenue; segment thickness shows genre contribution.",
-            "Click legend items to focus on specific genres.",
-        ])
-        style_chart(fig, 400)
-        render_chart(fig)
+        with memory_stage("figures"):
+            fig = px.bar(stacked_data, x='year', y='revenue', color='primary_genre',
+                        title="Genre Revenue Over Time (Stacked)",
+                        color_discrete_sequence=COLORS)
+            explain_chart("Genre Revenue Over Time (Stacked Bars)", [
+                "Each bar is a year; colored segments show how each top genre contributed to revenue that year.",
+                "Taller bars mean higher total revenue; segment thickness shows genre contribution.",
+                "Click legend items to focus on specific genres.",
+            ])
+            style_chart(fig, 400)
+            render_chart(fig)
     
+    # Genre Co-occurrence (all listed genres, not just the primary one)
+    st.markdown('<div class="section-title">🔗 Genre Co-occurrence</div>', unsafe_allow_html=True)
+    if len(filtered_df) > 0:
+        co_counts, co_sums = genre_cooccurrence(filter_key, mask)
+        present = [g for g in genre_labels if co_counts.at[g, g] > 0]
+        co_counts, co_sums = co_counts.loc[present, present], co_sums.loc[present, present]
+        co_metric = st.radio("Cell value", ["Movies together", "Avg revenue"], horizontal=True, key="co_metric")
+        co_col1, co_col2 = st.columns([3, 2])
+        with co_col1:
+            if co_metric == "Movies together":
+                z, fmt, title = co_counts.values, "%{z:,}", "Movies Sharing Both Genres"
+            else:
+                z = np.divide(co_sums.values, co_counts.values, out=np.zeros(co_sums.shape), where=co_counts.values > 0)
+                fmt, title = "$%{z:,.0f}", "Average Revenue of Movies with Both Genres"
+            with memory_stage("figures"):
+                fig = go.Figure(data=go.Heatmap(
+                    z=z, x=present, y=present, colorscale='Teal',
+                    hovertemplate=f"%{{y}} + %{{x}}<br>{co_metric}: {fmt}<extra></extra>",
+                ))
+                fig.update_layout(title=title, height=520)
+                explain_chart("Genre Co-occurrence (Heatmap)", [
+                    "Uses every genre a movie is tagged with (not just the primary one).",
+                    "Each cell pairs a row genre with a column genre; the diagonal is the genre on its own.",
+                    "Switch the cell value to compare how often genres are combined vs how well those combinations earn.",
+                ])
+                style_chart(fig, 520)
+                render_chart(fig)
+        with co_col2:
+            pairs = top_pairs(co_counts, co_sums, n=15)
+            st.markdown("#### 🤝 Most Common Pairings")
+            st.dataframe(
+                pairs.rename(columns={'first': 'Genre', 'second': 'With', 'count': 'Movies', 'mean': 'Avg Revenue'})
+                     [['Genre', 'With', 'Movies', 'Avg Revenue']],
+                use_container_width=True,
+                hide_index=True,
+                height=480,
+                column_config={'Avg Revenue': st.column_config.NumberColumn(format="$%.0f")},
+            )
+    else:
+        st.info("No data available for genre co-occurrence.")
+
     # Removed: Parallel Coordinates (per request).
     # Keep a simpler, readable alternative: a compact metrics table + the funnel chart.
     st.markdown("#### 📋 Top Genres (Quick Metrics)")
@@ -2338,28 +2882,142 @@ with tab4:
     with st.container():
         # Funnel Chart - Genre Success Funnel
         funnel_data = genre_stats.nlargest(10, 'Total Rev')
-        fig = go.Figure(go.Funnel(
-            y=funnel_data['Genre'],
-            x=funnel_data['Total Rev'],
-            textposition="inside",
-            textinfo="value+percent initial",
-            marker=dict(color=funnel_data['Avg Rating'],
-                       colorscale='Teal',
-                       line=dict(color='#27272a', width=2))
-        ))
-        fig.update_layout(title="Genre Revenue Funnel (Top 10)")
-        explain_chart("Genre Revenue Funnel", [
-            "Ranks the top genres by total revenue from largest to smallest.",
-            "Useful for seeing concentration: how much the top few genres dominate.",
-            "Hover to see exact totals for each genre.",
-        ])
-        style_chart(fig, 400)
-        render_chart(fig)
+        with memory_stage("figures"):
+            fig = go.Figure(go.Funnel(
+                y=funnel_data['Genre'],
+                x=funnel_data['Total Rev'],
+                textposition="inside",
+                textinfo="value+percent initial",
+                marker=dict(color=funnel_data['Avg Rating'],
+                           colorscale='Teal',
+                           line=dict(color='#27272a', width=2))
+            ))
+            fig.update_layout(title="Genre Revenue Funnel (Top 10)")
+            explain_chart("Genre Revenue Funnel", [
+                "Ranks the top genres by total revenue from largest to smallest.",
+                "Useful for seeing concentration: how much the top few genres dominate.",
+                "Hover to see exact totals for each genre.",
+            ])
+            style_chart(fig, 400)
+            render_chart(fig)
+
+    # Bootstrapped intervals run as a background job: thousands of resamples don't fit in a rerun
+    st.markdown('<div class="section-title">📏 How Sure Are the Genre Medians?</div>', unsafe_allow_html=True)
+    ci_metric = st.radio("Median of", ["Revenue", "Rating"], horizontal=True, key="ci_metric")
+    ci_column = 'revenue' if ci_metric == "Revenue" else 'vote_average'
+    top_genres_ci = filtered_df['primary_genre'].value_counts().head(8).index
+    # Zero revenue or rating means unknown here, as elsewhere in the app
+    ci_rows = filtered_df[filtered_df['primary_genre'].isin(top_genres_ci) & (filtered_df[ci_column] > 0)]
+    if len(ci_rows) > 0:
+        genre_intervals((filter_key, ci_column), ci_rows[ci_column].to_numpy(dtype=float),
+                        ci_rows['primary_genre'].astype(str).to_numpy(), ci_metric)
+    else:
+        st.info("No data available for genre intervals.")
+
+# ============================================
+# TAB: PEOPLE
+# ============================================
+with tab_people, memory_stage("People"):
+    st.markdown('<div id="people" class="section-anchor"></div>', unsafe_allow_html=True)
+    st.markdown('<div class="section-title">👥 Director & Cast Leaderboards</div>', unsafe_allow_html=True)
+
+    lb_col1, lb_col2, lb_col3, lb_col4 = st.columns(4)
+    with lb_col1:
+        lb_role = st.radio("People", ["Directors", "Cast"], horizontal=True, key="lb_role")
+    with lb_col2:
+        lb_sort = st.selectbox("Rank by", list(LEADERBOARD_METRICS), key="lb_sort")
+    with lb_col3:
+        lb_min = st.slider("Minimum films", 1, 20, 3, key="lb_min")
+    with lb_col4:
+        lb_leads = st.checkbox("Lead roles only (top 3 billed)", value=False, key="lb_leads",
+                               disabled=(lb_role == "Directors"))
+
+    if len(filtered_df) > 0:
+        board = people_leaderboard(filter_key, mask, DIRECTOR if lb_role == "Directors" else CAST,
+                                   3 if (lb_leads and lb_role == "Cast") else None, lb_min)
+        board = board.nlargest(25, LEADERBOARD_METRICS[lb_sort])
+        if len(board) > 0:
+            top15 = board.head(15)
+            with memory_stage("figures"):
+                fig = go.Figure(go.Bar(
+                    y=top15['name'], x=top15[LEADERBOARD_METRICS[lb_sort]], orientation='h',
+                    marker=dict(color=top15['avg_rating'], colorscale='Teal', colorbar=dict(title="Avg Rating")),
+                    customdata=np.column_stack([top15['films'], top15['hit_rate'] * 100]),
+                    hovertemplate="<b>%{y}</b><br>" + lb_sort + ": %{x:,.2f}<br>Films: %{customdata[0]}"
+                                  "<br>Hit rate: %{customdata[1]:.0f}%<extra></extra>",
+                ))
+                fig.update_layout(title=f"Top {lb_role} by {lb_sort}", yaxis={'categoryorder': 'total ascending'})
+                explain_chart(f"{lb_role} Leaderboard", [
+                    f"Ranks {lb_role.lower()} by {lb_sort.lower()} across the movies in your current filters.",
+                    "Bar colour = average rating of their films; hover for film count and hit rate.",
+                    "Hit rate = share of their films that made a profit. Raise 'Minimum films' to hide one-hit wonders.",
+                ])
+                style_chart(fig, 480)
+                render_chart(fig)
+
+            st.dataframe(
+                board.rename(columns={'name': 'Name', 'films': 'Films', 'total_profit': 'Total Profit',
+                                      'median_profit': 'Median Profit', 'hit_rate': 'Hit Rate', 'avg_rating': 'Avg Rating'}),
+                use_container_width=True,
+                hide_index=True,
+                height=400,
+                column_config={
+                    'Total Profit': st.column_config.NumberColumn(format="$%.0f"),
+                    'Median Profit': st.column_config.NumberColumn(format="$%.0f"),
+                    'Hit Rate': st.column_config.ProgressColumn(format="%.2f", min_value=0, max_value=1),
+                    'Avg Rating': st.column_config.NumberColumn(format="%.1f"),
+                },
+            )
+        else:
+            st.info("Nobody meets the minimum film count with current filters.")
+    else:
+        st.info("No movies available with current filters.")
+
+    st.markdown('<div class="section-title">🕸️ Collaboration Network</div>', unsafe_allow_html=True)
+    net_col1, net_col2 = st.columns(2)
+    with net_col1:
+        net_nodes = st.slider("People shown", 10, 150, 60, step=10, key="net_nodes")
+    with net_col2:
+        net_min = st.slider("Minimum shared films", 1, 10, 2, key="net_min")
+
+    if len(filtered_df) > 0:
+        adjacency = collaboration_adjacency(mask.to_numpy())
+        nodes, edges = collaboration_graph.subgraph(adjacency, max_nodes=net_nodes, min_shared=net_min)
+        if len(edges) > 0:
+            pos = collaboration_layout(tuple(nodes.tolist()), tuple(edges.ravel().tolist()))
+            i, j = edges[:, 0].astype(int), edges[:, 1].astype(int)
+            edge_x = np.column_stack([pos[i, 0], pos[j, 0], np.full(len(i), np.nan)]).ravel()
+            edge_y = np.column_stack([pos[i, 1], pos[j, 1], np.full(len(i), np.nan)]).ravel()
+            strength = np.bincount(i, weights=edges[:, 2], minlength=len(nodes)) + \
+                np.bincount(j, weights=edges[:, 2], minlength=len(nodes))
+            directors = collaboration_graph.is_director[nodes]
+            with memory_stage("figures"):
+                fig = go.Figure()
+                fig.add_trace(go.Scatter(x=edge_x, y=edge_y, mode='lines', hoverinfo='skip',
+                                         line=dict(width=1, color='rgba(150,150,150,0.4)'), showlegend=False))
+                for label, sel, color in [("Director", directors, '#f59e0b'), ("Cast", ~directors, '#14b8a6')]:
+                    fig.add_trace(go.Scatter(
+                        x=pos[sel, 0], y=pos[sel, 1], mode='markers', name=label,
+                        text=collaboration_graph.names[nodes[sel]], customdata=strength[sel],
+                        marker=dict(size=6 + 3 * np.sqrt(strength[sel]), color=color, line=dict(width=1, color='white')),
+                        hovertemplate="<b>%{text}</b><br>Shared credits: %{customdata:.0f}<extra>" + label + "</extra>",
+                    ))
+                fig.update_layout(title="Who Works With Whom",
+                                  xaxis=dict(visible=False), yaxis=dict(visible=False, scaleanchor='x'))
+                explain_chart("Collaboration Network", [
+                    "Each dot is a director or one of the top-3 billed actors; lines join people who share films in your selection.",
+                    "Dot size = how many shared credits they have with the others shown.",
+                    "Raise 'Minimum shared films' to keep only recurring partnerships.",
+                ])
+                style_chart(fig, 600)
+                render_chart(fig)
+        else:
+            st.info("No collaborations meet the minimum shared film count with current filters.")
 
 # ============================================
 # TAB 5: VISUALIZATION CONCEPTS
 # ============================================
-with tab_concepts:
+with tab_concepts, memory_stage("Concepts"):
     st.markdown('<div class="section-title">🎓 Data Visualization Concepts</div>', unsafe_allow_html=True)
     
     st.markdown("""
@@ -2392,19 +3050,20 @@ with tab_concepts:
         # Use *counts* here to teach bar charts without repeating the same insight.
         genre_counts = filtered_df['primary_genre'].value_counts().head(5).reset_index()
         genre_counts.columns = ['primary_genre', 'count']
-        fig = px.bar(
-            genre_counts,
-            x='primary_genre',
-            y='count',
-            color_discrete_sequence=['#22d3ee']
-        )
-        explain_chart("Example: Bar Chart", [
-            "Bars compare categories (genres) by a single value (movie count).",
-            "Read the height: taller bar = larger value.",
-            "Best for quick ranking and category comparison.",
-        ])
-        style_chart(fig, 220)
-        render_chart(fig)
+        with memory_stage("figures"):
+            fig = px.bar(
+                genre_counts,
+                x='primary_genre',
+                y='count',
+                color_discrete_sequence=['#22d3ee']
+            )
+            explain_chart("Example: Bar Chart", [
+                "Bars compare categories (genres) by a single value (movie count).",
+                "Read the height: taller bar = larger value.",
+                "Best for quick ranking and category comparison.",
+            ])
+            style_chart(fig, 220)
+            render_chart(fig)
     
     with col2:
         st.caption("📈 Scatter: Relationships")
@@ -2412,42 +3071,45 @@ with tab_concepts:
         # Teach scatter using a different relationship: runtime vs revenue.
         scatter_subset = filtered_df[(filtered_df['runtime'] > 0) & (filtered_df['revenue'] > 0)]
         s = scatter_subset.sample(min(120, len(scatter_subset))) if len(scatter_subset) > 0 else scatter_subset
-        fig = px.scatter(
-            s,
-            x='runtime',
-            y='revenue',
-            hover_name='original_title',
-            color_discrete_sequence=['#f59e0b'],
-            labels={'runtime': 'Runtime (min)', 'revenue': 'Revenue ($)'},
-        )
-        add_movie_hover(fig, s)
-        explain_chart("Example: Scatter Plot", [
-            "Each dot is a movie; X = runtime and Y = revenue.",
-            "Patterns show relationships (if any) and help you spot clusters/outliers.",
-            "Outliers are easy to spot: dots far from the main cluster.",
-        ])
-        style_chart(fig, 220)
-        render_chart(fig)
+        with memory_stage("figures"):
+            fig = px.scatter(
+                s,
+                x='runtime',
+                y='revenue',
+                hover_name='original_title',
+                color_discrete_sequence=['#f59e0b'],
+                labels={'runtime': 'Runtime (min)', 'revenue': 'Revenue ($)'},
+                custom_data=['id'],
+            )
+            add_movie_hover(fig, s)
+            explain_chart("Example: Scatter Plot", [
+                "Each dot is a movie; X = runtime and Y = revenue.",
+                "Patterns show relationships (if any) and help you spot clusters/outliers.",
+                "Outliers are easy to spot: dots far from the main cluster.",
+            ])
+            style_chart(fig, 220)
+            render_chart(fig)
     
     with col3:
         st.caption("📉 Line: Trends over time")
         # De-dup: total revenue over time is already shown elsewhere.
         # Teach line charts using average rating over time.
-        y = filtered_df.groupby('year')['vote_average'].mean().reset_index()
-        fig = px.line(
-            y,
-            x='year',
-            y='vote_average',
-            color_discrete_sequence=['#22d3ee'],
-            labels={'vote_average': 'Average Rating'},
-        )
-        explain_chart("Example: Line Chart", [
-            "Shows change over time; X = year and Y = average rating.",
-            "Slopes indicate improvement/decline; peaks indicate stronger-rated periods.",
-            "Great for trend detection and time comparisons.",
-        ])
-        style_chart(fig, 220)
-        render_chart(fig)
+        y = grouped(['year'], vote_average=('vote_average', 'mean'))
+        with memory_stage("figures"):
+            fig = px.line(
+                y,
+                x='year',
+                y='vote_average',
+                color_discrete_sequence=['#22d3ee'],
+                labels={'vote_average': 'Average Rating'},
+            )
+            explain_chart("Example: Line Chart", [
+                "Shows change over time; X = year and Y = average rating.",
+                "Slopes indicate improvement/decline; peaks indicate stronger-rated periods.",
+                "Great for trend detection and time comparisons.",
+            ])
+            style_chart(fig, 220)
+            render_chart(fig)
     
     # Concept 2: Color
     st.markdown("### 🎨 2. Strategic Use of Colour")
@@ -2465,31 +3127,33 @@ with tab_concepts:
     with color_col1:
         st.caption("Sequential: Revenue (low → high)")
         top = filtered_df.nlargest(5, 'revenue')
-        fig = px.bar(top, y='original_title', x='revenue', orientation='h',
-                    color='revenue', color_continuous_scale='Teal')
-        fig.update_layout(yaxis={'categoryorder':'total ascending'})
-        explain_chart("Sequential Color (Revenue)", [
-            "A single-hue gradient represents low → high values.",
-            "Good when you’re encoding magnitude (more = stronger color).",
-            "Hover to see exact values; color helps quick visual ranking.",
-        ])
-        style_chart(fig, 250)
-        render_chart(fig)
+        with memory_stage("figures"):
+            fig = px.bar(top, y='original_title', x='revenue', orientation='h',
+                        color='revenue', color_continuous_scale='Teal')
+            fig.update_layout(yaxis={'categoryorder':'total ascending'})
+            explain_chart("Sequential Color (Revenue)", [
+                "A single-hue gradient represents low → high values.",
+                "Good when you’re encoding magnitude (more = stronger color).",
+                "Hover to see exact values; color helps quick visual ranking.",
+            ])
+            style_chart(fig, 250)
+            render_chart(fig)
     
     with color_col2:
         st.caption("Diverging: Profit (orange) vs Loss (purple)")
         sample = pd.concat([filtered_df[filtered_df['budget']>1e7].nlargest(3,'profit'),
                           filtered_df[filtered_df['budget']>1e7].nsmallest(3,'profit')])
-        fig = px.bar(sample, y='original_title', x='profit', orientation='h',
-                    color='profit', color_continuous_scale=DIVERGING)
-        fig.update_layout(yaxis={'categoryorder':'total ascending'})
-        explain_chart("Diverging Color (Profit vs Loss)", [
-            "Two-color scale shows direction around a meaningful midpoint (0 profit).",
-            "One end represents losses, the other represents gains.",
-            "Use it when values can be meaningfully ‘above vs below’ a baseline.",
-        ])
-        style_chart(fig, 250)
-        render_chart(fig)
+        with memory_stage("figures"):
+            fig = px.bar(sample, y='original_title', x='profit', orientation='h',
+                        color='profit', color_continuous_scale=DIVERGING)
+            fig.update_layout(yaxis={'categoryorder':'total ascending'})
+            explain_chart("Diverging Color (Profit vs Loss)", [
+                "Two-color scale shows direction around a meaningful midpoint (0 profit).",
+                "One end represents losses, the other represents gains.",
+                "Use it when values can be meaningfully ‘above vs below’ a baseline.",
+            ])
+            style_chart(fig, 250)
+            render_chart(fig)
     
     # Concept 3: Interactivity
     st.markdown("### 🖱️ 3. Interactive Exploration")
@@ -2517,27 +3181,28 @@ with tab_concepts:
     </div>
     """, unsafe_allow_html=True)
     
-    yearly = filtered_df.groupby('year')['revenue'].mean().reset_index()
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(x=yearly['year'], y=yearly['revenue'], mode='lines+markers',
-                            line=dict(color='#22d3ee', width=2)))
-    avg = yearly['revenue'].mean()
-    fig.add_hline(y=avg, line_dash="dash", line_color="#71717a", annotation_text=f"Average: ${avg/1e6:.0f}M")
-    peak = yearly.loc[yearly['revenue'].idxmax()]
-    fig.add_annotation(x=peak['year'], y=peak['revenue'], text="Peak Year ↑", showarrow=True, arrowhead=2, arrowcolor='#f59e0b')
-    fig.update_layout(title="Average Revenue by Year (Annotated)")
-    explain_chart("Annotated Trend (Example)", [
-        "Reference line shows the overall average (benchmark).",
-        "Callout highlights an important event/peak so it’s not missed.",
-        "Annotations add context and guide attention to key insights.",
-    ])
-    style_chart(fig, 350)
-    render_chart(fig)
+    yearly = grouped(['year'], revenue=('revenue', 'mean'))
+    with memory_stage("figures"):
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(x=yearly['year'], y=yearly['revenue'], mode='lines+markers',
+                                line=dict(color='#22d3ee', width=2)))
+        avg = yearly['revenue'].mean()
+        fig.add_hline(y=avg, line_dash="dash", line_color="#71717a", annotation_text=f"Average: ${avg/1e6:.0f}M")
+        peak = yearly.loc[yearly['revenue'].idxmax()]
+        fig.add_annotation(x=peak['year'], y=peak['revenue'], text="Peak Year ↑", showarrow=True, arrowhead=2, arrowcolor='#f59e0b')
+        fig.update_layout(title="Average Revenue by Year (Annotated)")
+        explain_chart("Annotated Trend (Example)", [
+            "Reference line shows the overall average (benchmark).",
+            "Callout highlights an important event/peak so it’s not missed.",
+            "Annotations add context and guide attention to key insights.",
+        ])
+        style_chart(fig, 350)
+        render_chart(fig)
 
 # ============================================
 # TAB 6: EXPLORER
 # ============================================
-with tab6:
+with tab6, memory_stage("Explorer"):
     st.markdown('<div id="explorer" class="section-anchor"></div>', unsafe_allow_html=True)
     st.markdown('<div class="section-title">🔍 Movie Explorer</div>', unsafe_allow_html=True)
     
@@ -2549,21 +3214,24 @@ with tab6:
     with search_col3:
         sort_order = st.selectbox("Order", ['Descending', 'Ascending'])
     
-    results = filtered_df.copy()
+    results = filtered_df
     if search:
         results = results[results['original_title'].str.contains(search, case=False, na=False)]
     results = results.sort_values(sort_by, ascending=(sort_order == 'Ascending'))
     
     st.markdown(f"**{len(results):,} movies found**")
     
-    for _, row in results.head(15).iterrows():
+    for i, (pos, row) in enumerate(results.head(15).iterrows()):
         with st.expander(f"🎬 {row['original_title']} ({int(row['year']) if pd.notna(row['year']) else 'N/A'})"):
             col1, col2, col3 = st.columns([2,1,1])
             with col1:
                 st.write(f"**Director:** {row['director']}")
                 st.write(f"**Genre:** {row['genres']}")
-                if pd.notna(row['tagline']):
-                    st.write(f"*\"{row['tagline']}\"*")
+                tagline = movie_text.row(pos)['tagline']
+                if tagline:
+                    st.write(f"*\"{tagline}\"*")
+                if st.button("🔎 Open details", key=f"open_{i}_{row['id']}"):
+                    show_movie(row['id'])
             with col2:
                 st.metric("Revenue", f"${row['revenue']/1e6:.0f}M")
                 st.metric("Budget", f"${row['budget']/1e6:.0f}M")
@@ -2574,8 +3242,26 @@ with tab6:
                 st.metric("Profit", f"${row['profit']/1e6:.0f}M", delta=profit_delta, delta_color=delta_color)
     
     st.markdown("---")
-    st.dataframe(results[['original_title','year','primary_genre','director','budget','revenue','profit','vote_average']].head(100), use_container_width=True, height=400)
-    st.download_button("📥 Download CSV", results.to_csv(index=False), "movies.csv", "text/csv")
+    explorer_cols = ['original_title','year','primary_genre','director','budget','revenue','profit','vote_average']
+    st.dataframe(results[explorer_cols].head(100), use_container_width=True, height=400)
+
+    # Export is generated only when the download is clicked (deferred callable), not on every rerun
+    with st.expander("📥 Export results", expanded=False):
+        export_col1, export_col2 = st.columns([3, 1])
+        with export_col1:
+            export_cols = st.multiselect("Columns", list(results.columns) + movie_text.columns,
+                                         default=explorer_cols, key="export_cols")
+        with export_col2:
+            export_fmt = st.radio("Format", list(EXPORT_FORMATS), horizontal=True, key="export_fmt")
+        export_ext, export_mime = EXPORT_FORMATS[export_fmt]
+        st.download_button(
+            f"📥 Download {export_fmt}",
+            data=lambda: export_frame(movie_text.attach(results, export_cols), export_cols, export_fmt),
+            file_name=f"movies.{export_ext}",
+            mime=export_mime,
+            on_click="ignore",
+            disabled=len(results) == 0 or not export_cols,
+        )
 
 # ============================================
 # FOOTER
@@ -2587,3 +3273,20 @@ st.markdown(f"""
     <div style="font-size:0.85rem; margin-top:5px;">ITD112 Data Visualization Project • {len(df):,} Movies</div>
 </div>
 """, unsafe_allow_html=True)
+
+finish_profile(rerun_profile, {
+    'tab': st.session_state.get("main_tab"),
+    'filters': filter_key._asdict(),
+    'perf_mode': st.session_state.get("perf_mode"),
+})
+
+memory_summary = finish_memtrace(rerun_memory, st.session_state)
+if memory_summary:
+    with st.sidebar.expander("🧠 Memory (this rerun)", expanded=False):
+        st.dataframe(summary_table(memory_summary), hide_index=True, use_container_width=True)
+        st.caption(f"Traced {memory_summary['traced_bytes'] / 2**20:.0f} MiB · session state "
+                   f"{sum(memory_summary['session_state_bytes'].values()) / 2**20:.1f} MiB · st.cache_data "
+                   f"{sum(memory_summary['cache_data_bytes'].values()) / 2**20:.1f} MiB · "
+                   f"{memory_summary['active_sessions']} active session(s)")
+        for stage, slope in memory_summary['growing_with_sessions'].items():
+            st.warning(f"{stage}: +{slope / 2**20:.1f} MiB per active session")
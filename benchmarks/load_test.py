@@ -0,0 +1,238 @@
+"""How many simultaneous analysts one server process handles.
+
+Runs N sessions at once as AppTest instances on threads of one process,
+which is how a Streamlit server runs sessions: each rerun on its own
+thread, all sharing the process's resource and data caches. Every session
+replays its own random trace of interactions (see benchmarks.reruns) with
+optional think time, and for each concurrency level the tool reports
+throughput, p50/p95/p99 rerun latency and resident memory per session.
+A warm-up session first loads what all sessions share; with `--cold`
+caches are cleared before each level instead, so the cost of filling
+them shows up in the latencies.
+
+    python -m benchmarks.load_test --sessions 1 4 16 --steps 20
+    python -m benchmarks.load_test --sessions 8 --cold --out cold.json   # caches cleared first
+
+Compare two reports (before/after a caching or dataset change) with
+`--baseline`.
+
+Running sessions side by side means patching Streamlit internals (the
+Runtime singleton, AppTest's script cache and config patching), so the tool
+refuses Streamlit versions other than STREAMLIT_TESTED unless run with
+`--any-streamlit`; re-check `shared_runtime` when moving the pin.
+"""
+import argparse
+import contextlib
+import os
+import random
+import threading
+import time
+from unittest import mock
+
+from benchmarks import report as reports
+from benchmarks.reruns import APP, INTERACTIONS, _interact, _run, server_script_cache, summarize
+
+# Streamlit release (major.minor) whose private internals shared_runtime() was written against;
+# keep in step with the pin in requirements.txt
+STREAMLIT_TESTED = "1.66"
+
+
+def check_streamlit(allow_other: bool = False) -> None:
+    """Refuse to run on a Streamlit release the internals patching hasn't been checked against."""
+    import streamlit
+
+    release = ".".join(streamlit.__version__.split(".")[:2])
+    if release == STREAMLIT_TESTED:
+        return
+    message = (f"benchmarks.load_test was written against Streamlit {STREAMLIT_TESTED}.x and patches its "
+               f"internals; found {streamlit.__version__}")
+    if not allow_other:
+        raise SystemExit(message + ". Check shared_runtime() and update STREAMLIT_TESTED, "
+                                   "or pass --any-streamlit to run anyway.")
+    print(f"warning: {message}; results may be wrong")
+
+
+@contextlib.contextmanager
+def shared_runtime():
+    """Let AppTest sessions run side by side, as sessions share one server.
+
+    Every AppTest run installs a mock Runtime and the `global.appTest` option
+    and removes both when it finishes, pulling them from under sessions still
+    running on other threads. Here both are installed once for the whole
+    test, and each run's own Runtime is diverted to a subclass nobody reads.
+    """
+    from streamlit.components.v2.component_manager import BidiComponentManager
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+    from streamlit.runtime.dataframe_source_manager import DataframeSourceManager
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+    from streamlit.testing.v1.util import patch_config_options
+
+    class SessionRuntime(Runtime):
+        pass
+
+    runtime = mock.MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.dataframe_source_mgr = DataframeSourceManager()
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    components = BidiComponentManager()
+    components.discover_and_register_components(start_file_watching=False)
+    runtime.bidi_component_registry = components
+
+    previous, Runtime._instance = Runtime._instance, runtime
+    try:
+        with patch_config_options({"global.appTest": True}), \
+                mock.patch("streamlit.testing.v1.app_test.Runtime", SessionRuntime), server_script_cache():
+            yield
+    finally:
+        Runtime._instance = previous
+
+
+def make_trace(seed: int, steps: int, interactions: list[str]) -> list[tuple[str, int]]:
+    """A session's interactions: (name, value index) pairs drawn at random."""
+    rng = random.Random(seed)
+    return [(rng.choice(interactions), rng.randrange(1 << 16)) for _ in range(steps)]
+
+
+class Session(threading.Thread):
+    """One simulated analyst: open the app, wait for the start signal, replay the trace."""
+
+    def __init__(self, trace: list, ready: threading.Barrier, start: threading.Event,
+                 timeout: float, think: float, seed: int):
+        super().__init__(daemon=True)
+        self.trace = trace
+        self.ready = ready
+        self.go = start
+        self.timeout = timeout
+        self.think = think
+        self.rng = random.Random(seed)
+        self.initial = None
+        self.latencies = []  # (interaction, seconds)
+        self.error = None
+
+    def run(self):
+        from streamlit.testing.v1 import AppTest
+
+        try:
+            at = AppTest.from_file(APP, default_timeout=self.timeout)
+            self.initial = _run(at, self.timeout)
+        except BaseException as exc:
+            self.error = exc
+            self.ready.abort()
+            return
+        self.ready.wait()
+        self.go.wait()
+        try:
+            for name, step in self.trace:
+                self.latencies.append((name, _interact(at, name, step, self.timeout)))
+                if self.think:
+                    time.sleep(self.rng.expovariate(1 / self.think))
+        except BaseException as exc:
+            self.error = exc
+
+
+def run_level(n: int, steps: int, interactions: list[str], timeout: float, think: float, seed: int, log) -> dict:
+    """Run `n` concurrent sessions; per-interaction summaries plus an `all` row with throughput and memory."""
+    ready, start = threading.Barrier(n + 1), threading.Event()
+    sessions = [Session(make_trace(seed + i, steps, interactions), ready, start, timeout, think, seed + i)
+                for i in range(n)]
+    before = reports.current_rss()
+    for session in sessions:
+        session.start()
+    try:
+        ready.wait()
+    except threading.BrokenBarrierError:
+        pass
+    failed = next((s.error for s in sessions if s.error), None)
+    if failed:
+        start.set()
+        raise RuntimeError("A session failed to open the app") from failed
+    loaded = reports.current_rss()
+
+    began = time.perf_counter()
+    start.set()
+    for session in sessions:
+        session.join()
+    wall = time.perf_counter() - began
+    failed = next((s.error for s in sessions if s.error), None)
+    if failed:
+        raise RuntimeError("A session failed during replay") from failed
+
+    by_name = {}
+    for session in sessions:
+        for name, seconds in session.latencies:
+            by_name.setdefault(name, []).append(seconds)
+    results = {name: summarize(samples) for name, samples in sorted(by_name.items())}
+    results['initial_run'] = summarize([s.initial for s in sessions])
+    everything = [seconds for s in sessions for _, seconds in s.latencies]
+    results['all'] = summarize(everything)
+    results['all'].update({
+        'throughput': len(everything) / wall if wall > 0 else float('inf'),  # reruns per second
+        'wall_seconds': wall,
+        'rss_per_session_bytes': (loaded - before) / n if before is not None else None,
+        'rss_bytes': reports.current_rss(),
+    })
+    row = results['all']
+    per_session = row['rss_per_session_bytes']
+    log(f"{n:>4} sessions  {row['throughput']:6.2f} reruns/s  p50 {row['p50'] * 1000:8.1f} ms  "
+        f"p95 {row['p95'] * 1000:8.1f} ms  p99 {row['p99'] * 1000:8.1f} ms  "
+        + (f"{per_session / 2**20:6.1f} MiB/session" if per_session is not None else ""))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8],
+                        help="concurrency levels to measure, one after another")
+    parser.add_argument("--steps", type=int, default=15, help="interactions replayed per session")
+    parser.add_argument("--think", type=float, default=0.0, help="mean pause between interactions (seconds)")
+    parser.add_argument("--only", nargs="+", choices=list(INTERACTIONS), default=list(INTERACTIONS))
+    parser.add_argument("--data", help="CSV to load instead of the bundled dataset")
+    parser.add_argument("--cold", action="store_true", help="clear Streamlit's caches before each level")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=600, help="seconds allowed per rerun")
+    parser.add_argument("--out", default="load_report.json")
+    parser.add_argument("--baseline", help="earlier report to compare against")
+    parser.add_argument("--threshold", type=float, default=reports.DEFAULT_THRESHOLD)
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument("--any-streamlit", action="store_true",
+                        help=f"run on Streamlit releases other than {STREAMLIT_TESTED}.x")
+    args = parser.parse_args(argv)
+    check_streamlit(args.any_streamlit)
+
+    if args.data:
+        os.environ["CINEMETRICS_DATA"] = os.path.abspath(args.data)
+    import streamlit as st
+
+    report = {
+        'meta': reports.metadata(
+            dataset=os.path.basename(os.environ.get("CINEMETRICS_DATA", "tmdb_movies_data.csv")),
+            steps=args.steps, think=args.think, cold=args.cold, seed=args.seed,
+        ),
+        'results': {},
+    }
+    with shared_runtime():
+        if not args.cold:
+            # Load the shared dataset and indexes once, so per-session memory excludes them
+            from streamlit.testing.v1 import AppTest
+
+            before = reports.current_rss()
+            _run(AppTest.from_file(APP, default_timeout=args.timeout), args.timeout)
+            if before is not None:
+                report['meta']['shared_rss_bytes'] = reports.current_rss() - before
+                print(f"warm-up: shared data and caches {report['meta']['shared_rss_bytes'] / 2**20:.0f} MiB")
+        for n in args.sessions:
+            if args.cold:
+                st.cache_data.clear()
+                st.cache_resource.clear()
+            report['results'][f"{n} sessions"] = run_level(
+                n, args.steps, args.only, args.timeout, args.think, args.seed, print)
+    report['meta']['max_rss_bytes'] = reports.peak_rss()
+    reports.write(report, args.out)
+    if args.baseline:
+        reports.check_baseline(report, args.baseline, args.threshold, args.fail_on_regression)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Time each stage of the data pipeline on synthetic catalogues of growing size.
+
+Stages mirror what the app does per process (load, prepare, column store,
+indexes) and per rerun (filter mask, groupbys, figure construction). Results
+go to a JSON report; with `--baseline` each stage is compared against an
+earlier report and regressions beyond `--threshold` are flagged.
+
+    python -m benchmarks.pipeline --sizes 10000 100000 1000000 --out report.json
+    python -m benchmarks.pipeline --baseline report.json --fail-on-regression
+"""
+import argparse
+import os
+import shutil
+import statistics
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks import report as reports
+from benchmarks.synth import write_csv
+from colstore import open_store, read_partitions, write_store
+from dataset import LAZY_COLUMNS, PARTITION_BY, cache_path, freeze, prepare_data
+from indexes import RankIndex, TitleIndex, YearPrefixSums
+from query import Filters, make_backend
+from relations import PeopleTable
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+# The app's initial sidebar state: 2000 onwards, everything else at its default
+DEFAULT_FILTERS = Filters((2000, 2100), (), 0.0, (0, 300), False, False, False)
+
+
+def synthetic_csv(rows: int, seed: int) -> str:
+    """Path of a cached synthetic catalogue, generating it on first use."""
+    path = cache_path("bench", f"synthetic_{rows}_{seed}.csv")
+    if not os.path.exists(path):
+        write_csv(rows, path, seed)
+    return path
+
+
+def timed(fn, repeat: int, setup=None):
+    """Run `fn(setup())` `repeat` times; returns (timings dict, last result)."""
+    runs, result = [], None
+    for _ in range(repeat):
+        arg = setup() if setup else None
+        start = time.perf_counter()
+        result = fn(arg)
+        runs.append(time.perf_counter() - start)
+    return {'median': statistics.median(runs), 'min': min(runs), 'runs': runs}, result
+
+
+def build_figures(frame: pd.DataFrame, mask: np.ndarray, backend) -> int:
+    """The Dashboard's representative figures, serialized as Streamlit would; returns JSON size."""
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    selection = frame[mask]
+    sample = selection[(selection['budget'] > 0) & (selection['revenue'] > 0)].head(400)
+    scatter = px.scatter(sample, x='budget', y='revenue', color='primary_genre', size='popularity',
+                         custom_data=['id'], log_x=True, log_y=True)
+    yearly = backend.aggregate(DEFAULT_FILTERS, ['year'], {'revenue': ('revenue', 'sum'),
+                                                          'original_title': ('original_title', 'count')})
+    combo = go.Figure([go.Bar(x=yearly['year'], y=yearly['original_title']),
+                       go.Scatter(x=yearly['year'], y=yearly['revenue'], yaxis='y2')])
+    return len(scatter.to_json()) + len(combo.to_json())
+
+
+def run_size(rows: int, repeat: int, seed: int, log) -> dict:
+    csv = synthetic_csv(rows, seed)
+    results = {}
+
+    def stage(name, fn, setup=None, times=repeat):
+        results[name], out = timed(fn, times, setup)
+        log(f"  {name:<22} {results[name]['median'] * 1000:10.1f} ms")
+        return out
+
+    raw = stage("read_csv", lambda _: pd.read_csv(csv))
+    prepared = stage("prepare", prepare_data, setup=raw.copy)
+    store = cache_path("bench", f"store_{rows}_{seed}")
+
+    def fresh_store():
+        shutil.rmtree(store, ignore_errors=True)
+
+    stage("write_store", lambda _: write_store(prepared, store, PARTITION_BY), setup=fresh_store, times=1)
+    frame = stage("open_store", lambda _: open_store(store, exclude=LAZY_COLUMNS))
+    frame = stage("freeze", lambda _: freeze(frame))
+    partitions = read_partitions(store)
+
+    stage("title_index", lambda _: TitleIndex(frame['original_title'], frame['revenue']), times=1)
+    stage("rank_index", lambda _: RankIndex(frame, ['budget', 'revenue', 'profit', 'vote_average']), times=1)
+    stage("year_sums", lambda _: YearPrefixSums(frame, budget_limit=300_000_000), times=1)
+    text = open_store(store, columns=['cast'])
+    stage("people_table", lambda _: PeopleTable(text.assign(director=frame['director'])), times=1)
+
+    scan = make_backend(frame, "pandas")
+    pruned = make_backend(frame, "pandas", partitions)
+    mask = stage("filter_mask", lambda _: scan.mask(DEFAULT_FILTERS))
+    stage("filter_mask_pruned", lambda _: pruned.mask(DEFAULT_FILTERS))
+    stage("groupby_genre_decade", lambda _: pruned.aggregate(
+        DEFAULT_FILTERS, ['primary_genre', 'decade'],
+        {'revenue': ('revenue', 'sum'), 'original_title': ('original_title', 'count')}))
+    try:
+        duck = make_backend(frame, "duckdb", partitions)
+    except ImportError:
+        duck = None
+    if duck is not None:
+        stage("filter_mask_duckdb", lambda _: duck.mask(DEFAULT_FILTERS))
+        stage("groupby_genre_decade_duckdb", lambda _: duck.aggregate(
+            DEFAULT_FILTERS, ['primary_genre', 'decade'],
+            {'revenue': ('revenue', 'sum'), 'original_title': ('original_title', 'count')}))
+    stage("figures", lambda _: build_figures(frame, mask, pruned))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per cheap stage (median reported)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="benchmark_report.json")
+    parser.add_argument("--baseline", help="earlier report to compare against")
+    parser.add_argument("--threshold", type=float, default=reports.DEFAULT_THRESHOLD)
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args(argv)
+
+    report = {'meta': reports.metadata(repeat=args.repeat, seed=args.seed), 'results': {}}
+    for rows in args.sizes:
+        print(f"{rows:,} rows")
+        report['results'][str(rows)] = run_size(rows, args.repeat, args.seed, print)
+    reports.write(report, args.out)
+    if args.baseline:
+        reports.check_baseline(report, args.baseline, args.threshold, args.fail_on_regression)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""JSON benchmark reports and comparison against a baseline report.
+
+A report is `{'meta': {...}, 'results': {group: {stage: timing}}}` where each
+timing has at least a `median` in seconds; groups are dataset sizes or names.
+"""
+import json
+import os
+import platform
+import sys
+from datetime import datetime, timezone
+
+# A stage this much slower than the baseline counts as a regression
+DEFAULT_THRESHOLD = 1.25
+
+
+def metadata(**extra) -> dict:
+    """Where and how a report was produced."""
+    import numpy as np
+    import pandas as pd
+
+    return {
+        'created': datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        **extra,
+    }
+
+
+def current_rss() -> int | None:
+    """Resident set size of this process in bytes (None where unavailable)."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def peak_rss() -> int | None:
+    """Peak resident set size of this process in bytes (None where unavailable)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def write(report: dict, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {path}")
+
+
+def compare(report: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list[dict]:
+    """Per (group, stage) present in both reports: baseline and current median and their ratio."""
+    rows = []
+    for group, stages in report['results'].items():
+        for name, timing in stages.items():
+            before = baseline.get('results', {}).get(group, {}).get(name)
+            if before is None:
+                continue
+            ratio = timing['median'] / before['median'] if before['median'] > 0 else float('inf')
+            rows.append({'group': group, 'stage': name, 'baseline': before['median'],
+                         'current': timing['median'], 'ratio': ratio, 'regression': ratio > threshold})
+    return rows
+
+
+def check_baseline(report: dict, path: str, threshold: float, fail: bool) -> None:
+    """Print the comparison with the report at `path`; exit 1 on a regression if `fail`."""
+    with open(path, encoding="utf-8") as f:
+        rows = compare(report, json.load(f), threshold)
+    for row in rows:
+        flag = "  REGRESSION" if row['regression'] else ""
+        print(f"{row['group']:>12} {row['stage']:<28} {row['baseline'] * 1000:9.1f} -> "
+              f"{row['current'] * 1000:9.1f} ms  x{row['ratio']:.2f}{flag}")
+    if fail and any(row['regression'] for row in rows):
+        sys.exit(1)
@@ -0,0 +1,164 @@
+"""Time whole-script reruns of the dashboard, driven headlessly through AppTest.
+
+Each session opens the app, then replays rounds of interactions a visitor
+would make (year slider, "Profitable only", chart-builder axes, an Explorer
+search), timing the rerun each one triggers. Values cycle between rounds,
+so early rounds see cold caches and later ones mostly warm caches, as a
+real session would. One extra traced round records the peak memory each
+interaction allocates.
+
+Run from the repository root (the app reads the CSV relative to it); point
+it at a bigger synthetic catalogue with `--data`:
+
+    python -m benchmarks.synth 100000 -o movies_100k.csv
+    python -m benchmarks.reruns --data movies_100k.csv --rounds 10 --out reruns.json
+"""
+import argparse
+import contextlib
+import os
+import time
+import tracemalloc
+from unittest import mock
+
+import numpy as np
+
+from benchmarks import report as reports
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+# name -> (element kind, widget label, values cycled through round by round)
+INTERACTIONS = {
+    'year_slider': ('slider', "Year range", [(2005, 2012), (1990, 2015), (2010, 2015), (1960, 2015)]),
+    'profitable_only': ('checkbox', "✅ Profitable only", [True, False]),
+    'chart_x_axis': ('selectbox', "X-Axis", ['popularity', 'vote_count', 'runtime', 'year', 'budget']),
+    'chart_y_axis': ('selectbox', "Y-Axis", ['profit', 'vote_average', 'roi', 'popularity', 'revenue']),
+    'explorer_search': ('text_input', "🔍 Search", ['star', 'love', 'night', '']),
+}
+PERCENTILES = (50, 90, 95, 99)
+
+
+@contextlib.contextmanager
+def server_script_cache():
+    """Compile the script once and share it across reruns and sessions, as the server does.
+
+    AppTest recompiles on every run, which would both inflate rerun times and,
+    with sessions on several threads, run CPython's parser concurrently.
+    """
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+
+    shared = ScriptCache()
+    with mock.patch("streamlit.testing.v1.app_test.ScriptCache", return_value=shared), \
+            mock.patch("streamlit.testing.v1.local_script_runner.ScriptCache", return_value=shared):
+        yield
+
+
+def _widget(at, kind: str, label: str):
+    for element in getattr(at, kind):
+        if element.label == label:
+            return element
+    raise LookupError(f"No {kind} labelled {label!r} in the app")
+
+
+def _run(at, timeout: float) -> float:
+    """Rerun the script; returns its wall time in seconds."""
+    start = time.perf_counter()
+    at.run(timeout=timeout)
+    elapsed = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError("App raised during rerun: " + "; ".join(e.message for e in at.exception))
+    return elapsed
+
+
+def _interact(at, name: str, step: int, timeout: float) -> float:
+    kind, label, values = INTERACTIONS[name]
+    _widget(at, kind, label).set_value(values[step % len(values)])
+    return _run(at, timeout)
+
+
+def summarize(samples: list[float]) -> dict:
+    """Latency percentiles (seconds) of one interaction's reruns."""
+    runs = np.asarray(samples)
+    stats = {f"p{p}": float(np.percentile(runs, p)) for p in PERCENTILES}
+    return {'median': stats['p50'], **stats, 'mean': float(runs.mean()), 'max': float(runs.max()),
+            'count': len(runs), 'runs': [float(r) for r in runs]}
+
+
+def run_session(rounds: int, timeout: float, interactions: list[str], log) -> tuple[dict, dict]:
+    """One browser session: initial run, `rounds` of every interaction, one traced round.
+
+    Returns `(latencies, peaks)`: seconds per rerun, and bytes allocated at
+    peak during the traced rerun, both by interaction name.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP, default_timeout=timeout)
+    latencies = {'initial_run': [_run(at, timeout)]}
+    log(f"  initial run {latencies['initial_run'][0] * 1000:10.1f} ms")
+    for step in range(rounds):
+        for name in interactions:
+            latencies.setdefault(name, []).append(_interact(at, name, step, timeout))
+
+    peaks = {}
+    tracemalloc.start()
+    try:
+        for name in interactions:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            _interact(at, name, rounds, timeout)
+            peaks[name] = tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+    return latencies, peaks
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", help="CSV to load instead of the bundled dataset")
+    parser.add_argument("--sessions", type=int, default=1, help="fresh sessions to replay (caches persist)")
+    parser.add_argument("--rounds", type=int, default=8, help="rounds of interactions per session")
+    parser.add_argument("--only", nargs="+", choices=list(INTERACTIONS), default=list(INTERACTIONS))
+    parser.add_argument("--timeout", type=float, default=300, help="seconds allowed per rerun")
+    parser.add_argument("--out", default="rerun_report.json")
+    parser.add_argument("--baseline", help="earlier report to compare against")
+    parser.add_argument("--threshold", type=float, default=reports.DEFAULT_THRESHOLD)
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args(argv)
+
+    # Read by the app's modules on first import, which happens inside the first AppTest run
+    if args.data:
+        os.environ["CINEMETRICS_DATA"] = os.path.abspath(args.data)
+    dataset = os.path.basename(os.environ.get("CINEMETRICS_DATA", "tmdb_movies_data.csv"))
+
+    latencies, peaks = {}, {}
+    with server_script_cache():
+        for session in range(args.sessions):
+            print(f"session {session + 1}/{args.sessions}")
+            session_latencies, session_peaks = run_session(args.rounds, args.timeout, args.only, print)
+            for name, samples in session_latencies.items():
+                latencies.setdefault(name, []).extend(samples)
+            for name, peak in session_peaks.items():
+                peaks[name] = max(peaks.get(name, 0), peak)
+
+    results = {name: summarize(samples) for name, samples in latencies.items()}
+    for name, peak in peaks.items():
+        results[name]['peak_alloc_bytes'] = peak
+    print(f"{'interaction':<18} {'p50':>9} {'p90':>9} {'p95':>9} {'max':>9}   peak alloc")
+    for name, stats in results.items():
+        peak = stats.get('peak_alloc_bytes')
+        print(f"{name:<18} " + " ".join(f"{stats[k] * 1000:8.1f}ms" for k in ('p50', 'p90', 'p95', 'max'))
+              + (f"   {peak / 2**20:7.1f} MiB" if peak is not None else ""))
+    max_rss = reports.peak_rss()
+    if max_rss is not None:
+        print(f"process peak RSS {max_rss / 2**20:.0f} MiB")
+
+    report = {
+        'meta': reports.metadata(dataset=dataset, sessions=args.sessions, rounds=args.rounds, max_rss_bytes=max_rss),
+        'results': {dataset: results},
+    }
+    reports.write(report, args.out)
+    if args.baseline:
+        reports.check_baseline(report, args.baseline, args.threshold, args.fail_on_regression)
+
+
+if __name__ == "__main__":
+    main()
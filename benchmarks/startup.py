@@ -0,0 +1,141 @@
+"""Cold-start cost of the dashboard: module import times and time to first paint.
+
+Every sample runs in a fresh interpreter, so nothing is already imported or
+cached in memory (the on-disk cache of derived artifacts is kept, as it is
+on a restarted server). Two measurements:
+
+- imports: the time each module the app imports adds, in the app's order,
+  so a module shared with an earlier one is only charged once
+- first_run: one AppTest run of `app.py`, timing when the hero metrics and
+  the first chart are sent, the whole script, and the whole process
+
+    python -m benchmarks.startup --repeat 5 --out startup.json
+    python -m benchmarks.startup --baseline startup.json --fail-on-regression
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+# Stdlib only at import time: the probes below run inside this module and must start clean
+from benchmarks import report as reports
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "app.py")
+# What app.py imports before the hero metrics, then what it defers until after them
+EAGER_IMPORTS = ["streamlit", "pandas", "numpy", "export", "indexes", "relations", "colstore", "dataset",
+                 "memtrace", "profiling", "query", "similarity"]
+DEFERRED_IMPORTS = ["plotly.express", "plotly.graph_objects", "plotly.subplots", "scipy.spatial"]
+# Printed before the child's JSON result, so Streamlit's own output can't be mistaken for it
+RESULT_PREFIX = "STARTUP_RESULT "
+
+
+def _import_times(modules: list[str]) -> dict:
+    """Seconds each of `modules` adds when imported in order (run in the child)."""
+    import importlib
+
+    times = {}
+    for name in modules:
+        start = time.perf_counter()
+        importlib.import_module(name)
+        times[name] = time.perf_counter() - start
+    return times
+
+
+def _first_run(timeout: float) -> dict:
+    """Run the app once; seconds until the hero and the first chart are enqueued (run in the child)."""
+    start = time.perf_counter()
+    from streamlit.runtime.forward_msg_queue import ForwardMsgQueue
+    from streamlit.testing.v1 import AppTest
+
+    imported = time.perf_counter()
+    marks = {}
+    enqueue = ForwardMsgQueue.enqueue
+
+    def timed_enqueue(queue, msg):
+        if msg.WhichOneof("type") == "delta":
+            element = msg.delta.new_element
+            kind = element.WhichOneof("type")
+            if kind == "markdown" and "hero-metrics" in element.markdown.body:
+                marks.setdefault('hero', time.perf_counter())
+            elif kind == "plotly_chart":
+                marks.setdefault('first_chart', time.perf_counter())
+        return enqueue(queue, msg)
+
+    ForwardMsgQueue.enqueue = timed_enqueue
+    at = AppTest.from_file(APP, default_timeout=timeout)
+    began = time.perf_counter()
+    at.run(timeout=timeout)
+    finished = time.perf_counter()
+    if at.exception:
+        raise RuntimeError("App raised during first run: " + "; ".join(e.message for e in at.exception))
+    return {
+        'streamlit_import': imported - start,
+        'hero': marks['hero'] - began,
+        'first_chart': marks['first_chart'] - began if 'first_chart' in marks else None,
+        'script': finished - began,
+    }
+
+
+def _child(call: str) -> tuple[dict, float]:
+    """Run `call` (an expression using this module) in a fresh interpreter; its result and wall time."""
+    code = (f"import json\nfrom benchmarks import startup\n"
+            f"print({RESULT_PREFIX!r} + json.dumps(startup.{call}))")
+    start = time.perf_counter()
+    done = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=os.environ.copy(),
+                          capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    if done.returncode != 0:
+        raise RuntimeError(f"Startup probe failed:\n{done.stderr[-4000:]}")
+    line = next(line for line in reversed(done.stdout.splitlines()) if line.startswith(RESULT_PREFIX))
+    return json.loads(line[len(RESULT_PREFIX):]), wall
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", help="CSV to load instead of the bundled dataset")
+    parser.add_argument("--repeat", type=int, default=5, help="fresh processes per measurement")
+    parser.add_argument("--timeout", type=float, default=300, help="seconds allowed for the first run")
+    parser.add_argument("--out", default="startup_report.json")
+    parser.add_argument("--baseline", help="earlier report to compare against")
+    parser.add_argument("--threshold", type=float, default=reports.DEFAULT_THRESHOLD)
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args(argv)
+    from benchmarks.reruns import summarize
+
+    if args.data:
+        os.environ["CINEMETRICS_DATA"] = os.path.abspath(args.data)
+    dataset = os.path.basename(os.environ.get("CINEMETRICS_DATA", "tmdb_movies_data.csv"))
+
+    imports, runs = {}, {}
+    for i in range(args.repeat):
+        times, _ = _child(f"_import_times({EAGER_IMPORTS + DEFERRED_IMPORTS!r})")
+        for name, seconds in times.items():
+            imports.setdefault(name, []).append(seconds)
+        imports.setdefault('before_hero', []).append(sum(times[name] for name in EAGER_IMPORTS))
+        imports.setdefault('deferred', []).append(sum(times[name] for name in DEFERRED_IMPORTS))
+        marks, wall = _child(f"_first_run({args.timeout!r})")
+        marks['process'] = wall
+        for name, seconds in marks.items():
+            if seconds is not None:
+                runs.setdefault(name, []).append(seconds)
+        print(f"run {i + 1}/{args.repeat}: hero {marks['hero'] * 1000:.0f} ms, "
+              f"script {marks['script'] * 1000:.0f} ms, process {wall * 1000:.0f} ms")
+
+    results = {'imports': {name: summarize(samples) for name, samples in imports.items()},
+               'first_run': {name: summarize(samples) for name, samples in runs.items()}}
+    for group, stages in results.items():
+        print(group)
+        for name, stats in sorted(stages.items(), key=lambda item: -item[1]['median']):
+            print(f"  {name:<22} {stats['median'] * 1000:9.1f} ms")
+
+    report = {'meta': reports.metadata(dataset=dataset, repeat=args.repeat), 'results': results}
+    reports.write(report, args.out)
+    if args.baseline:
+        reports.check_baseline(report, args.baseline, args.threshold, args.fail_on_regression)
+
+
+if __name__ == "__main__":
+    main()
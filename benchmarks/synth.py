@@ -0,0 +1,201 @@
+"""Synthetic TMDB-shaped movie catalogues for scaling benchmarks.
+
+Column set and formats follow `tmdb_movies_data.csv`. Distributions are
+tuned to the figures in `analysis_output.txt`: missing-value rates, the
+share of zero budgets/revenues, average budget and revenue, the genre mix,
+and the popularity/revenue correlation. Rows are generated in chunks, so a
+10M-row file never needs the whole catalogue in memory.
+
+    python -m benchmarks.synth 1000000 -o movies_1m.csv
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = ['id', 'imdb_id', 'popularity', 'budget', 'revenue', 'original_title', 'cast', 'homepage', 'director',
+           'tagline', 'keywords', 'overview', 'runtime', 'genres', 'production_companies', 'release_date',
+           'vote_count', 'vote_average', 'release_year', 'budget_adj', 'revenue_adj']
+
+# Share of rows with each field missing (analysis_output.txt)
+MISSING_RATES = {
+    'homepage': 0.7298, 'tagline': 0.2599, 'keywords': 0.1374, 'production_companies': 0.0948,
+    'cast': 0.0070, 'director': 0.0040, 'genres': 0.0021, 'imdb_id': 0.0009, 'overview': 0.0004,
+}
+ZERO_BUDGET_RATE = 5696 / 10866
+ZERO_REVENUE_RATE = 6016 / 10866
+# Chance a zero-budget film also reports zero revenue; the rest of the zeros fall on budgeted films
+ZERO_REVENUE_GIVEN_ZERO_BUDGET = 0.85
+
+# Individual genre frequencies (split counts in the source data)
+GENRE_WEIGHTS = {
+    'Drama': 4761, 'Comedy': 3793, 'Thriller': 2908, 'Action': 2385, 'Romance': 1712, 'Horror': 1637,
+    'Adventure': 1471, 'Crime': 1355, 'Family': 1231, 'Science Fiction': 1230, 'Fantasy': 916,
+    'Mystery': 810, 'Animation': 699, 'Documentary': 520, 'Music': 408, 'History': 334, 'War': 270,
+    'Foreign': 188, 'TV Movie': 167, 'Western': 165,
+}
+# Genres per film: 1, 2, 3, 4, 5
+GENRE_COUNT_WEIGHTS = [0.22, 0.33, 0.28, 0.12, 0.05]
+
+FIRST_YEAR, LAST_YEAR = 1960, 2015
+# Films per year grow roughly 5% a year
+YEAR_GROWTH = 0.05
+CHUNK_ROWS = 200_000
+
+
+def _zipf_weights(n: int, exponent: float = 1.1) -> np.ndarray:
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    return weights / weights.sum()
+
+
+def _vocabulary(size: int, rng: np.random.Generator) -> np.ndarray:
+    """Pronounceable lowercase pseudo-words, so tokenizers treat them like real text."""
+    consonants = np.array(list("bcdfghjklmnprstvwz"))
+    vowels = np.array(list("aeiou"))
+    words = set()
+    while len(words) < size:
+        syllables = rng.integers(2, 4)
+        words.add("".join(rng.choice(consonants) + rng.choice(vowels) for _ in range(syllables)))
+    words = np.array(sorted(words), dtype=object)
+    # Random rank order, so word frequency doesn't follow the alphabet
+    return words[rng.permutation(len(words))]
+
+
+def _join(tokens: np.ndarray, lengths: np.ndarray, sep: str) -> list[str]:
+    return [sep.join(row[:k]) for row, k in zip(tokens, lengths)]
+
+
+def _with_missing(values, rate: float, rng: np.random.Generator) -> np.ndarray:
+    values = np.asarray(values, dtype=object)
+    values[rng.random(len(values)) < rate] = None
+    return values
+
+
+class Catalogue:
+    """Shared pools (people, companies, words) so chunks of one catalogue are consistent."""
+
+    def __init__(self, rows: int, seed: int = 0):
+        self.rows = rows
+        self.seed = seed
+        rng = np.random.default_rng(seed)
+        self.words = _vocabulary(3000, rng)
+        self.word_p = _zipf_weights(len(self.words))
+        self.people = np.array([f"{first.title()} {last.title()}" for first, last in
+                                zip(rng.choice(self.words, max(2000, rows // 3)),
+                                    rng.choice(self.words, max(2000, rows // 3)))], dtype=object)
+        self.people_p = _zipf_weights(len(self.people), 0.9)
+        self.companies = np.array([f"{w.title()} Pictures" for w in rng.choice(self.words, max(500, rows // 20))],
+                                  dtype=object)
+        self.companies_p = _zipf_weights(len(self.companies))
+        self.genres = np.array(list(GENRE_WEIGHTS), dtype=object)
+        self.genre_logp = np.log(np.array(list(GENRE_WEIGHTS.values()), dtype=np.float64))
+        years = np.arange(FIRST_YEAR, LAST_YEAR + 1)
+        self.years = years
+        self.year_p = np.exp(YEAR_GROWTH * (years - FIRST_YEAR))
+        self.year_p /= self.year_p.sum()
+
+    def _words(self, rng, n: int, low: int, high: int, sep: str = " ") -> list[str]:
+        lengths = rng.integers(low, high + 1, n)
+        tokens = rng.choice(self.words, size=(n, high), p=self.word_p)
+        return _join(tokens, lengths, sep)
+
+    def _names(self, rng, pool, p, n: int, low: int, high: int) -> list[str]:
+        lengths = rng.integers(low, high + 1, n)
+        return _join(rng.choice(pool, size=(n, high), p=p), lengths, "|")
+
+    def chunk(self, start: int, stop: int) -> pd.DataFrame:
+        """Rows `start`..`stop` of the catalogue (deterministic for a given seed)."""
+        rng = np.random.default_rng([self.seed, start])
+        n = stop - start
+
+        # A shared "hype" factor drives popularity, votes and revenue together
+        hype = rng.standard_normal(n)
+        popularity = np.exp(-1.15 + 1.2 * hype + 0.2 * rng.standard_normal(n))
+        vote_count = np.maximum(10, np.exp(3.6 + 1.2 * hype + 0.6 * rng.standard_normal(n))).astype(np.int64)
+        vote_average = np.clip(rng.normal(5.97, 0.93, n), 1.5, 9.2).round(1)
+
+        zero_budget = rng.random(n) < ZERO_BUDGET_RATE
+        budget = np.exp(rng.normal(16.35, 1.3, n) + 0.3 * hype)
+        budget = np.where(zero_budget, 0, np.round(budget, -3)).astype(np.int64)
+        zero_revenue_rate_budgeted = (ZERO_REVENUE_RATE - ZERO_BUDGET_RATE * ZERO_REVENUE_GIVEN_ZERO_BUDGET) / (1 - ZERO_BUDGET_RATE)
+        zero_revenue = rng.random(n) < np.where(zero_budget, ZERO_REVENUE_GIVEN_ZERO_BUDGET, zero_revenue_rate_budgeted)
+        revenue = np.exp(17.45 + 1.2 * hype + 0.3 * rng.standard_normal(n))
+        revenue = np.where(zero_revenue, 0, revenue).astype(np.int64)
+
+        runtime = np.clip(rng.normal(102, 25, n) + 8 * hype, 0, 300).astype(np.int64)
+        runtime[rng.random(n) < 0.003] = 0
+
+        year = rng.choice(self.years, n, p=self.year_p)
+        day = rng.integers(0, 365, n)
+        dates = pd.to_datetime(year.astype(str), format="%Y") + pd.to_timedelta(day, unit="D")
+        release_date = [f"{m}/{d}/{y % 100:02d}" for m, d, y in zip(dates.month, dates.day, year)]
+        inflation = 1.03 ** (LAST_YEAR - year)
+
+        # Gumbel top-k: k distinct genres per film, drawn by frequency
+        k = rng.choice(len(GENRE_COUNT_WEIGHTS), n, p=GENRE_COUNT_WEIGHTS) + 1
+        keys = self.genre_logp + rng.gumbel(size=(n, len(self.genres)))
+        genres = _join(self.genres[np.argsort(-keys, axis=1)], k, "|")
+
+        titles = [t.title() for t in self._words(rng, n, 1, 4)]
+        ids = np.arange(start, stop, dtype=np.int64) + 1
+        return pd.DataFrame({
+            'id': ids,
+            'imdb_id': _with_missing([f"tt{i:07d}" for i in ids], MISSING_RATES['imdb_id'], rng),
+            'popularity': popularity,
+            'budget': budget,
+            'revenue': revenue,
+            'original_title': titles,
+            'cast': _with_missing(self._names(rng, self.people, self.people_p, n, 3, 5), MISSING_RATES['cast'], rng),
+            'homepage': _with_missing([f"http://www.{t.lower().replace(' ', '')}.com" for t in titles],
+                                      MISSING_RATES['homepage'], rng),
+            'director': _with_missing(rng.choice(self.people, n, p=self.people_p), MISSING_RATES['director'], rng),
+            'tagline': _with_missing([s.capitalize() + "." for s in self._words(rng, n, 4, 9)],
+                                     MISSING_RATES['tagline'], rng),
+            'keywords': _with_missing(self._words(rng, n, 1, 6, "|"), MISSING_RATES['keywords'], rng),
+            'overview': _with_missing([s.capitalize() + "." for s in self._words(rng, n, 15, 45)],
+                                      MISSING_RATES['overview'], rng),
+            'runtime': runtime,
+            'genres': _with_missing(genres, MISSING_RATES['genres'], rng),
+            'production_companies': _with_missing(self._names(rng, self.companies, self.companies_p, n, 1, 3),
+                                                  MISSING_RATES['production_companies'], rng),
+            'release_date': release_date,
+            'vote_count': vote_count,
+            'vote_average': vote_average,
+            'release_year': year,
+            'budget_adj': budget * inflation,
+            'revenue_adj': revenue * inflation,
+        }, columns=COLUMNS)
+
+
+def generate(rows: int, seed: int = 0) -> pd.DataFrame:
+    """A whole synthetic catalogue in memory (fine up to a few million rows)."""
+    catalogue = Catalogue(rows, seed)
+    chunks = [catalogue.chunk(start, min(rows, start + CHUNK_ROWS)) for start in range(0, rows, CHUNK_ROWS)]
+    return pd.concat(chunks, ignore_index=True) if chunks else catalogue.chunk(0, 0)
+
+
+def write_csv(rows: int, path: str, seed: int = 0) -> str:
+    """Write a synthetic catalogue to `path` chunk by chunk (write-then-rename); returns `path`."""
+    catalogue = Catalogue(rows, seed)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8", newline="") as f:
+        catalogue.chunk(0, 0).to_csv(f, index=False)
+        for start in range(0, rows, CHUNK_ROWS):
+            catalogue.chunk(start, min(rows, start + CHUNK_ROWS)).to_csv(f, index=False, header=False)
+    os.replace(tmp, path)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("rows", type=int)
+    parser.add_argument("-o", "--output", default=None, help="CSV path (default: synthetic_<rows>.csv)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    path = write_csv(args.rows, args.output or f"synthetic_{args.rows}.csv", args.seed)
+    print(f"Wrote {args.rows:,} rows to {path}")
+
+
+if __name__ == "__main__":
+    main()
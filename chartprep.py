@@ -0,0 +1,58 @@
+"""Concurrent data preparation for the charts of one rerun.
+
+Most charts depend only on the filter state, not on each other, so their
+data (groupbys, pivots, correlations) can be computed side by side. A rerun
+submits them up front; each chart then waits for its own result when the
+page reaches it, so charts still render in page order. Much of the NumPy and
+pandas work behind them releases the GIL, and DuckDB runs queries outside it.
+
+The pool is shared by every session in the process and bounded by
+`CINEMETRICS_CHART_THREADS` (default: one thread per CPU beyond the one the
+script runs on, at most 8). `0`, the default on a single CPU, turns it off:
+each computation then runs in place when its chart asks for it.
+Submitted functions run outside the script thread, so they must not call
+Streamlit, its caches included: the app submits its aggregates through the
+disk result cache alone and looks them up in `st.cache_data` on the script
+thread when it collects them. For the same reason the rerun profiler
+(cProfile follows only the script thread) and per-stage memory accounting
+(which charges allocations to whatever stage is open when they happen) can't
+attribute pool work; the app computes in place while either is on.
+"""
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+CHART_THREADS = int(os.environ.get("CINEMETRICS_CHART_THREADS", min(8, (os.cpu_count() or 1) - 1)))
+
+_pools = {}  # threads -> shared ThreadPoolExecutor of that size
+_pool_lock = threading.Lock()
+
+
+def _executor(threads: int) -> ThreadPoolExecutor:
+    with _pool_lock:
+        if threads not in _pools:
+            _pools[threads] = ThreadPoolExecutor(threads, thread_name_prefix="chartprep")
+        return _pools[threads]
+
+
+class ChartPrep:
+    """Named chart computations for one rerun, started up front and collected in page order."""
+
+    def __init__(self, threads: int = CHART_THREADS):
+        self.threads = threads
+        self._tasks = {}
+
+    def submit(self, name: str, func, *args, **kwargs) -> None:
+        """Start computing `func(*args, **kwargs)` for the chart `name` (deferred with 0 threads)."""
+        if self.threads > 0:
+            self._tasks[name] = _executor(self.threads).submit(func, *args, **kwargs)
+        else:
+            self._tasks[name] = (func, args, kwargs)
+
+    def result(self, name: str):
+        """The data for chart `name`, waiting for it if needed; exceptions surface here."""
+        task = self._tasks[name]
+        if isinstance(task, Future):
+            return task.result()
+        func, args, kwargs = task
+        return func(*args, **kwargs)
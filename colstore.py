@@ -0,0 +1,215 @@
+"""On-disk column store that every server process memory-maps read-only.
+
+Each column is one flat little-endian file (plus a null mask for nullable
+integers); string columns are Arrow-style offsets + UTF-8 data + a validity
+bitmap. Mapped pages live in the OS page cache, so any number of workers on
+one machine share a single copy and a new worker only reads the manifest.
+"""
+import functools
+import hashlib
+import json
+import os
+import shutil
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from dataset import cache_path
+
+# Bump when the file layout changes
+STORE_FORMAT = 2
+MANIFEST = "manifest.json"
+# Rows whose lazily read values are kept decoded
+ROW_CACHE_SIZE = 4096
+
+
+def source_key(source: str, version: int = 0, partition_by=()) -> str:
+    """Store name for a source file: changes with its path, size, mtime, `version` or partitioning."""
+    stat = os.stat(source)
+    digest = hashlib.sha1(f"{os.path.abspath(source)}|{stat.st_size}|{stat.st_mtime_ns}".encode())
+    digest.update(f"|{STORE_FORMAT}|{version}|{','.join(partition_by)}".encode())
+    return digest.hexdigest()[:16]
+
+
+class Partition(NamedTuple):
+    """Rows `start:stop` share one value of each partition column; with min/max of the numeric columns."""
+    keys: dict
+    start: int
+    stop: int
+    stats: dict  # column -> (min, max); None where every value is missing
+
+
+def _json_value(value):
+    if pd.isna(value):
+        return None
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _partition(frame: pd.DataFrame, partition_by: list[str]):
+    """(keys, positions, stats) per distinct combination of `partition_by`, missing keys included."""
+    numeric = [c for c in frame.columns
+               if pd.api.types.is_numeric_dtype(frame[c]) and not pd.api.types.is_bool_dtype(frame[c])]
+    values = {c: frame[c].to_numpy(dtype=np.float64, na_value=np.nan) for c in numeric}
+    groups = frame.groupby(partition_by, dropna=False, sort=True).indices
+    for key, positions in groups.items():
+        key = key if isinstance(key, tuple) else (key,)
+        stats = {}
+        for c in numeric:
+            part = values[c][positions]
+            part = part[~np.isnan(part)]
+            stats[c] = [float(part.min()), float(part.max())] if len(part) else None
+        yield dict(zip(partition_by, map(_json_value, key))), positions.astype(np.int64), stats
+
+
+def _map(path: str, dtype, count: int) -> np.ndarray:
+    # mmap refuses empty files
+    if count == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=(count,))
+
+
+def _write_column(series: pd.Series, base: str) -> dict:
+    values = series.array
+    if isinstance(values, pd.arrays.IntegerArray | pd.arrays.FloatingArray | pd.arrays.BooleanArray):
+        np.asarray(values._data).tofile(base + ".bin")
+        np.asarray(values._mask).tofile(base + ".mask")
+        return {'kind': 'masked', 'dtype': str(series.dtype), 'values': values._data.dtype.str}
+    if isinstance(series.dtype, np.dtype) and series.dtype.kind in "biufmM":
+        series.to_numpy().tofile(base + ".bin")
+        return {'kind': 'numpy', 'dtype': series.dtype.str}
+
+    # Everything else is stored as text
+    import pyarrow as pa
+
+    text = pa.array(series.astype("str"), type=pa.large_string(), from_pandas=True)
+    _, offsets, data = text.buffers()
+    n = len(text)
+    offsets = np.frombuffer(offsets, dtype=np.int64)[:n + 1]
+    np.asarray(offsets).tofile(base + ".offsets")
+    with open(base + ".data", "wb") as f:
+        f.write(memoryview(data)[:offsets[-1]] if data is not None else b"")
+    np.packbits(series.notna().to_numpy(), bitorder="little").tofile(base + ".valid")
+    return {'kind': 'string', 'nulls': int(text.null_count), 'bytes': int(offsets[-1])}
+
+
+def write_store(frame: pd.DataFrame, directory: str, partition_by=()) -> None:
+    """Write `frame` as a column store at `directory`; concurrent writers are safe.
+
+    With `partition_by`, rows are clustered so each distinct key combination
+    is one contiguous run, stored with min/max statistics so readers can skip
+    whole partitions and slice the rest. Runs are ordered by key (the first
+    key varying slowest, missing keys last); rows keep their frame order
+    within a run.
+    """
+    tmp = f"{directory}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    partitions = []
+    if partition_by and len(frame):
+        groups = list(_partition(frame, list(partition_by)))
+        frame = frame.take(np.concatenate([positions for _, positions, _ in groups])).reset_index(drop=True)
+        start = 0
+        for keys, positions, stats in groups:
+            partitions.append({'keys': keys, 'start': start, 'rows': len(positions), 'stats': stats})
+            start += len(positions)
+    columns = []
+    for i, name in enumerate(frame.columns):
+        entry = _write_column(frame[name], os.path.join(tmp, str(i)))
+        columns.append(dict(entry, name=name))
+    with open(os.path.join(tmp, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump({'format': STORE_FORMAT, 'rows': len(frame), 'columns': columns, 'partitions': partitions}, f)
+    try:
+        os.replace(tmp, directory)
+    except OSError:
+        # Another process finished the same store first
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def _read_column(entry: dict, base: str, rows: int):
+    if entry['kind'] == 'numpy':
+        return _map(base + ".bin", np.dtype(entry['dtype']), rows)
+    if entry['kind'] == 'masked':
+        data = _map(base + ".bin", np.dtype(entry['values']), rows)
+        mask = _map(base + ".mask", np.bool_, rows)
+        return pd.api.types.pandas_dtype(entry['dtype']).construct_array_type()(data, mask, copy=False)
+
+    import pyarrow as pa
+
+    offsets = _map(base + ".offsets", np.int64, rows + 1)
+    data = _map(base + ".data", np.uint8, entry['bytes'])
+    valid = _map(base + ".valid", np.uint8, (rows + 7) // 8)
+    text = pa.LargeStringArray.from_buffers(
+        rows, pa.py_buffer(offsets), pa.py_buffer(data), pa.py_buffer(valid), null_count=entry['nulls'],
+    )
+    return pd.array(text, dtype=pd.StringDtype("pyarrow", na_value=np.nan))
+
+
+def open_store(directory: str, columns: list[str] | None = None, exclude=()) -> pd.DataFrame:
+    """Frame over the memory-mapped columns of a store (all, or just `columns`, minus `exclude`)."""
+    with open(os.path.join(directory, MANIFEST), encoding="utf-8") as f:
+        manifest = json.load(f)
+    rows = manifest['rows']
+    data = {
+        entry['name']: _read_column(entry, os.path.join(directory, str(i)), rows)
+        for i, entry in enumerate(manifest['columns'])
+        if (columns is None or entry['name'] in columns) and entry['name'] not in exclude
+    }
+    return pd.DataFrame(data, index=pd.RangeIndex(rows), copy=False)
+
+
+def read_partitions(directory: str) -> list[Partition]:
+    """Partitions recorded in a store (empty if it was written without `partition_by`)."""
+    with open(os.path.join(directory, MANIFEST), encoding="utf-8") as f:
+        manifest = json.load(f)
+    return [
+        Partition(p['keys'], p['start'], p['start'] + p['rows'],
+                  {c: tuple(v) if v is not None else None for c, v in p['stats'].items()})
+        for p in manifest.get('partitions', [])
+    ]
+
+
+def ensure_store(source: str, prepare=None, version: int = 0, partition_by=()) -> str:
+    """Directory of the column store for the CSV at `source`, building it on first use.
+
+    `prepare` turns the raw CSV into the stored frame (derived columns etc.);
+    bump `version` whenever it changes so existing stores are rebuilt.
+    """
+    directory = cache_path("columns", source_key(source, version, partition_by))
+    if not os.path.exists(os.path.join(directory, MANIFEST)):
+        frame = pd.read_csv(source)
+        write_store(prepare(frame) if prepare else frame, directory, partition_by)
+    return directory
+
+
+class LazyColumns:
+    """Columns left in the store and read per row on demand.
+
+    Nothing is decoded up front; single-row reads go through an LRU so
+    re-opening a recently viewed movie doesn't touch the files again.
+    """
+
+    def __init__(self, directory: str, columns: list[str], cache_rows: int = ROW_CACHE_SIZE):
+        self._frame = open_store(directory, columns)
+        self.columns = list(self._frame.columns)
+        self.row = functools.lru_cache(maxsize=cache_rows)(self._read_row)
+
+    def _read_row(self, position: int) -> dict:
+        """Values of every lazy column at row `position`; missing values are None."""
+        return {name: (None if pd.isna(value) else value) for name, value in self._frame.iloc[position].items()}
+
+    def take(self, column: str, positions) -> np.ndarray:
+        """One column at many rows (uncached bulk read), as an object array with None for missing."""
+        return self._frame[column].take(np.asarray(positions)).to_numpy(dtype=object, na_value=None)
+
+    def frame(self, columns: list[str] | None = None) -> pd.DataFrame:
+        """The memory-mapped columns themselves, for one-off full scans such as index builds."""
+        return self._frame if columns is None else self._frame[columns]
+
+    def attach(self, frame: pd.DataFrame, columns: list[str]) -> pd.DataFrame:
+        """`frame` (indexed by row position) with the requested lazy columns gathered alongside."""
+        wanted = [c for c in columns if c in self.columns and c not in frame.columns]
+        if not wanted:
+            return frame
+        extra = self._frame[wanted].take(frame.index.to_numpy())
+        return pd.concat([frame, extra.set_axis(frame.index)], axis=1)
@@ -0,0 +1,170 @@
+"""Where the movie data and its derived on-disk artifacts live."""
+import hashlib
+import json
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+DATA_PATH = os.environ.get("CINEMETRICS_DATA", "tmdb_movies_data.csv")
+# Derived artifacts (indexes, matrices) persisted between restarts
+CACHE_DIR = os.environ.get("CINEMETRICS_CACHE_DIR", ".cinemetrics_cache")
+
+# Content hashes of data files, by path, size and mtime (see file_fingerprint)
+FINGERPRINTS_FILE = "fingerprints.json"
+
+# Bump when prepare_data changes so on-disk column stores are rebuilt
+DATA_VERSION = 1
+# Long free-text columns: left in the column store and read per row
+LAZY_COLUMNS = ['overview', 'tagline', 'keywords', 'homepage', 'cast', 'production_companies']
+# Store partitions; the year slider and genre picker skip whole partitions via their min/max stats
+PARTITION_BY = ['decade', 'primary_genre']
+
+
+def cache_path(*parts: str) -> str:
+    """Path inside the cache directory, creating parent folders as needed."""
+    path = os.path.join(CACHE_DIR, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+def fingerprint(frame: pd.DataFrame, columns: list[str] | None = None) -> str:
+    """Short content hash of `frame[columns]`; changes whenever the data does."""
+    data = frame if columns is None else frame[columns]
+    hashed = pd.util.hash_pandas_object(data, index=False).to_numpy()
+    digest = hashlib.sha1(hashed.tobytes())
+    digest.update(",".join(map(str, data.columns)).encode())
+    return digest.hexdigest()[:16]
+
+
+def file_fingerprint(path: str) -> str:
+    """Short content hash of the file at `path`.
+
+    Remembered per path, size and mtime in the cache directory, so each
+    version of the file is read through only once.
+    """
+    stat = os.stat(path)
+    prefix = f"{os.path.abspath(path)}|"
+    stamp = f"{prefix}{stat.st_size}|{stat.st_mtime_ns}"
+    known_file = cache_path(FINGERPRINTS_FILE)
+    try:
+        with open(known_file, encoding="utf-8") as f:
+            known = json.load(f)
+    except (OSError, ValueError):
+        known = {}
+    if stamp not in known:
+        digest = hashlib.sha1()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        # Earlier versions of this file won't be seen again
+        known = {k: v for k, v in known.items() if not k.startswith(prefix)}
+        known[stamp] = digest.hexdigest()[:16]
+        tmp_file = f"{known_file}.{os.getpid()}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(known, f, indent=1)
+        os.replace(tmp_file, known_file)
+    return known[stamp]
+
+
+def prepare_data(df: pd.DataFrame) -> pd.DataFrame:
+    """Derived columns, computed once when the column store is built."""
+    df['profit'] = df['revenue'] - df['budget']
+    df['roi'] = np.where(df['budget'] > 0, (df['profit'] / df['budget']) * 100, 0)
+    df['release_date'] = pd.to_datetime(df['release_date'], errors='coerce')
+    df['year'] = df['release_date'].dt.year
+    df['month'] = df['release_date'].dt.month
+    df['decade'] = (df['year'] // 10 * 10).astype('Int64')
+    df['is_profitable'] = df['profit'] > 0
+    df['primary_genre'] = df['genres'].apply(lambda x: x.split('|')[0] if pd.notna(x) else 'Unknown')
+    return df
+
+# Column layout of each frozen frame, keyed by id(); the shared frame lives for the whole process
+_FROZEN_SCHEMAS: dict[int, tuple] = {}
+
+
+def _schema(frame: pd.DataFrame) -> tuple:
+    return len(frame), tuple(frame.columns), tuple(map(str, frame.dtypes))
+
+
+class _ReadOnlyStrings(pd.arrays.ArrowStringArray):
+    """Arrow-backed strings that reject cell writes.
+
+    Arrow buffers are immutable, but pandas "writes" to them by swapping in a
+    new Arrow array; this refuses that. Results derived from it (filters,
+    copies, string methods) are ordinary writable arrays.
+    """
+
+    def __setitem__(self, key, value):
+        raise ValueError("assignment destination is read-only")
+
+    def _from_pyarrow_array(self, pa_array):
+        return pd.arrays.ArrowStringArray(pa_array, dtype=self.dtype)
+
+
+def _readonly_array(values):
+    """Copy of a column's values over buffers that reject in-place writes."""
+    if isinstance(values, pd.arrays.IntegerArray | pd.arrays.FloatingArray | pd.arrays.BooleanArray):
+        data, mask = _readonly_copy(values._data), _readonly_copy(values._mask)
+        return type(values)(data, mask, copy=False)
+    if isinstance(values, pd.arrays.ArrowStringArray):
+        # Shares the (memory-mapped) Arrow buffers; only the wrapper is new
+        return _ReadOnlyStrings(values._pa_array, dtype=values.dtype)
+    if isinstance(values, pd.api.extensions.ExtensionArray) and not isinstance(values, pd.arrays.NumpyExtensionArray):
+        # Datetimes are read-only through their memory-mapped buffers; other extension arrays aren't used
+        return values
+    return _readonly_copy(np.asarray(values))
+
+
+def _readonly_copy(array: np.ndarray) -> np.ndarray:
+    # Already read-only buffers (e.g. memory-mapped files) are shared, not copied
+    if not array.flags.writeable:
+        return array
+    array = array.copy()
+    array.flags.writeable = False
+    return array
+
+
+def _accepts_writes(values) -> bool:
+    """Whether cell writes would reach a frozen column's buffers."""
+    if isinstance(values, _ReadOnlyStrings):
+        return False
+    if isinstance(values, pd.arrays.IntegerArray | pd.arrays.FloatingArray | pd.arrays.BooleanArray):
+        return values._data.flags.writeable or values._mask.flags.writeable
+    if isinstance(values, pd.arrays.DatetimeArray | pd.arrays.TimedeltaArray | pd.arrays.NumpyExtensionArray):
+        return values._ndarray.flags.writeable
+    return True
+
+
+def freeze(frame: pd.DataFrame) -> pd.DataFrame:
+    """Rebuild `frame` over read-only column buffers, for sharing one copy between sessions.
+
+    Cell writes on any column, numeric or string, raise instead of silently
+    changing the data every other session sees; `is_intact` catches added,
+    dropped or retyped columns.
+    """
+    frozen = pd.DataFrame({name: _readonly_array(frame[name].array) for name in frame.columns},
+                          index=frame.index, copy=False)
+    writable = [name for name in frozen.columns if _accepts_writes(frozen[name].array)]
+    if writable:
+        logging.getLogger(__name__).warning("Shared dataset columns still accept writes: %s", ", ".join(writable))
+    _FROZEN_SCHEMAS[id(frozen)] = _schema(frozen)
+    return frozen
+
+
+def is_intact(frame: pd.DataFrame) -> bool:
+    """True while a frozen frame still has the columns and dtypes it was frozen with."""
+    intact = _FROZEN_SCHEMAS.get(id(frame)) == _schema(frame)
+    if not intact:
+        logging.getLogger(__name__).warning("Shared dataset was modified in place; reloading it")
+    return intact
+
+
+def readonly(obj):
+    """Mark the NumPy arrays held by an index object (directly or in dicts) read-only; returns `obj`."""
+    for value in vars(obj).values():
+        for array in (value.values() if isinstance(value, dict) else [value]):
+            if isinstance(array, np.ndarray):
+                array.flags.writeable = False
+    return obj
@@ -0,0 +1,65 @@
+"""On-demand export of Explorer results, written in bounded-size chunks."""
+import io
+import tempfile
+
+import pandas as pd
+
+# Rows serialized per chunk; keeps the working set small for large selections
+EXPORT_CHUNK_ROWS = 50_000
+# Exports below this size stay in memory, larger ones spill to a temp file
+SPOOL_MAX_BYTES = 32 * 1024 * 1024
+
+# label -> (file extension, MIME type)
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+
+def iter_chunks(df: pd.DataFrame, columns: list[str], chunk_rows: int = EXPORT_CHUNK_ROWS):
+    """Yield consecutive row slices of `df` restricted to `columns`."""
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows][columns]
+
+
+def write_csv(df: pd.DataFrame, columns: list[str], fh) -> None:
+    """Stream `df[columns]` as UTF-8 CSV into the binary file `fh`."""
+    text = io.TextIOWrapper(fh, encoding="utf-8", newline="", write_through=True)
+    try:
+        if len(df) == 0:
+            df.iloc[0:0][columns].to_csv(text, index=False)
+        for i, chunk in enumerate(iter_chunks(df, columns)):
+            chunk.to_csv(text, index=False, header=(i == 0))
+        text.flush()
+    finally:
+        # Hand the underlying file back without closing it
+        text.detach()
+
+
+def write_parquet(df: pd.DataFrame, columns: list[str], fh) -> None:
+    """Stream `df[columns]` into `fh` as Parquet, one row group per chunk."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    # Infer the schema once from the full selection so all-null chunks don't
+    # produce a mismatching type.
+    schema = pa.Schema.from_pandas(df[columns], preserve_index=False)
+    with pq.ParquetWriter(fh, schema) as writer:
+        if len(df) == 0:
+            writer.write_table(schema.empty_table())
+        for chunk in iter_chunks(df, columns):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def export_frame(df: pd.DataFrame, columns: list[str], fmt: str) -> bytes:
+    """Serialize `df[columns]` in `fmt` ("CSV" or "Parquet") and return the file contents."""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    columns = [c for c in columns if c in df.columns] or list(df.columns)
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES, mode="w+b") as fh:
+        if fmt == "CSV":
+            write_csv(df, columns, fh)
+        else:
+            write_parquet(df, columns, fh)
+        fh.seek(0)
+        return fh.read()
@@ -0,0 +1,226 @@
+"""Lookup structures built once over the loaded movie table."""
+import re
+
+import numpy as np
+import pandas as pd
+
+# Word boundaries used for infix matching ("king" finds "The Lion King")
+_WORD_START = re.compile(r"(?:^|(?<=[\s\-:/(\"'.,&]))\S")
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.casefold().split())
+
+
+class TitleIndex:
+    """Sorted index of title suffixes that start at a word boundary.
+
+    Every title contributes one entry per word, so a single binary search
+    answers both prefix queries ("star w") and word-infix queries ("wars").
+    Positions refer to rows of the frame the index was built from.
+    """
+
+    def __init__(self, titles: pd.Series, score: pd.Series):
+        titles = titles.fillna("").astype(str).map(_normalize)
+        keys, rows, heads = [], [], []
+        for pos, title in enumerate(titles):
+            for m in _WORD_START.finditer(title):
+                keys.append(title[m.start():])
+                rows.append(pos)
+                heads.append(m.start() == 0)
+        keys = np.array(keys, dtype=object)
+        order = np.argsort(keys, kind="stable")
+        self._keys = keys[order]
+        self._rows = np.asarray(rows, dtype=np.int64)[order]
+        # True where the entry is the whole title rather than a later word
+        self._heads = np.asarray(heads, dtype=bool)[order]
+        self._size = len(titles)
+        # Higher score ranks first among matches (e.g. revenue)
+        self._score = score.fillna(0).to_numpy(dtype=np.float64)
+        self._by_score = np.argsort(-self._score, kind="stable")
+
+    def __len__(self) -> int:
+        return self._size
+
+    def search(self, query: str, limit: int = 20, mask: np.ndarray | None = None) -> np.ndarray:
+        """Row positions of the best `limit` matches for `query`, restricted to `mask` if given.
+
+        Titles that start with the query rank ahead of word-infix matches;
+        ties are broken by score. An empty query returns the top rows by score.
+        """
+        q = _normalize(query or "")
+        if not q:
+            rows = self._by_score if mask is None else self._by_score[mask[self._by_score]]
+            return rows[:limit]
+
+        lo = np.searchsorted(self._keys, q, side="left")
+        hi = np.searchsorted(self._keys, q + "\U0010ffff", side="left")
+        hits = self._rows[lo:hi]
+        rows = np.unique(hits)
+        if mask is not None:
+            rows = rows[mask[rows]]
+        if len(rows) == 0:
+            return rows
+
+        starts = np.isin(rows, hits[self._heads[lo:hi]])
+        order = np.lexsort((-self._score[rows], ~starts))
+        return rows[order[:limit]]
+
+
+class IdIndex:
+    """Hash index from TMDB `id` (and `imdb_id`) to row position.
+
+    Duplicate ids keep their first occurrence, so lookups stay unambiguous.
+    """
+
+    def __init__(self, ids: pd.Series, imdb_ids: pd.Series | None = None):
+        self._ids = self._build(ids)
+        self._imdb = self._build(imdb_ids) if imdb_ids is not None else None
+
+    @staticmethod
+    def _build(keys: pd.Series) -> pd.Series:
+        positions = pd.Series(np.arange(len(keys), dtype=np.int64), index=keys.to_numpy())
+        positions = positions[positions.index.notna() & ~positions.index.duplicated(keep="first")]
+        # Touch the hash table once so the first user lookup doesn't pay for it
+        positions.index.get_indexer(positions.index[:1])
+        return positions
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, movie_id) -> bool:
+        return movie_id in self._ids.index
+
+    def position(self, movie_id) -> int | None:
+        """Row position of a TMDB id, or None if unknown."""
+        pos = self._ids.get(movie_id)
+        return None if pos is None else int(pos)
+
+    def positions(self, movie_ids) -> np.ndarray:
+        """Vectorized lookup; unknown ids map to -1."""
+        indexer = self._ids.index.get_indexer(pd.Index(movie_ids))
+        return np.where(indexer >= 0, self._ids.to_numpy()[indexer], -1)
+
+    def position_by_imdb(self, imdb_id: str) -> int | None:
+        """Row position of an IMDb id (e.g. "tt0499549"), or None if unknown."""
+        if self._imdb is None:
+            return None
+        pos = self._imdb.get(imdb_id)
+        return None if pos is None else int(pos)
+
+
+class RankIndex:
+    """Per-metric sort orders, precomputed so percentile ranks never re-sort.
+
+    For a row subset (boolean mask) one cumulative count along each sort order
+    turns "how many selected rows are <= this value" into an array lookup, so
+    the cost per filter state is independent of how many films are ranked.
+    """
+
+    def __init__(self, frame: pd.DataFrame, metrics: list[str]):
+        self.metrics = list(metrics)
+        self._order, self._upper, self._valid = {}, {}, {}
+        for metric in self.metrics:
+            values = frame[metric].to_numpy(dtype=np.float64, na_value=np.nan)
+            order = np.argsort(values, kind="stable")  # NaN sorts last
+            sorted_values = values[order]
+            valid = int(np.count_nonzero(~np.isnan(values)))
+            # Last sorted position holding a value <= each row's value (ties share it)
+            upper = np.searchsorted(sorted_values[:valid], values, side="right") - 1
+            upper[np.isnan(values)] = -1
+            self._order[metric] = order
+            self._upper[metric] = upper
+            self._valid[metric] = valid
+
+    def percentiles(self, positions: np.ndarray, mask: np.ndarray | None = None) -> np.ndarray:
+        """Percentile (0-100) of each row in `positions` among the rows selected by `mask`.
+
+        Returns an array of shape (len(positions), len(metrics)); NaN where a
+        value is missing or the selection is empty.
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        out = np.full((len(positions), len(self.metrics)), np.nan)
+        for j, metric in enumerate(self.metrics):
+            order, upper, valid = self._order[metric], self._upper[metric], self._valid[metric]
+            if mask is None:
+                below = upper[positions] + 1
+                total = valid
+            else:
+                cum = np.cumsum(mask[order[:valid]], dtype=np.int64)
+                total = int(cum[-1]) if valid else 0
+                below = np.where(upper[positions] >= 0, cum[np.maximum(upper[positions], 0)], 0)
+            if total:
+                out[:, j] = np.where(upper[positions] >= 0, below / total * 100, np.nan)
+        return out
+
+
+class YearPrefixSums:
+    """Cumulative per-year, per-genre totals so a year range reduces to two lookups.
+
+    Only rows that every default filter keeps are counted (a rating, and a
+    budget inside `budget_limit`), so the totals match the filtered frame
+    whenever the remaining sidebar filters are at their defaults.
+    """
+
+    # count, revenue, profit, rating sum, profitable count
+    FIELDS = ('movies', 'revenue', 'profit', 'rating_sum', 'profitable')
+
+    def __init__(self, frame: pd.DataFrame, genre_column: str = 'primary_genre', budget_limit: float = np.inf):
+        budget = frame['budget'].to_numpy(dtype=np.float64, na_value=np.nan)
+        rating = frame['vote_average'].to_numpy(dtype=np.float64, na_value=np.nan)
+        year = frame['year'].to_numpy(dtype=np.float64, na_value=np.nan)
+        keep = (budget >= 0) & (budget <= budget_limit) & (rating >= 0) & ~np.isnan(year)
+
+        years = year[keep].astype(np.int64)
+        self.first_year = int(years.min()) if len(years) else 0
+        n_years = int(years.max()) - self.first_year + 1 if len(years) else 0
+        codes, genres = pd.factorize(frame[genre_column].to_numpy()[keep], sort=True)
+        self.genres = list(genres)
+        self._genre_pos = {g: i for i, g in enumerate(self.genres)}
+
+        revenue = np.nan_to_num(frame['revenue'].to_numpy(dtype=np.float64, na_value=np.nan)[keep])
+        profit = np.nan_to_num(frame['profit'].to_numpy(dtype=np.float64, na_value=np.nan)[keep])
+        values = np.column_stack([np.ones(len(years)), revenue, profit, rating[keep],
+                                  frame['is_profitable'].to_numpy(dtype=np.float64)[keep]])
+        # Per (genre, year) sums, then a running total along years with a leading zero row
+        cells = np.zeros((len(self.genres), n_years, len(self.FIELDS)))
+        np.add.at(cells, (codes, years - self.first_year), values)
+        self._cum = np.zeros((len(self.genres), n_years + 1, len(self.FIELDS)))
+        np.cumsum(cells, axis=1, out=self._cum[:, 1:])
+        self._all = self._cum.sum(axis=0)
+
+    def totals(self, first: int, last: int, genres: list[str] | None = None) -> dict:
+        """Headline totals for years `first`..`last` inclusive, optionally for some primary genres."""
+        n_years = self._all.shape[0] - 1
+        lo = int(np.clip(first - self.first_year, 0, n_years))
+        hi = int(np.clip(last - self.first_year + 1, 0, n_years))
+        if genres:
+            rows = [self._genre_pos[g] for g in genres if g in self._genre_pos]
+            cum = self._cum[rows].sum(axis=0) if rows else np.zeros_like(self._all)
+        else:
+            cum = self._all
+        out = dict(zip(self.FIELDS, cum[max(hi, lo)] - cum[lo]))
+        out['movies'] = int(round(out['movies']))
+        return out
+
+
+def multi_hot(values: pd.Series, sep: str = "|"):
+    """Sparse multi-hot matrix (rows x labels) for a delimited column such as `genres`.
+
+    Returns `(matrix, labels)` with `matrix` a CSR matrix of 0/1 float32 and
+    `labels` sorted alphabetically. Missing values give an empty row.
+    """
+    from scipy import sparse
+
+    # Positional index, so exploded labels point at row positions
+    exploded = values.reset_index(drop=True).fillna("").astype(str).str.split(sep).explode().str.strip()
+    exploded = exploded[exploded != ""]
+    codes, labels = pd.factorize(exploded, sort=True)
+    matrix = sparse.csr_matrix(
+        (np.ones(len(codes), dtype=np.float32), (exploded.index.to_numpy(), codes)),
+        shape=(len(values), len(labels)),
+    )
+    # A label repeated within one row still counts once
+    matrix.sum_duplicates()
+    matrix.data[:] = 1.0
+    return matrix, list(labels)
@@ -0,0 +1,147 @@
+"""Background jobs for analytics too slow to run inside a rerun.
+
+A process-wide `JobScheduler` runs named jobs on a local process pool (no
+broker; nothing leaves the machine). A job is identified by its name plus a
+hashable key, normally the filter state, so:
+
+- identical requests made while a job runs, from any session, share it
+- finished jobs are kept in an LRU of `CINEMETRICS_JOB_CACHE` entries, and
+  asking again returns the stored result (or error) without recomputing
+- `peek` never waits: it returns the result once ready and None meanwhile,
+  so a page can show "Computing…" and swap the result in later
+
+Jobs and their arguments are pickled to the workers, so job functions must
+live in an importable module (not app.py) and arguments should be arrays
+rather than the whole frame.
+"""
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+import types
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+JOB_WORKERS = int(os.environ.get("CINEMETRICS_JOB_WORKERS", max(1, min(4, (os.cpu_count() or 1) - 1))))
+JOB_CACHE_SIZE = int(os.environ.get("CINEMETRICS_JOB_CACHE", 64))
+# How often (seconds) a page waiting on a job checks it again
+JOB_POLL_SECONDS = 1.0
+
+logger = logging.getLogger(__name__)
+
+
+# Serializes the `__main__` swap in `_start_pool` between schedulers
+_main_lock = threading.Lock()
+
+
+def _start_pool(workers: int) -> ProcessPoolExecutor:
+    """A process pool with all `workers` started up front, spawned with the script hidden.
+
+    Spawned workers re-run the parent's `__main__` file, and while Streamlit
+    runs a script `__main__` is app.py, so `sys.modules["__main__"]` is swapped
+    for a module with no file while they start. The swap is process-wide and
+    other sessions' scripts keep running meanwhile, so it happens once per pool
+    under a lock rather than on every submit: one no-op per worker starts them
+    all (none is idle yet to take it), and a pool never starts more later.
+    """
+    # Spawned rather than forked, since forking a server mid-rerun copies
+    # other threads' locks in whatever state they are in
+    with _main_lock:
+        main = sys.modules.get("__main__")
+        sys.modules["__main__"] = types.ModuleType("__main__")
+        try:
+            pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+            for _ in range(workers):
+                pool.submit(int)
+        finally:
+            sys.modules["__main__"] = main
+    return pool
+
+
+class JobScheduler:
+    """Named, deduplicated jobs on a process pool, with an LRU of finished ones."""
+
+    def __init__(self, workers: int = JOB_WORKERS, cache_size: int = JOB_CACHE_SIZE):
+        self.workers = workers
+        self.cache_size = cache_size
+        self.stats = {'submitted': 0, 'deduplicated': 0, 'hits': 0, 'failed': 0, 'evicted': 0}
+        self._pool = None
+        self._lock = threading.Lock()
+        self._running = {}             # (name, key) -> Future
+        self._finished = OrderedDict()  # (name, key) -> done Future, least recently used first
+
+    def _submit(self, func, args, kwargs) -> Future:
+        # The pool starts with the first job, and again after a worker dies
+        if self._pool is None:
+            self._pool = _start_pool(self.workers)
+        return self._pool.submit(func, *args, **kwargs)
+
+    def submit(self, name: str, key, func, *args, **kwargs) -> Future:
+        """Start job `(name, key)` as `func(*args, **kwargs)` unless it is running or finished; its future."""
+        job = (name, key)
+        with self._lock:
+            if job in self._finished:
+                self._finished.move_to_end(job)
+                self.stats['hits'] += 1
+                return self._finished[job]
+            if job in self._running:
+                self.stats['deduplicated'] += 1
+                return self._running[job]
+            try:
+                future = self._submit(func, args, kwargs)
+            except BrokenProcessPool:
+                # A worker died (killed, out of memory); everything queued on that pool is lost
+                logger.warning("Job pool broke; starting a new one")
+                self._pool = None
+                future = self._submit(func, args, kwargs)
+            self._running[job] = future
+            self.stats['submitted'] += 1
+        future.add_done_callback(lambda done: self._done(job, done))
+        return future
+
+    def _done(self, job, future: Future) -> None:
+        with self._lock:
+            self._running.pop(job, None)
+            if future.cancelled():
+                return
+            error = future.exception()
+            if isinstance(error, BrokenProcessPool):
+                # Lost with its worker rather than failed: leave it to be asked for again
+                logger.warning("Job %s was lost with its worker", job[0])
+                return
+            if error is not None:
+                self.stats['failed'] += 1
+                logger.warning("Job %s failed: %s", job[0], error)
+            self._finished[job] = future
+            while len(self._finished) > self.cache_size:
+                self._finished.popitem(last=False)
+                self.stats['evicted'] += 1
+
+    def peek(self, name: str, key, func, *args, **kwargs):
+        """The job's result if it has finished (re-raising its error), else None; starts it if needed."""
+        future = self.submit(name, key, func, *args, **kwargs)
+        return future.result() if future.done() else None
+
+    def status(self, name: str, key) -> str:
+        """'finished', 'running' or 'unknown' (never submitted, evicted, or lost with a worker).
+
+        Doesn't count as a request; an unknown job has to be submitted again.
+        """
+        job = (name, key)
+        with self._lock:
+            if job in self._finished:
+                return 'finished'
+            return 'running' if job in self._running else 'unknown'
+
+    def running(self) -> int:
+        with self._lock:
+            return len(self._running)
+
+    def shutdown(self) -> None:
+        """Stop the workers, cancelling queued jobs."""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
@@ -0,0 +1,209 @@
+"""Opt-in per-stage memory accounting for reruns, built on tracemalloc.
+
+With `CINEMETRICS_MEMTRACE=1`, every rerun records for each stage (loading
+the data, filtering, each tab, the figures inside it) the memory allocated
+at peak and the memory still held when the stage ends. It also records the
+size of `st.cache_data` entries and of `st.session_state`. The summary is
+logged, appended to `memtrace.jsonl` in the cache directory and shown in the
+sidebar. Stages whose allocations keep rising with the number of active
+sessions are flagged.
+
+tracemalloc has a single peak counter per process, so when several sessions
+rerun at once a stage's peak can include the others' allocations. Unset,
+`memory_stage` returns a shared no-op context and tracemalloc never starts.
+"""
+import contextlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from dataset import cache_path
+
+MEMTRACE = os.environ.get("CINEMETRICS_MEMTRACE", "").strip().lower() not in ("", "0", "off", "false")
+# Stack frames kept per allocation; stage totals need only one
+TRACE_FRAMES = 1
+# A session counts as active this long (seconds) after its last rerun
+SESSION_WINDOW = 300
+# Growth per extra active session (bytes) beyond which a stage is flagged
+GROWTH_LIMIT = 1 << 20
+# Distinct session counts needed before growth is judged
+GROWTH_MIN_POINTS = 3
+HISTORY_SIZE = 500
+LOG_FILE = "memtrace.jsonl"
+
+logger = logging.getLogger(__name__)
+
+_NOOP = contextlib.nullcontext()
+_local = threading.local()
+_lock = threading.Lock()
+_last_seen = {}        # session id -> time of its last traced rerun
+_state_bytes = {}      # session id -> size of its session state
+_history = {}          # stage -> deque of (active sessions, bytes)
+
+if MEMTRACE:
+    tracemalloc.start(TRACE_FRAMES)
+
+
+def nbytes(obj, depth: int = 4, _seen=None) -> int:
+    """Approximate memory held by `obj`: array buffers, frames (deep) and nested containers."""
+    _seen = set() if _seen is None else _seen
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+    if isinstance(obj, np.ndarray):
+        # Memory-mapped and borrowed buffers belong to someone else
+        return obj.nbytes if obj.base is None else sys.getsizeof(obj)
+    if isinstance(obj, pd.DataFrame | pd.Series | pd.Index):
+        usage = obj.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+    if all(hasattr(obj, a) for a in ('data', 'indices', 'indptr')):
+        return sum(nbytes(getattr(obj, a), depth, _seen) for a in ('data', 'indices', 'indptr'))
+    size = sys.getsizeof(obj)
+    if depth <= 0:
+        return size
+    if isinstance(obj, dict):
+        size += sum(nbytes(k, depth - 1, _seen) + nbytes(v, depth - 1, _seen) for k, v in obj.items())
+    elif isinstance(obj, list | tuple | set | frozenset | deque):
+        size += sum(nbytes(v, depth - 1, _seen) for v in obj)
+    return size
+
+
+class RerunMemory:
+    """Per-stage allocations of one rerun on the current thread."""
+
+    def __init__(self, session: str):
+        self.session = session
+        self.started = time.time()
+        self.start = tracemalloc.get_traced_memory()[0]
+        self.stages = {}
+        self.stack = []  # (name, absolute peak seen while it was innermost)
+
+
+def start_memtrace() -> RerunMemory | None:
+    """Begin accounting this rerun (None when memory tracing is off)."""
+    if not MEMTRACE:
+        return None
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    rerun = _local.rerun = RerunMemory(ctx.session_id if ctx else "")
+    return rerun
+
+
+@contextlib.contextmanager
+def _track(name: str):
+    rerun = getattr(_local, "rerun", None)
+    if rerun is None:
+        yield
+        return
+    current, peak = tracemalloc.get_traced_memory()
+    stack = rerun.stack
+    # The peak so far belongs to the enclosing stage; remember it before resetting
+    if stack:
+        stack[-1][1] = max(stack[-1][1], peak)
+    full = f"{stack[-1][0]}/{name}" if stack else name
+    tracemalloc.reset_peak()
+    stack.append([full, 0])
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _, inner_peak = stack.pop()
+        after, peak = tracemalloc.get_traced_memory()
+        peak = max(peak, inner_peak)
+        if stack:
+            stack[-1][1] = max(stack[-1][1], peak)
+        entry = rerun.stages.setdefault(full, {'peak': 0, 'retained': 0, 'seconds': 0.0, 'calls': 0})
+        entry['peak'] = max(entry['peak'], peak - current)
+        entry['retained'] += after - current
+        entry['seconds'] += time.perf_counter() - started
+        entry['calls'] += 1
+
+
+def memory_stage(name: str):
+    """Context manager charging the allocations of the code it wraps to stage `name`.
+
+    Stages nest: a stage opened inside another is reported as `outer/name`,
+    and repeated entries of the same stage in one rerun are combined.
+    """
+    return _track(name) if MEMTRACE else _NOOP
+
+
+def cache_data_sizes() -> dict[str, int]:
+    """Bytes held per `st.cache_data` function (pickled size, as Streamlit stores them)."""
+    from streamlit.runtime.caching import cache_data_api
+
+    sizes = {}
+    for stats in cache_data_api.get_data_cache_stats_provider().get_stats().values():
+        for stat in stats:
+            sizes[stat.cache_name] = sizes.get(stat.cache_name, 0) + stat.byte_length
+    return dict(sorted(sizes.items(), key=lambda item: -item[1]))
+
+
+def _slope(points) -> float | None:
+    counts = np.array([n for n, _ in points], dtype=np.float64)
+    if len(np.unique(counts)) < GROWTH_MIN_POINTS:
+        return None
+    values = np.array([v for _, v in points], dtype=np.float64)
+    return float(np.polyfit(counts, values, 1)[0])
+
+
+def finish_memtrace(rerun: RerunMemory | None, session_state) -> dict | None:
+    """Close the rerun's accounting: log and store its summary, and return it."""
+    if rerun is None:
+        return None
+    _local.rerun = None
+    current, _ = tracemalloc.get_traced_memory()
+    state = {str(k): nbytes(v) for k, v in session_state.items()}
+    now = time.time()
+    with _lock:
+        _last_seen[rerun.session] = now
+        _state_bytes[rerun.session] = sum(state.values())
+        active = [s for s, seen in _last_seen.items() if now - seen <= SESSION_WINDOW]
+        samples = {name: entry['peak'] for name, entry in rerun.stages.items()}
+        samples['process'] = current
+        samples['session_state'] = sum(_state_bytes.get(s, 0) for s in active)
+        growth = {}
+        for name, value in samples.items():
+            history = _history.setdefault(name, deque(maxlen=HISTORY_SIZE))
+            history.append((len(active), value))
+            slope = _slope(history)
+            if slope is not None and slope > GROWTH_LIMIT:
+                growth[name] = slope
+
+    summary = {
+        'session': rerun.session,
+        'started': rerun.started,
+        'active_sessions': len(active),
+        'traced_bytes': current,
+        'retained_bytes': current - rerun.start,
+        'stages': rerun.stages,
+        'session_state_bytes': state,
+        'cache_data_bytes': cache_data_sizes(),
+        'growing_with_sessions': growth,
+    }
+    for name, slope in growth.items():
+        logger.warning("Memory of stage %r grows by %.1f MiB per active session", name, slope / 2**20)
+    logger.info("Rerun memory: %s", ", ".join(
+        f"{name} peak {entry['peak'] / 2**20:.1f} MiB" for name, entry in rerun.stages.items()))
+    with _lock, open(cache_path(LOG_FILE), "a", encoding="utf-8") as f:
+        f.write(json.dumps(summary) + "\n")
+    return summary
+
+
+def summary_table(summary: dict) -> pd.DataFrame:
+    """One row per stage: peak and retained MiB, time and whether it grows with sessions."""
+    rows = [
+        {'stage': name, 'peak_mib': entry['peak'] / 2**20, 'retained_mib': entry['retained'] / 2**20,
+         'seconds': entry['seconds'], 'grows': name in summary['growing_with_sessions']}
+        for name, entry in summary['stages'].items()
+    ]
+    return pd.DataFrame(rows, columns=['stage', 'peak_mib', 'retained_mib', 'seconds', 'grows'])
@@ -0,0 +1,172 @@
+"""Opt-in profiling of whole script reruns.
+
+`CINEMETRICS_PROFILE=1` profiles every rerun; `CINEMETRICS_PROFILE=toggle`
+adds a sidebar switch so only the reruns you pick are profiled. Unset, no
+profiler is ever created. Each profiled rerun writes three files to
+`CINEMETRICS_PROFILE_DIR` (default: the cache's `profiles/` folder):
+
+- `<name>.prof`: cProfile stats for snakeviz or `python -m pstats`
+- `<name>.folded`: collapsed stacks for flamegraph.pl or speedscope
+- `<name>.json`: session, rerun number, active tab, filters and duration
+
+A rerun that never reaches `finish_profile` (interrupted by a widget change,
+`st.stop`, `st.rerun`) is stopped and written out, marked `interrupted`, when
+the next profiled rerun starts.
+"""
+import cProfile
+import json
+import logging
+import os
+import pstats
+import re
+import threading
+import time
+from datetime import datetime
+
+from dataset import cache_path
+
+_MODE = os.environ.get("CINEMETRICS_PROFILE", "").strip().lower()
+PROFILING = _MODE not in ("", "0", "off", "false")
+PROFILE_TOGGLE = _MODE == "toggle"
+PROFILE_TOGGLE_KEY = "profile_reruns"
+PROFILE_DIR = os.environ.get("CINEMETRICS_PROFILE_DIR")
+
+# Calls worth less than this (seconds) on a path are folded into their caller in the flame graph
+FOLDED_MIN_TIME = 1e-3
+
+logger = logging.getLogger(__name__)
+
+# Profiles started but not yet finished, by id(); left behind by reruns that ended early
+_active: dict[int, "RerunProfile"] = {}
+_active_lock = threading.Lock()
+
+
+class RerunProfile:
+    """cProfile running over one rerun of the script."""
+
+    def __init__(self, session: str, number: int):
+        self.session = session
+        self.number = number
+        self.profiler = cProfile.Profile()
+        self.thread = threading.current_thread()
+        self.started = datetime.now()
+        self._start = time.perf_counter()
+
+    def stop(self) -> float:
+        """Stop profiling; returns the rerun's wall time in seconds."""
+        self.profiler.disable()
+        return time.perf_counter() - self._start
+
+
+def _flush_interrupted() -> None:
+    """Stop and write out profiles whose rerun ended without reaching finish_profile.
+
+    Streamlit runs a session's reruns one after another on the same thread, so
+    a profile from this thread, or from a thread that has exited, is stale.
+    """
+    current = threading.current_thread()
+    with _active_lock:
+        stale = [p for p in _active.values() if p.thread is current or not p.thread.is_alive()]
+    for profile in stale:
+        finish_profile(profile, {'interrupted': True})
+
+
+def start_profile(session_state) -> RerunProfile | None:
+    """Profile this rerun if profiling is on (and, in toggle mode, switched on in the sidebar)."""
+    if not PROFILING:
+        return None
+    # Before anything else: a leaked profiler would keep running and, from Python 3.12, block every later one
+    _flush_interrupted()
+    if PROFILE_TOGGLE and not session_state.get(PROFILE_TOGGLE_KEY, False):
+        return None
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    number = session_state["profiled_reruns"] = session_state.get("profiled_reruns", 0) + 1
+    profile = RerunProfile(ctx.session_id if ctx else "", number)
+    try:
+        profile.profiler.enable()
+    except ValueError:
+        # From Python 3.12 only one profiler can run at a time, so concurrent reruns take turns
+        logger.info("Another rerun is being profiled; skipping this one")
+        return None
+    with _active_lock:
+        _active[id(profile)] = profile
+    return profile
+
+
+def _label(func: tuple) -> str:
+    filename, line, name = func
+    label = name if filename == "~" else f"{name} ({os.path.basename(filename)}:{line})"
+    return label.replace(";", ",")
+
+
+def folded_stacks(stats: pstats.Stats, min_time: float = FOLDED_MIN_TIME) -> dict[str, int]:
+    """Collapsed stacks (microseconds of own time) rebuilt from cProfile's call graph.
+
+    cProfile records time per caller -> callee edge rather than whole stacks,
+    so a function's time is split between its call paths in proportion to
+    each edge's cumulative time. Good for a flame graph, not exact.
+    """
+    entries = stats.stats
+    callees = {}
+    for func, (*_, callers) in entries.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+    stacks = {}
+
+    def walk(func, budget, path, labels):
+        _, _, own, total, _ = entries[func]
+        if total <= 0 or budget <= 0:
+            return
+        labels = labels + (_label(func),)
+        scale = min(1.0, budget / total)
+        own *= scale
+        for callee, edge_total in callees.get(func, ()):
+            if callee in path:
+                continue
+            if edge_total * scale < min_time:
+                # Too small to draw: counted as the caller's own time
+                own += edge_total * scale
+            else:
+                walk(callee, edge_total * scale, path | {callee}, labels)
+        key = ";".join(labels)
+        stacks[key] = stacks.get(key, 0.0) + own
+
+    # Profiling starts inside the script, so its top-level calls have no recorded caller
+    for func, entry in entries.items():
+        if not entry[4]:
+            walk(func, entry[3], {func}, ("rerun",))
+    return {key: round(seconds * 1e6) for key, seconds in stacks.items() if seconds >= 5e-7}
+
+
+def _slug(text) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "-", str(text)).strip("-").lower() or "none"
+
+
+def finish_profile(profile: RerunProfile | None, tags: dict) -> str | None:
+    """Stop `profile` and write its files, tagged with `tags`; returns their common path stem."""
+    if profile is None:
+        return None
+    with _active_lock:
+        if _active.pop(id(profile), None) is None:
+            return None  # already written out as interrupted
+    seconds = profile.stop()
+    label = "interrupted" if tags.get('interrupted') else tags.get('tab')
+    name = "-".join([profile.started.strftime("%Y%m%d-%H%M%S"), _slug(profile.session)[:8],
+                     f"{profile.number:04d}", _slug(label)])
+    if PROFILE_DIR:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        stem = os.path.join(PROFILE_DIR, name)
+    else:
+        stem = cache_path("profiles", name)
+    stats = pstats.Stats(profile.profiler)
+    stats.dump_stats(stem + ".prof")
+    with open(stem + ".folded", "w", encoding="utf-8") as f:
+        for stack, micros in sorted(folded_stacks(stats).items()):
+            f.write(f"{stack} {micros}\n")
+    with open(stem + ".json", "w", encoding="utf-8") as f:
+        json.dump({'session': profile.session, 'rerun': profile.number, 'started': profile.started.isoformat(),
+                   'seconds': seconds, **tags}, f, indent=2, default=str)
+    logger.info("Rerun profile (%.2fs) written to %s.prof", seconds, stem)
+    return stem
@@ -0,0 +1,260 @@
+"""Filtering and grouped aggregation behind one interface, with pandas and DuckDB engines."""
+import os
+import threading
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+# "pandas" (default) or "duckdb"
+QUERY_BACKEND = os.environ.get("CINEMETRICS_QUERY_BACKEND", "pandas")
+
+# Quick-filter thresholds
+BLOCKBUSTER_REVENUE = 500_000_000
+GEM_MAX_BUDGET = 20_000_000
+GEM_MIN_RATING = 7.0
+
+# Aggregations both engines support
+AGG_FUNCS = ('sum', 'mean', 'count', 'min', 'max')
+
+
+class Filters(NamedTuple):
+    """Sidebar state; hashable, so it also keys per-filter caches."""
+    year_range: tuple
+    genres: tuple
+    min_rating: float
+    budget_range: tuple  # $M
+    only_profitable: bool
+    only_blockbusters: bool
+    hidden_gems: bool
+
+
+class PartitionRanges:
+    """Partition keys and min/max stats as arrays, so pruning a filter state is a few vectorized comparisons.
+
+    Partitions are contiguous runs of rows (see colstore.write_store), so
+    whatever survives pruning is a handful of slices.
+    """
+
+    def __init__(self, partitions: list, rows: int):
+        self.partitioned = bool(partitions)
+        self.rows = rows
+        self._starts = np.array([p.start for p in partitions], dtype=np.int64)
+        self._stops = np.array([p.stop for p in partitions], dtype=np.int64)
+        # Genre selection is fully answered by pruning when every partition is one primary genre
+        self.genre_keyed = self.partitioned and all('primary_genre' in p.keys for p in partitions)
+        self._genres = np.array([p.keys.get('primary_genre') for p in partitions], dtype=object)
+        self._bounds = {}
+        for column in {c for p in partitions for c in p.stats}:
+            bounds = [p.stats.get(column, (-np.inf, np.inf)) for p in partitions]
+            # Missing values never pass a comparison, so an all-missing column rules the partition out
+            self._bounds[column] = (np.array([b is None for b in bounds]),
+                                    np.array([b[0] if b is not None else np.nan for b in bounds]),
+                                    np.array([b[1] if b is not None else np.nan for b in bounds]))
+
+    def _outside(self, column, lo=-np.inf, hi=np.inf) -> np.ndarray | bool:
+        if column not in self._bounds:
+            return False
+        empty, low, high = self._bounds[column]
+        return empty | (high < lo) | (low > hi)
+
+    def kept(self, f: Filters) -> np.ndarray:
+        """Whether each partition may hold rows for `f`."""
+        ruled_out = (
+            self._outside('year', *f.year_range)
+            | self._outside('budget', f.budget_range[0] * 1e6, f.budget_range[1] * 1e6)
+            | self._outside('vote_average', f.min_rating)
+        )
+        if f.genres and self.genre_keyed:
+            ruled_out = ruled_out | ~np.isin(self._genres, list(f.genres))
+        if f.only_profitable:
+            ruled_out = ruled_out | self._outside('profit', np.nextafter(0, 1))
+        if f.only_blockbusters:
+            ruled_out = ruled_out | self._outside('revenue', np.nextafter(BLOCKBUSTER_REVENUE, np.inf))
+        if f.hidden_gems:
+            ruled_out = (ruled_out | self._outside('budget', hi=np.nextafter(GEM_MAX_BUDGET, 0))
+                         | self._outside('vote_average', GEM_MIN_RATING))
+        return ~np.broadcast_to(ruled_out, self._starts.shape)
+
+    def ranges(self, f: Filters) -> list[tuple[int, int]]:
+        """`(start, stop)` row ranges that may hold rows for `f`, adjacent partitions merged."""
+        if not self.partitioned:
+            return [(0, self.rows)]
+        kept = self.kept(f)
+        starts, stops = self._starts[kept], self._stops[kept]
+        # A run starts wherever a kept partition doesn't continue the previous one
+        new_run = np.ones(len(starts), dtype=bool)
+        new_run[1:] = starts[1:] != stops[:-1]
+        run_stops = np.append(stops[np.flatnonzero(new_run)[1:] - 1], stops[-1:])
+        return list(zip(starts[new_run].tolist(), run_stops.tolist()))
+
+
+def _values(series: pd.Series) -> np.ndarray:
+    # NumPy-backed columns are viewed in place (memory-mapped, shared); nullable ones become float with NaN
+    if isinstance(series.dtype, np.dtype):
+        return series.to_numpy()
+    return series.to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+class PandasBackend:
+    """Boolean masks and groupbys over the in-memory frame.
+
+    With `partitions` (see colstore.read_partitions) only the row ranges of
+    partitions that survive pruning are evaluated, as slices of the mapped
+    columns; the rest of the store isn't touched.
+    """
+
+    name = "pandas"
+
+    def __init__(self, frame: pd.DataFrame, partitions: list | None = None):
+        self._frame = frame
+        self._ranges = PartitionRanges(partitions or [], len(frame))
+        self._columns = {c: _values(frame[c]) for c in ('year', 'budget', 'vote_average', 'profit', 'revenue')}
+        self._genres = frame['primary_genre'].array
+        # (Filters, mask) of the last filter state: a rerun's mask and its groupbys share one evaluation
+        self._last = None
+
+    def _match(self, f: Filters, rows: slice) -> np.ndarray:
+        """Boolean mask for `f` over the rows in `rows`."""
+        year, budget, rating = (self._columns[c][rows] for c in ('year', 'budget', 'vote_average'))
+        keep = (
+            (year >= f.year_range[0]) & (year <= f.year_range[1]) &
+            (budget >= f.budget_range[0] * 1e6) & (budget <= f.budget_range[1] * 1e6) &
+            (rating >= f.min_rating)
+        )
+        if f.genres and not self._ranges.genre_keyed:
+            keep &= self._genres[rows].isin(f.genres)
+        if f.only_profitable:
+            keep &= self._columns['profit'][rows] > 0
+        if f.only_blockbusters:
+            keep &= self._columns['revenue'][rows] > BLOCKBUSTER_REVENUE
+        if f.hidden_gems:
+            keep &= (budget < GEM_MAX_BUDGET) & (rating >= GEM_MIN_RATING)
+        return keep
+
+    def mask(self, f: Filters) -> np.ndarray:
+        """Read-only boolean row mask for `f`, aligned with the frame's rows."""
+        last = self._last
+        if last is not None and last[0] == f:
+            return last[1]
+        mask = np.zeros(len(self._frame), dtype=bool)
+        for start, stop in self._ranges.ranges(f):
+            mask[start:stop] = self._match(f, slice(start, stop))
+        mask.flags.writeable = False
+        self._last = (f, mask)
+        return mask
+
+    def aggregate(self, f: Filters, by: list[str], aggs: dict[str, tuple[str, str]]) -> pd.DataFrame:
+        """Group the rows matching `f` by `by`; `aggs` maps output name -> (column, function).
+
+        Returns the group keys (sorted, missing keys dropped) followed by one
+        column per entry of `aggs`, in order. The mask is reused from the last
+        `mask(f)` call when `f` hasn't changed.
+        """
+        rows = self._frame[self.mask(f)]
+        return rows.groupby(by).agg(**aggs).reset_index()
+
+
+class DuckDBBackend:
+    """The same queries run by an in-process DuckDB over an Arrow view of the frame.
+
+    Filters and groupbys are pushed down as SQL and executed multi-threaded;
+    each thread gets its own connection onto the same zero-copy table. With
+    `partitions`, only the rows of surviving partitions are handed to DuckDB.
+    """
+
+    name = "duckdb"
+
+    def __init__(self, frame: pd.DataFrame, partitions: list | None = None):
+        import pyarrow as pa
+
+        self._dtypes = frame.dtypes
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        self._table = table.append_column("_pos", pa.array(np.arange(len(frame), dtype=np.int64)))
+        self._rows = len(frame)
+        self._ranges = PartitionRanges(partitions or [], len(frame))
+        self._local = threading.local()
+
+    def _connection(self, f: Filters):
+        """This thread's connection, with `movies` bound to the rows that survive pruning for `f`."""
+        con = getattr(self._local, "con", None)
+        if con is None:
+            import duckdb
+
+            con = self._local.con = duckdb.connect()
+            self._local.kept = None  # nothing registered yet
+        kept = tuple(self._ranges.ranges(f))
+        if kept != self._local.kept:
+            # Slices of the Arrow table are zero-copy; a single full range is the table itself
+            if kept == ((0, self._rows),):
+                table = self._table
+            else:
+                import pyarrow as pa
+
+                table = pa.concat_tables([self._table.slice(start, stop - start) for start, stop in kept]
+                                         or [self._table.slice(0, 0)])
+            con.register("movies", table)
+            self._local.kept = kept
+        return con
+
+    @staticmethod
+    def _where(f: Filters) -> tuple[str, list]:
+        clauses = ["year BETWEEN ? AND ?", "budget BETWEEN ? AND ?", "vote_average >= ?"]
+        params = [f.year_range[0], f.year_range[1], f.budget_range[0] * 1e6, f.budget_range[1] * 1e6, f.min_rating]
+        if f.genres:
+            clauses.append("list_contains(?::VARCHAR[], primary_genre)")
+            params.append(list(f.genres))
+        if f.only_profitable:
+            clauses.append("profit > 0")
+        if f.only_blockbusters:
+            clauses.append("revenue > ?")
+            params.append(BLOCKBUSTER_REVENUE)
+        if f.hidden_gems:
+            clauses.append("budget < ? AND vote_average >= ?")
+            params += [GEM_MAX_BUDGET, GEM_MIN_RATING]
+        return " AND ".join(clauses), params
+
+    def mask(self, f: Filters) -> np.ndarray:
+        """Boolean row mask for `f`, aligned with the frame's rows."""
+        where, params = self._where(f)
+        positions = self._connection(f).execute(f"SELECT _pos FROM movies WHERE {where}", params).fetchnumpy()["_pos"]
+        mask = np.zeros(self._rows, dtype=bool)
+        mask[positions] = True
+        return mask
+
+    def aggregate(self, f: Filters, by: list[str], aggs: dict[str, tuple[str, str]]) -> pd.DataFrame:
+        """Group the rows matching `f` by `by`; same result layout as PandasBackend.aggregate."""
+        where, params = self._where(f)
+        keys = ", ".join(f'"{k}"' for k in by)
+        selects = []
+        for name, (column, func) in aggs.items():
+            if func not in AGG_FUNCS:
+                raise ValueError(f"Unsupported aggregation: {func}")
+            expr = f'"{column}"::DOUBLE' if func == 'mean' else f'"{column}"'
+            sql = f"{'avg' if func == 'mean' else func}({expr})"
+            if func == 'sum':
+                sql = f"coalesce({sql}, 0)"
+            selects.append(f'{sql} AS "{name}"')
+        not_null = " AND ".join(f'"{k}" IS NOT NULL' for k in by)
+        result = self._connection(f).execute(
+            f"SELECT {keys}, {', '.join(selects)} FROM movies WHERE {where} AND {not_null} "
+            f"GROUP BY {keys} ORDER BY {keys}",
+            params,
+        ).fetchdf()
+        # Match pandas' result dtypes (integer sums, nullable keys, ...)
+        for k in by:
+            result[k] = result[k].astype(self._dtypes[k])
+        for name, (column, func) in aggs.items():
+            if func == 'count' or (func == 'sum' and self._dtypes[column].kind in "biu"):
+                result[name] = result[name].astype(np.int64)
+        return result
+
+
+BACKENDS = {PandasBackend.name: PandasBackend, DuckDBBackend.name: DuckDBBackend}
+
+
+def make_backend(frame: pd.DataFrame, name: str = QUERY_BACKEND, partitions: list | None = None):
+    """Query engine `name` ("pandas" or "duckdb") over `frame`, pruning by `partitions` if given."""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown query backend: {name} (expected one of {', '.join(BACKENDS)})")
+    return BACKENDS[name](frame, partitions)
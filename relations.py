@@ -0,0 +1,191 @@
+"""Many-to-many relations between movies and their genres/people, built once and reduced per filter."""
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+def cooccurrence(matrix: sparse.csr_matrix, labels: list[str], mask: np.ndarray, values: np.ndarray):
+    """Pairwise co-occurrence counts and value sums for a multi-hot matrix restricted to `mask`.
+
+    Both come from one sparse product: the selected rows' transpose times
+    `[rows | rows * values]`. Returns `(counts, sums)` as label x label frames;
+    the diagonal holds per-label totals.
+    """
+    rows = matrix[np.flatnonzero(mask)]
+    weighted = sparse.diags(np.nan_to_num(values[mask]).astype(np.float64)) @ rows
+    product = (rows.T @ sparse.hstack([rows, weighted], format="csr")).toarray()
+    g = len(labels)
+    counts = pd.DataFrame(product[:, :g].round().astype(np.int64), index=labels, columns=labels)
+    sums = pd.DataFrame(product[:, g:], index=labels, columns=labels)
+    return counts, sums
+
+
+def top_pairs(counts: pd.DataFrame, sums: pd.DataFrame, n: int = 15) -> pd.DataFrame:
+    """The `n` most frequent distinct label pairs with their count and mean value."""
+    upper = np.triu(np.ones(counts.shape, dtype=bool), k=1)
+    pairs = pd.DataFrame({
+        'count': counts.where(upper).stack(),
+        'total': sums.where(upper).stack(),
+    })
+    pairs = pairs[pairs['count'] > 0].nlargest(n, 'count')
+    pairs['count'] = pairs['count'].astype(np.int64)
+    pairs['mean'] = pairs['total'] / pairs['count']
+    pairs.index = pairs.index.set_names(['first', 'second'])
+    return pairs.reset_index()
+
+
+# Roles in the person -> movie table
+DIRECTOR, CAST = 0, 1
+
+
+def _explode(values: pd.Series, sep: str = "|") -> pd.DataFrame:
+    """Row position, name and order within the field for every delimited entry."""
+    exploded = values.reset_index(drop=True).fillna("").astype(str).str.split(sep).explode().str.strip()
+    out = pd.DataFrame({'movie': exploded.index.to_numpy(), 'name': exploded.to_numpy()})
+    out['order'] = out.groupby('movie').cumcount()
+    return out[out['name'] != ""]
+
+
+class PeopleTable:
+    """Exploded person -> movie table for directors and cast, built once at load.
+
+    Each entry is (person code, movie row position, role, billing order), so
+    per-filter statistics are a mask lookup on movie positions plus a grouped
+    reduction, never a string split.
+    """
+
+    def __init__(self, frame: pd.DataFrame):
+        directors = _explode(frame['director']).assign(role=DIRECTOR)
+        cast = _explode(frame['cast']).assign(role=CAST)
+        entries = pd.concat([directors, cast], ignore_index=True)
+        codes, names = pd.factorize(entries['name'])
+        self.names = np.asarray(names, dtype=object)
+        self.person = codes.astype(np.int32)
+        self.movie = entries['movie'].to_numpy(dtype=np.int64)
+        self.role = entries['role'].to_numpy(dtype=np.int8)
+        self.billing = entries['order'].to_numpy(dtype=np.int16)
+
+    def __len__(self) -> int:
+        return len(self.person)
+
+    def select(self, role: int, mask: np.ndarray, max_billing: int | None = None) -> np.ndarray:
+        """Entry indices for `role` whose movie is selected by `mask` (and billed within `max_billing`)."""
+        keep = (self.role == role) & mask[self.movie]
+        if max_billing is not None:
+            keep &= self.billing < max_billing
+        return np.flatnonzero(keep)
+
+    def leaderboard(self, role: int, mask: np.ndarray, movies: pd.DataFrame,
+                    max_billing: int | None = None, min_films: int = 1) -> pd.DataFrame:
+        """Per-person film count, total/median profit, hit rate and average rating over the selection.
+
+        `movies` supplies `profit`, `is_profitable` and `vote_average` aligned
+        with the row positions the table was built from.
+        """
+        entries = self.select(role, mask, max_billing)
+        rows = self.movie[entries]
+        joined = pd.DataFrame({
+            'person': self.person[entries],
+            'profit': movies['profit'].to_numpy()[rows],
+            'hit': movies['is_profitable'].to_numpy()[rows],
+            'rating': movies['vote_average'].to_numpy()[rows],
+        })
+        board = joined.groupby('person').agg(
+            films=('profit', 'size'),
+            total_profit=('profit', 'sum'),
+            median_profit=('profit', 'median'),
+            hit_rate=('hit', 'mean'),
+            avg_rating=('rating', 'mean'),
+        )
+        board = board[board['films'] >= min_films]
+        board.insert(0, 'name', self.names[board.index.to_numpy()])
+        return board.reset_index(drop=True)
+
+
+class CollaborationGraph:
+    """Co-credit graph over directors and lead cast, from a sparse movie x person incidence matrix.
+
+    Edge weights count shared films in the selection. Moving between filter
+    states only adds/subtracts the products of the movies that entered or
+    left the selection, so small slider moves don't rebuild the graph.
+    """
+
+    def __init__(self, people: PeopleTable, n_movies: int, lead_billing: int = 3):
+        keep = (people.role == DIRECTOR) | ((people.role == CAST) & (people.billing < lead_billing))
+        movies, persons = people.movie[keep], people.person[keep]
+        incidence = sparse.csr_matrix(
+            (np.ones(len(movies), dtype=np.float32), (movies, persons)),
+            shape=(n_movies, len(people.names)),
+        )
+        incidence.sum_duplicates()
+        incidence.data[:] = 1.0
+        self._incidence = incidence
+        self.names = people.names
+        # True for anyone credited as a director at least once
+        self.is_director = np.zeros(len(people.names), dtype=bool)
+        self.is_director[people.person[people.role == DIRECTOR]] = True
+
+    def _product(self, rows: np.ndarray) -> sparse.csr_matrix:
+        part = self._incidence[rows]
+        return (part.T @ part).tocsr()
+
+    def adjacency(self, mask: np.ndarray) -> sparse.csr_matrix:
+        """People x people shared-film counts for the selected movies (diagonal = film count)."""
+        return self._product(np.flatnonzero(mask))
+
+    def update(self, adjacency: sparse.csr_matrix, old_mask: np.ndarray, new_mask: np.ndarray) -> sparse.csr_matrix:
+        """Adjacency for `new_mask`, derived from the one for `old_mask` by applying the difference."""
+        added = np.flatnonzero(new_mask & ~old_mask)
+        removed = np.flatnonzero(old_mask & ~new_mask)
+        if len(added) + len(removed) >= np.count_nonzero(new_mask):
+            return self.adjacency(new_mask)
+        result = adjacency
+        if len(added):
+            result = result + self._product(added)
+        if len(removed):
+            result = result - self._product(removed)
+        result.eliminate_zeros()
+        return result.tocsr()
+
+    def subgraph(self, adjacency: sparse.csr_matrix, max_nodes: int = 60, min_shared: int = 2):
+        """The `max_nodes` best-connected people and their edges with at least `min_shared` films.
+
+        Returns `(nodes, edges)`: node positions into `names`, and an (m, 3)
+        array of (i, j, weight) with i < j indexing into `nodes`.
+        """
+        links = sparse.triu(adjacency, k=1).tocoo()
+        strong = links.data >= min_shared
+        rows, cols, weights = links.row[strong], links.col[strong], links.data[strong]
+        degree = np.bincount(rows, weights=weights, minlength=adjacency.shape[0])
+        degree += np.bincount(cols, weights=weights, minlength=adjacency.shape[0])
+        ranked = np.argsort(-degree, kind="stable")
+        nodes = ranked[:max_nodes][degree[ranked[:max_nodes]] > 0]
+        local = np.full(adjacency.shape[0], -1, dtype=np.int64)
+        local[nodes] = np.arange(len(nodes))
+        inside = (local[rows] >= 0) & (local[cols] >= 0)
+        edges = np.column_stack([local[rows[inside]], local[cols[inside]], weights[inside]])
+        return nodes, edges
+
+
+def spring_layout(n_nodes: int, edges: np.ndarray, iterations: int = 120, seed: int = 0) -> np.ndarray:
+    """Fruchterman-Reingold positions (n_nodes x 2) for a small weighted graph."""
+    rng = np.random.default_rng(seed)
+    pos = rng.uniform(-1, 1, size=(n_nodes, 2))
+    if n_nodes < 2:
+        return pos
+    k = np.sqrt(4.0 / n_nodes)
+    i, j = edges[:, 0].astype(np.int64), edges[:, 1].astype(np.int64)
+    w = edges[:, 2].astype(np.float64)
+    temperature = 0.2
+    for _ in range(iterations):
+        delta = pos[:, None, :] - pos[None, :, :]
+        dist = np.maximum(np.linalg.norm(delta, axis=-1), 1e-4)
+        # Every pair repels, linked pairs attract in proportion to shared films
+        force = (delta / dist[..., None] * (k * k / dist)[..., None]).sum(axis=1)
+        pull = (pos[i] - pos[j]) * (dist[i, j] * w / k)[:, None]
+        np.add.at(force, i, -pull)
+        np.add.at(force, j, pull)
+        length = np.maximum(np.linalg.norm(force, axis=1), 1e-9)
+        pos += force / length[:, None] * np.minimum(length, temperature)[:, None]
+        temperature *= 0.97
+    return pos
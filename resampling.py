@@ -0,0 +1,39 @@
+"""Bootstrapped confidence intervals per group, run as background jobs (see jobs.py)."""
+import numpy as np
+import pandas as pd
+
+BOOTSTRAP_RESAMPLES = 2000
+BOOTSTRAP_LEVEL = 0.95
+# Resampled values held in memory at once; resamples are drawn in chunks of about this size
+CHUNK_VALUES = 4_000_000
+
+STATISTICS = {'median': np.median, 'mean': np.mean}
+
+
+def bootstrap_ci(values: np.ndarray, groups: np.ndarray, stat: str = 'median',
+                 resamples: int = BOOTSTRAP_RESAMPLES, level: float = BOOTSTRAP_LEVEL,
+                 seed: int = 0) -> pd.DataFrame:
+    """Per group: the statistic of `values` and its percentile bootstrap interval.
+
+    `groups` labels each value. Missing values are dropped, and groups left
+    with fewer than two values are skipped. Returns one row per group with
+    columns group, n, estimate, low and high.
+    """
+    func = STATISTICS[stat]
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({'group': groups, 'value': values}).dropna()
+    alpha = (1 - level) / 2
+    rows = []
+    for group, sample in frame.groupby('group', sort=True, observed=True)['value']:
+        sample = sample.to_numpy(dtype=np.float64)
+        n = len(sample)
+        if n < 2:
+            continue
+        chunk = max(1, CHUNK_VALUES // n)
+        stats = np.concatenate([
+            func(sample[rng.integers(0, n, size=(min(chunk, resamples - start), n))], axis=1)
+            for start in range(0, resamples, chunk)
+        ])
+        low, high = np.quantile(stats, [alpha, 1 - alpha])
+        rows.append({'group': group, 'n': n, 'estimate': float(func(sample)), 'low': float(low), 'high': float(high)})
+    return pd.DataFrame(rows, columns=['group', 'n', 'estimate', 'low', 'high'])
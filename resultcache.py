@@ -0,0 +1,196 @@
+"""Derived results persisted on disk, so they survive restarts and redeploys.
+
+`persistent` stores a function's return values as pickles in the cache
+directory's `results/` folder. Keys are content-addressed: a hash of the
+arguments, the dataset (the data file's content hash and DATA_VERSION) and
+the code (the function's source plus the source files of the modules it
+depends on: `depends`, and always the loading pipeline in BASE_DEPENDENCIES).
+A restarted server, a redeploy of the same data and code or another process
+on the machine finds them again, so popular filter states are hot straight
+away. Changing the data or any of that code yields new keys, and the old
+entries age out.
+
+The folder is kept under `CINEMETRICS_RESULT_CACHE_MB` (default 256) by
+evicting the least recently used entries (file mtime, refreshed on every
+hit). `stats()` has hit and miss counts per function. As with
+`st.cache_data`, arguments whose names start with an underscore are left out
+of the key.
+"""
+import functools
+import hashlib
+import importlib.util
+import inspect
+import logging
+import marshal
+import os
+import pickle
+import threading
+
+from dataset import DATA_PATH, DATA_VERSION, cache_path, file_fingerprint
+
+RESULT_CACHE_MB = float(os.environ.get("CINEMETRICS_RESULT_CACHE_MB", 256))
+RESULT_DIR = "results"
+# Modules every cached result depends on: how the data is loaded into the frame
+BASE_DEPENDENCIES = ("dataset", "colstore")
+# Eviction trims the folder to this share of the limit, so it doesn't run again on the next write
+LOW_WATER = 0.8
+# Fixed so the same arguments hash the same in every process
+PICKLE_PROTOCOL = 4
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_stats = {}            # function name -> {'hits', 'misses', 'errors'}
+_disk_bytes = None     # running estimate of the folder's size, None until first scanned
+_evicted = 0
+_dataset_key = None
+
+
+def dataset_key() -> str:
+    """Identity of the loaded data: its file's content hash plus DATA_VERSION."""
+    global _dataset_key
+    if _dataset_key is None:
+        _dataset_key = f"{file_fingerprint(DATA_PATH)}-{DATA_VERSION}"
+    return _dataset_key
+
+
+@functools.cache
+def module_hash(name: str) -> str:
+    """Content hash of module `name`'s source file."""
+    spec = importlib.util.find_spec(name)
+    if spec is None or not spec.origin or not os.path.isfile(spec.origin):
+        raise ValueError(f"No source file for module {name!r}")
+    with open(spec.origin, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def _entries() -> list[tuple[float, int, str]]:
+    """(mtime, size, path) of every stored result."""
+    entries = []
+    root = os.path.dirname(cache_path(RESULT_DIR, "x"))
+    for shard in os.scandir(root):
+        if not shard.is_dir():
+            continue
+        for entry in os.scandir(shard.path):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:  # evicted by another process meanwhile
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+    return entries
+
+
+def _evict(limit: int) -> tuple[int, int]:
+    """Delete the least recently used results until the folder is under LOW_WATER of `limit`.
+
+    Returns the folder's new size and the number of entries deleted.
+    """
+    entries = sorted(_entries())
+    total = sum(size for _, size, _ in entries)
+    evicted = 0
+    for _, size, path in entries:
+        if total <= limit * LOW_WATER:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        evicted += 1
+    if evicted:
+        logger.info("Result cache: evicted %d entries, %.1f MiB left", evicted, total / 2**20)
+    return total, evicted
+
+
+def _store(path: str, value) -> None:
+    global _disk_bytes, _evicted
+    tmp_file = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_file, "wb") as f:
+        pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+    size = os.path.getsize(tmp_file)
+    os.replace(tmp_file, path)
+    limit = int(RESULT_CACHE_MB * 2**20)
+    with _lock:
+        if _disk_bytes is None:
+            _disk_bytes = sum(size for _, size, _ in _entries())
+        else:
+            _disk_bytes += size
+        if _disk_bytes > limit:
+            # The estimate misses other processes' writes and evictions; rescanning settles it
+            _disk_bytes, evicted = _evict(limit)
+            _evicted += evicted
+
+
+def _count(name: str, outcome: str) -> None:
+    with _lock:
+        counts = _stats.setdefault(name, {'hits': 0, 'misses': 0, 'errors': 0})
+        counts[outcome] += 1
+
+
+def persistent(func=None, *, depends=()):
+    """Decorator caching `func`'s results on disk, keyed by its arguments, the dataset and its code.
+
+    `depends` names the modules whose code produces the result (e.g. the
+    query engine `func` calls); a change to any of them invalidates it.
+    Use as `@persistent` or `@persistent(depends=("query",))`.
+    """
+    if func is None:
+        return functools.partial(persistent, depends=depends)
+    name = f"{func.__module__}.{func.__qualname__}"
+    try:
+        source = hashlib.sha1(inspect.getsource(func).encode()).hexdigest()
+    except OSError:  # no source file (interactive use): fall back to the bytecode
+        source = hashlib.sha1(marshal.dumps(func.__code__)).hexdigest()
+    modules = sorted(set(BASE_DEPENDENCIES) | set(depends))
+    code = (source, tuple((module, module_hash(module)) for module in modules))
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        hashed = {k: v for k, v in bound.arguments.items() if not k.startswith("_")}
+        key = hashlib.sha256(pickle.dumps(
+            (name, code, dataset_key(), hashed), protocol=PICKLE_PROTOCOL)).hexdigest()
+        path = cache_path(RESULT_DIR, key[:2], f"{key}.pkl")
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+            os.utime(path)  # recently used
+        except FileNotFoundError:  # not stored yet, or evicted by another process meanwhile
+            pass
+        except Exception as exc:
+            # Truncated or from an incompatible library version: recompute and overwrite
+            logger.warning("Result cache: unreadable entry for %s (%s)", name, exc)
+            _count(name, 'errors')
+        else:
+            _count(name, 'hits')
+            return value
+        _count(name, 'misses')
+        value = func(*args, **kwargs)
+        try:
+            _store(path, value)
+        except OSError as exc:
+            logger.warning("Result cache: couldn't store a result of %s (%s)", name, exc)
+        return value
+
+    return wrapper
+
+
+def stats() -> dict:
+    """Hits, misses and hit rate per cached function (plus an 'all' total), the folder's size and evictions.
+
+    The size is None until this process has stored a result.
+    """
+    with _lock:
+        per_function = {name: dict(counts) for name, counts in _stats.items()}
+        disk_bytes, evicted = _disk_bytes, _evicted
+    total = {'hits': 0, 'misses': 0, 'errors': 0}
+    for counts in per_function.values():
+        for outcome in total:
+            total[outcome] += counts[outcome]
+    per_function['all'] = total
+    for counts in per_function.values():
+        requests = counts['hits'] + counts['misses']
+        counts['hit_rate'] = counts['hits'] / requests if requests else None
+    return {'functions': per_function, 'disk_bytes': disk_bytes, 'evicted': evicted}
@@ -0,0 +1,214 @@
+"""'Similar movies' search: nearest neighbours over feature vectors and plot text."""
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from dataset import cache_path, fingerprint
+from indexes import multi_hot
+
+# Numeric features; skewed ones are log-scaled before standardizing
+NUMERIC_FEATURES = ['budget', 'revenue', 'runtime', 'vote_average', 'popularity', 'vote_count', 'year']
+LOG_FEATURES = {'budget', 'revenue', 'popularity', 'vote_count'}
+# TMDB stores unknown budget/revenue/runtime as 0
+ZERO_IS_MISSING = {'budget', 'revenue', 'runtime'}
+# Weight of each genre flag relative to one standardized numeric feature
+GENRE_WEIGHT = 1.0
+# Filters passing less than this share of the catalogue are scored directly; wider ones query the tree
+BRUTE_FORCE_SHARE = 0.15
+
+
+def feature_matrix(frame: pd.DataFrame, genre_weight: float = GENRE_WEIGHT) -> np.ndarray:
+    """Standardized numeric features plus weighted multi-hot genres, one row per movie."""
+    columns = []
+    for name in NUMERIC_FEATURES:
+        values = frame[name].to_numpy(dtype=np.float64, na_value=np.nan)
+        if name in ZERO_IS_MISSING:
+            values = np.where(values > 0, values, np.nan)
+        if name in LOG_FEATURES:
+            values = np.log1p(np.clip(values, 0, None))
+        # Missing values sit at the median so they don't pull movies apart
+        median = np.nanmedian(values) if np.isfinite(values).any() else 0.0
+        values = np.where(np.isfinite(values), values, median)
+        std = values.std()
+        columns.append((values - values.mean()) / (std if std > 0 else 1.0))
+    genres, _ = multi_hot(frame['genres'])
+    numeric = np.column_stack(columns)
+    return np.hstack([numeric, genres.toarray() * genre_weight]).astype(np.float32)
+
+
+class SimilarityIndex:
+    """KD-tree over movie feature vectors, built once and queried per click."""
+
+    def __init__(self, frame: pd.DataFrame, genre_weight: float = GENRE_WEIGHT):
+        # scipy.spatial costs ~0.3s to import; only pay for it when the first index is built
+        from scipy.spatial import cKDTree
+
+        self._features = feature_matrix(frame, genre_weight)
+        self._tree = cKDTree(self._features)
+
+    def __len__(self) -> int:
+        return len(self._features)
+
+    def neighbours(self, position: int, k: int = 10, mask: np.ndarray | None = None):
+        """The `k` movies closest to row `position`, restricted to `mask` if given.
+
+        Returns `(positions, distances)` sorted by distance, excluding the movie itself.
+        """
+        n = len(self._features)
+        point = self._features[position]
+        if mask is None:
+            candidates = n
+        else:
+            mask = mask.copy()
+            mask[position] = False
+            candidates = int(np.count_nonzero(mask))
+        if candidates == 0 or k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        if mask is not None and candidates < BRUTE_FORCE_SHARE * n:
+            # Selective filters: the tree would over-fetch by the inverse selectivity, which costs more
+            rows = np.flatnonzero(mask)
+            dist = np.sqrt(((self._features[rows] - point) ** 2).sum(axis=1))
+            top = np.argsort(dist, kind="stable")[:k]
+            return rows[top], dist[top]
+
+        # Over-fetch by the inverse selectivity, widening until enough rows pass the filter
+        want = k + 1
+        fetch = min(n, int(np.ceil(want * n / candidates * 1.5)))
+        while True:
+            dist, rows = self._tree.query(point, k=fetch)
+            dist, rows = np.atleast_1d(dist), np.atleast_1d(rows)
+            keep = rows != position
+            if mask is not None:
+                keep &= mask[rows]
+            if keep.sum() >= k or fetch >= n:
+                return rows[keep][:k].astype(np.int64), dist[keep][:k]
+            fetch = min(n, fetch * 2)
+
+
+# Text used for plot similarity; keywords are pipe-delimited
+TEXT_COLUMNS = ['overview', 'tagline', 'keywords']
+# Terms in fewer documents than this, or in more than this share of them, are dropped
+MIN_DF = 2
+MAX_DF_RATIO = 0.5
+STOP_WORDS = frozenset("""
+a about after all also an and any are as at be been before but by can could do does for from had has have
+he her him his how i if in into is it its just more most my no not of on one only or other our out over
+she so some than that the their them then there these they this those through to too up us was we were
+what when where which while who whom why will with would you your
+""".split())
+
+
+def _tokenize(frame: pd.DataFrame) -> pd.Series:
+    """Document position -> token, one row per token occurrence."""
+    text = frame['overview'].fillna("")
+    text = text + " " + frame['tagline'].fillna("") + " " + frame['keywords'].fillna("").str.replace("|", " ", regex=False)
+    tokens = text.reset_index(drop=True).str.lower().str.findall(r"[a-z][a-z']+").explode().dropna()
+    return tokens[~tokens.isin(STOP_WORDS)]
+
+
+def tfidf_matrix(frame: pd.DataFrame) -> sparse.csr_matrix:
+    """L2-normalized TF-IDF rows (documents x terms) with sublinear term frequency."""
+    n = len(frame)
+    tokens = _tokenize(frame)
+    doc_term = pd.DataFrame({'doc': tokens.index.to_numpy(), 'term': tokens.to_numpy()})
+    counts = doc_term.groupby(['doc', 'term'], sort=False).size().reset_index(name='tf')
+    doc_freq = counts['term'].value_counts()
+    keep = doc_freq[(doc_freq >= MIN_DF) & (doc_freq <= max(MIN_DF, MAX_DF_RATIO * n))].index
+    counts = counts[counts['term'].isin(keep)]
+    term_codes, vocab = pd.factorize(counts['term'], sort=True)
+
+    df_per_term = doc_freq.reindex(vocab).to_numpy(dtype=np.float64)
+    idf = np.log((1 + n) / (1 + df_per_term)) + 1
+    weights = (1 + np.log(counts['tf'].to_numpy(dtype=np.float64))) * idf[term_codes]
+    matrix = sparse.csr_matrix(
+        (weights.astype(np.float32), (counts['doc'].to_numpy(), term_codes)),
+        shape=(n, len(vocab)),
+    )
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.csr_matrix(sparse.diags(1 / norms).dot(matrix), dtype=np.float32)
+
+
+def _matrix_bytes(m: sparse.spmatrix) -> int:
+    return int(m.data.nbytes + m.indices.nbytes + m.indptr.nbytes)
+
+
+class TextIndex:
+    """TF-IDF matrix over overview/tagline/keywords, persisted in the cache directory.
+
+    Rows are documents in frame order; a transposed copy serves as postings
+    lists so a query only touches films sharing at least one term.
+    """
+
+    def __init__(self, matrix: sparse.csr_matrix, stats: dict):
+        self._matrix = matrix
+        self._postings = matrix.T.tocsr()
+        self.stats = dict(stats, bytes=_matrix_bytes(matrix) + _matrix_bytes(self._postings))
+
+    def __len__(self) -> int:
+        return self._matrix.shape[0]
+
+    @classmethod
+    def build(cls, frame: pd.DataFrame) -> "TextIndex":
+        start = time.perf_counter()
+        matrix = tfidf_matrix(frame)
+        return cls(matrix, {
+            'rows': matrix.shape[0],
+            'terms': matrix.shape[1],
+            'nnz': int(matrix.nnz),
+            'build_seconds': time.perf_counter() - start,
+            'from_cache': False,
+        })
+
+    @classmethod
+    def load_or_build(cls, frame: pd.DataFrame) -> "TextIndex":
+        """Reuse the matrix saved for this exact text content, or build and save it."""
+        key = fingerprint(frame, ['id'] + TEXT_COLUMNS)
+        matrix_file = cache_path("tfidf", f"{key}.npz")
+        stats_file = cache_path("tfidf", f"{key}.json")
+        if os.path.exists(matrix_file) and os.path.exists(stats_file):
+            try:
+                with open(stats_file, encoding="utf-8") as f:
+                    stats = json.load(f)
+            except (OSError, ValueError):
+                pass  # unreadable (e.g. left truncated by an older version): rebuild
+            else:
+                return cls(sparse.load_npz(matrix_file).tocsr(), dict(stats, from_cache=True))
+
+        index = cls.build(frame)
+        # Write-then-rename so a concurrent reader never sees a half-written matrix or stats file
+        tmp_file = f"{matrix_file}.{os.getpid()}.tmp.npz"
+        sparse.save_npz(tmp_file, index._matrix)
+        os.replace(tmp_file, matrix_file)
+        tmp_file = f"{stats_file}.{os.getpid()}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump({k: v for k, v in index.stats.items() if k not in ('from_cache', 'bytes')}, f)
+        os.replace(tmp_file, stats_file)
+        return index
+
+    def similar(self, position: int, k: int = 10, mask: np.ndarray | None = None):
+        """The `k` films whose text is closest (cosine) to row `position`, within `mask` if given.
+
+        Returns `(positions, scores)` sorted by descending score, excluding the film itself.
+        """
+        query = self._matrix[position]
+        if query.nnz == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        # Postings of the query terms, weighted by the query's own term weights
+        postings = self._postings[query.indices]
+        docs = postings.indices
+        weights = postings.data * np.repeat(query.data, np.diff(postings.indptr))
+        if mask is not None:
+            keep = mask[docs]
+            docs, weights = docs[keep], weights[keep]
+        candidates, inverse = np.unique(docs, return_inverse=True)
+        scores = np.bincount(inverse, weights=weights, minlength=len(candidates))
+        scores[candidates == position] = -1
+        top = np.argsort(-scores, kind="stable")[:k]
+        top = top[scores[top] > 0]
+        return candidates[top].astype(np.int64), scores[top].astype(np.float32)
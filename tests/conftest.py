@@ -0,0 +1,37 @@
+"""Shared fixtures: a small synthetic catalogue and a column store built from it."""
+import os
+import sys
+import warnings
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synth import generate  # noqa: E402
+from colstore import open_store, read_partitions, write_store  # noqa: E402
+from dataset import LAZY_COLUMNS, PARTITION_BY, freeze, prepare_data  # noqa: E402
+
+CATALOGUE_ROWS = 3000
+
+
+@pytest.fixture(scope="session")
+def catalogue():
+    """Prepared synthetic catalogue, in CSV order."""
+    with warnings.catch_warnings():
+        # Synthetic release dates come in mixed formats, like the real CSV
+        warnings.simplefilter("ignore", UserWarning)
+        return prepare_data(generate(CATALOGUE_ROWS, seed=0))
+
+
+@pytest.fixture(scope="session")
+def store(catalogue, tmp_path_factory):
+    """Directory of a column store of the catalogue, partitioned like the app's."""
+    directory = str(tmp_path_factory.mktemp("store") / "columns")
+    write_store(catalogue, directory, PARTITION_BY)
+    return directory
+
+
+@pytest.fixture(scope="session")
+def shared(store):
+    """The frozen, memory-mapped frame and partitions the app queries."""
+    return freeze(open_store(store, exclude=LAZY_COLUMNS)), read_partitions(store)
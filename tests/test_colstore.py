@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from colstore import LazyColumns, open_store, read_partitions, write_store
+from dataset import PARTITION_BY
+
+
+def clustered(frame: pd.DataFrame) -> pd.DataFrame:
+    """`frame` in the documented store order: by partition key, missing keys last, CSV order within."""
+    return frame.sort_values(PARTITION_BY, kind="stable", na_position="last").reset_index(drop=True)
+
+
+def loaded(directory: str) -> pd.DataFrame:
+    """A store's columns copied out of their memory maps, for comparing with in-memory frames."""
+    frame = open_store(directory)
+    return pd.DataFrame({name: np.array(frame[name]) if isinstance(frame[name].dtype, np.dtype) else frame[name]
+                         for name in frame.columns})
+
+
+def test_round_trip_keeps_rows_and_values(catalogue, tmp_path):
+    directory = str(tmp_path / "plain")
+    write_store(catalogue, directory)
+
+    pd.testing.assert_frame_equal(loaded(directory), catalogue.reset_index(drop=True))
+    assert read_partitions(directory) == []
+
+
+def test_partitioned_round_trip_clusters_rows_by_key(catalogue, store):
+    pd.testing.assert_frame_equal(loaded(store), clustered(catalogue))
+
+
+def test_partitions_are_contiguous_runs_with_their_stats(catalogue, store):
+    frame = clustered(catalogue)
+    partitions = read_partitions(store)
+
+    assert partitions[0].start == 0 and partitions[-1].stop == len(frame)
+    for previous, partition in zip(partitions, partitions[1:]):
+        assert partition.start == previous.stop
+    for partition in partitions:
+        rows = frame.iloc[partition.start:partition.stop]
+        for column, value in partition.keys.items():
+            assert (rows[column].isna() if value is None else rows[column] == value).all()
+        budget = rows['budget']
+        assert partition.stats['budget'] == (budget.min(), budget.max())
+
+
+def test_columns_are_read_only(store):
+    frame = open_store(store, columns=['budget', 'original_title'])
+    with pytest.raises(ValueError):
+        frame['budget'].to_numpy()[0] = 1
+
+
+def test_lazy_columns_match_the_frame(catalogue, store):
+    lazy = LazyColumns(store, ['overview', 'tagline'])
+    frame = clustered(catalogue)
+    positions = np.array([0, 17, len(frame) - 1])
+
+    for position in positions:
+        row = lazy.row(int(position))
+        for column in ('overview', 'tagline'):
+            expected = frame[column].iloc[position]
+            assert row[column] == (None if pd.isna(expected) else expected)
+    taken = lazy.take('overview', positions)
+    assert list(taken) == [None if pd.isna(v) else v for v in frame['overview'].iloc[positions]]
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from indexes import IdIndex, TitleIndex
+
+# Characters after which a word starts, as TitleIndex treats them
+WORD_BREAKS = set(" \t\n-:/(\"'.,&")
+
+
+def normalize(title) -> str:
+    return " ".join(str(title).casefold().split()) if pd.notna(title) else ""
+
+
+def brute_force_search(titles, scores, query, limit, mask=None):
+    """Every title checked one by one: prefix matches first, then word matches, each by score."""
+    q = normalize(query)
+    matches = []
+    for pos, title in enumerate(map(normalize, titles)):
+        if mask is not None and not mask[pos]:
+            continue
+        starts = title.startswith(q)
+        if starts or any(title.startswith(q, i) for i in range(1, len(title)) if title[i - 1] in WORD_BREAKS):
+            matches.append((not starts, -scores[pos], pos))
+    return [pos for *_, pos in sorted(matches)[:limit]]
+
+
+@pytest.fixture(scope="module")
+def titles(catalogue):
+    # A few hand-written titles next to the synthetic ones, to exercise punctuation and case
+    extra = pd.Series(["The Lion King", "Star Wars: A New Hope", "star trek", "Mission: Impossible - Ghost",
+                       "King Kong", None, "Kingdom of Heaven", "O'Brother"])
+    return pd.concat([catalogue['original_title'], extra], ignore_index=True)
+
+
+@pytest.fixture(scope="module")
+def scores(titles):
+    return np.random.default_rng(0).integers(0, 50, len(titles)).astype(float)
+
+
+QUERIES = ["king", "star", "star w", "impossible - g", "brother", "o'b", "KING kong", "zzz"]
+
+
+@pytest.mark.parametrize("query", QUERIES + ["ta", "ko", "pe"])
+def test_title_search_matches_brute_force(titles, scores, query):
+    index = TitleIndex(titles, pd.Series(scores))
+    expected = brute_force_search(titles, scores, query, 20)
+    assert index.search(query, limit=20).tolist() == expected
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_title_search_respects_the_mask(titles, scores, query):
+    index = TitleIndex(titles, pd.Series(scores))
+    mask = np.random.default_rng(1).random(len(titles)) < 0.5
+    assert index.search(query, limit=10, mask=mask).tolist() == brute_force_search(titles, scores, query, 10, mask)
+
+
+def test_empty_query_returns_top_scores(titles, scores):
+    index = TitleIndex(titles, pd.Series(scores))
+    expected = sorted(range(len(titles)), key=lambda pos: (-scores[pos], pos))[:5]
+    assert index.search("", limit=5).tolist() == expected
+
+
+def test_id_lookups_match_brute_force(catalogue):
+    # Duplicate ids keep their first row
+    ids = pd.concat([catalogue['id'], catalogue['id'].iloc[:10]], ignore_index=True)
+    imdb_ids = pd.concat([catalogue['imdb_id'], catalogue['imdb_id'].iloc[:10]], ignore_index=True)
+    index = IdIndex(ids, imdb_ids)
+
+    first = {}
+    for pos, movie_id in enumerate(ids):
+        first.setdefault(movie_id, pos)
+    first_imdb = {}
+    for pos, imdb_id in enumerate(imdb_ids):
+        if pd.notna(imdb_id):
+            first_imdb.setdefault(imdb_id, pos)
+
+    assert len(index) == len(first)
+    for movie_id, pos in first.items():
+        assert index.position(movie_id) == pos
+    for imdb_id, pos in first_imdb.items():
+        assert index.position_by_imdb(imdb_id) == pos
+    unknown = max(first) + 1
+    assert index.position(unknown) is None and unknown not in index
+    assert index.position_by_imdb("tt0000000x") is None
+    wanted = [*list(first)[:50], unknown]
+    assert index.positions(wanted).tolist() == [first[i] for i in wanted[:-1]] + [-1]
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from query import BLOCKBUSTER_REVENUE, GEM_MAX_BUDGET, GEM_MIN_RATING, Filters, make_backend
+
+FILTERS = [
+    Filters((2000, 2100), (), 0.0, (0, 300), False, False, False),  # the app's initial state
+    Filters((1900, 2100), (), 0.0, (0, 300), False, False, False),
+    Filters((1985, 1994), (), 0.0, (0, 300), False, False, False),
+    Filters((1960, 2020), ('Drama', 'Comedy'), 0.0, (0, 300), False, False, False),
+    Filters((1960, 2020), ('Action',), 6.5, (10, 150), False, False, False),
+    Filters((1900, 2100), (), 0.0, (0, 300), True, False, False),
+    Filters((1900, 2100), (), 0.0, (0, 300), False, True, False),
+    Filters((1990, 2015), ('Horror',), 0.0, (0, 300), False, False, True),
+    Filters((1900, 2100), (), 9.9, (0, 300), True, True, True),  # nothing passes
+]
+
+AGGREGATES = [
+    (['year'], {'revenue': ('revenue', 'sum'), 'original_title': ('original_title', 'count')}),
+    (['primary_genre', 'decade'], {'revenue': ('revenue', 'mean'), 'vote_average': ('vote_average', 'mean')}),
+    (['decade'], {'profit': ('profit', 'sum'), 'low': ('budget', 'min'), 'high': ('budget', 'max')}),
+    (['primary_genre'], {'success': ('is_profitable', 'mean'), 'count': ('original_title', 'count')}),
+]
+
+
+def expected_mask(frame: pd.DataFrame, f: Filters) -> np.ndarray:
+    """The filters spelled out row by row, with no pruning."""
+    keep = (
+        frame['year'].between(*f.year_range)
+        & frame['budget'].between(f.budget_range[0] * 1e6, f.budget_range[1] * 1e6)
+        & (frame['vote_average'] >= f.min_rating)
+    )
+    if f.genres:
+        keep &= frame['primary_genre'].isin(f.genres)
+    if f.only_profitable:
+        keep &= frame['profit'] > 0
+    if f.only_blockbusters:
+        keep &= frame['revenue'] > BLOCKBUSTER_REVENUE
+    if f.hidden_gems:
+        keep &= (frame['budget'] < GEM_MAX_BUDGET) & (frame['vote_average'] >= GEM_MIN_RATING)
+    return keep.fillna(False).to_numpy(dtype=bool)
+
+
+@pytest.fixture(scope="module", params=["pandas", "duckdb"])
+def backend(request, shared):
+    if request.param == "duckdb":
+        pytest.importorskip("duckdb")
+    frame, partitions = shared
+    return make_backend(frame, request.param, partitions)
+
+
+@pytest.mark.parametrize("f", FILTERS)
+def test_mask_matches_a_full_scan(backend, shared, f):
+    frame, _ = shared
+    np.testing.assert_array_equal(backend.mask(f), expected_mask(frame, f))
+
+
+@pytest.mark.parametrize("f", FILTERS)
+def test_pruning_doesnt_change_the_mask(shared, f):
+    frame, partitions = shared
+    pruned = make_backend(frame, "pandas", partitions)
+    np.testing.assert_array_equal(pruned.mask(f), make_backend(frame, "pandas").mask(f))
+
+
+@pytest.mark.parametrize("f", FILTERS)
+@pytest.mark.parametrize("by, aggs", AGGREGATES)
+def test_duckdb_aggregates_match_pandas(shared, f, by, aggs):
+    pytest.importorskip("duckdb")
+    frame, partitions = shared
+    pandas_result = make_backend(frame, "pandas", partitions).aggregate(f, by, aggs)
+    duckdb_result = make_backend(frame, "duckdb", partitions).aggregate(f, by, aggs)
+    pd.testing.assert_frame_equal(duckdb_result, pandas_result, check_dtype=False, check_exact=False)
+    assert list(duckdb_result.columns) == by + list(aggs)
+
+
+def test_aggregate_reuses_the_mask(shared):
+    frame, partitions = shared
+    backend = make_backend(frame, "pandas", partitions)
+    f = FILTERS[0]
+    mask = backend.mask(f)
+    assert not mask.flags.writeable
+    backend.aggregate(f, ['year'], {'revenue': ('revenue', 'sum')})
+    assert backend.mask(f) is mask
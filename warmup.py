@@ -0,0 +1,99 @@
+"""Warm the dashboard's caches before the first visitor arrives.
+
+Without it, the first session after a deploy pays for parsing the CSV into
+the column store, building every index and computing the default view.
+`warm_up()` runs `app.py` once, headlessly, with the sidebar at its defaults
+(2000 to the latest year, all genres, rating 0, budget $0-300M), so it fills
+exactly the caches a first visitor would:
+
+- the column store and plot index on disk, which outlive the process
+- the shared frame and indexes (`st.cache_resource`), the default view's
+  aggregations (`st.cache_data`) and the lazily imported chart libraries,
+  which live in the process that filled them
+
+    python -m warmup                           # before traffic: build the on-disk caches, then exit
+    python -m warmup serve [streamlit options]  # warm this process, then serve app.py from it
+
+Only `serve` makes the first request as fast as later ones. It warms up
+before the server starts listening, so the health endpoint doubles as a
+readiness check; either way `ready.json` in the cache directory is removed
+when a warm-up starts and written when it has finished (see `read_status`).
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from datetime import datetime
+
+from dataset import DATA_PATH, DATA_VERSION, cache_path
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+READY_FILE = "ready.json"
+
+logger = logging.getLogger(__name__)
+
+
+def read_status() -> dict | None:
+    """The last finished warm-up (pid, data, timings), or None while one runs or before the first."""
+    try:
+        with open(cache_path(READY_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def warm_up(mode: str = "disk", timeout: float = 600) -> dict:
+    """Run the app once with default filters, filling its caches; returns the readiness status."""
+    from streamlit.runtime import Runtime
+    from streamlit.testing.v1 import AppTest
+
+    ready_file = cache_path(READY_FILE)
+    if os.path.exists(ready_file):
+        os.remove(ready_file)
+    started = datetime.now()
+    start = time.perf_counter()
+    at = AppTest.from_file(APP, default_timeout=timeout)
+    try:
+        at.run(timeout=timeout)
+    finally:
+        # AppTest leaves its mock Runtime installed; the real server needs the slot empty
+        Runtime._instance = None
+    if at.exception:
+        raise RuntimeError("App raised during warm-up: " + "; ".join(e.message for e in at.exception))
+
+    status = {
+        'pid': os.getpid(),
+        'mode': mode,
+        'data': os.path.abspath(DATA_PATH),
+        'data_version': DATA_VERSION,
+        'started': started.isoformat(timespec="seconds"),
+        'seconds': time.perf_counter() - start,
+    }
+    tmp_file = ready_file + ".tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(status, f, indent=2)
+    os.replace(tmp_file, ready_file)
+    logger.info("Warm-up finished in %.1fs", status['seconds'])
+    return status
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", nargs="?", choices=["warm", "serve"], default="warm",
+                        help="warm: fill the on-disk caches and exit; serve: warm, then run the server")
+    parser.add_argument("--timeout", type=float, default=600, help="seconds allowed for the warm-up run")
+    args, streamlit_args = parser.parse_known_args(argv)
+
+    status = warm_up("process" if args.command == "serve" else "disk", args.timeout)
+    print(f"Warm-up finished in {status['seconds']:.1f}s")
+    if args.command == "serve":
+        from streamlit.web import cli
+
+        sys.argv = ["streamlit", "run", APP, *streamlit_args]
+        sys.exit(cli.main())
+
+
+if __name__ == "__main__":
+    main()